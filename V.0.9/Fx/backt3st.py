@@ -0,0 +1,278 @@
+"""Backtest the hunter's signals (DIP_BUY, HYPE_TRAIN, NEW_GEM) against stored prices.
+
+Signals come from trading_potential, prices from the hourly (or any) price_rollups
+resolution plus the raw price_data rows not rolled up yet. Each signal enters at the
+first bar after it fires and exits on take-profit, stop-loss or after --hold bars,
+paying fees and slippage on both sides. All trades are simulated at once as a
+(signals x hold) NumPy matrix, so there is no per-bar Python loop.
+
+    python V.0.9/Fx/backt3st.py --db /data/algo-nalysis.db --days 365 --hold 24 --tp 0.5 --sl 0.2
+"""
+import argparse
+import os
+import sqlite3
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+# coin index in the high bits, unix seconds in the low bits: one sorted key across every token
+COIN_SHIFT = np.int64(1 << 40)
+CHUNK_SIGNALS = 50_000
+
+
+def connect(db_path):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def table_exists(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone() is not None
+
+
+def load_signals(conn, start, min_score, cooldown):
+    """Signals since start as arrays (coin index, unix time, type index), plus the coin and type names.
+
+    The hunter stores a token again on every hunt it qualifies in, so a signal is only
+    kept once `cooldown` seconds have passed since the last kept signal of the same
+    type for the same coin.
+    """
+    rows = conn.execute("""
+        SELECT coin_id, potential_type, CAST(strftime('%s', created_at) AS INTEGER) AS ts
+        FROM trading_potential
+        WHERE created_at >= datetime(?, 'unixepoch')
+          AND COALESCE(json_extract(details, '$.overall_score'), 100) >= ?
+    """, (start, min_score)).fetchall()
+    if not rows:
+        return None
+
+    coin_ids, types, times = zip(*rows)
+    coin_names, coins = np.unique(np.array(coin_ids, dtype=object), return_inverse=True)
+    type_names, kinds = np.unique(np.array(types, dtype=object), return_inverse=True)
+    times = np.array(times, dtype=np.int64)
+
+    # One sorted key per (coin, type) group; from each kept signal, jump straight to the first
+    # one a cooldown later, which is in the same group or else the next group's first signal
+    group = coins * len(type_names) + kinds
+    order = np.lexsort((times, group))
+    keys = group[order] * COIN_SHIFT + times[order]
+    cooldown = max(1, int(cooldown))
+    kept = []
+    i = 0
+    while i < len(keys):
+        kept.append(i)
+        i = int(np.searchsorted(keys, keys[i] + cooldown, side="left"))
+    first = order[kept]
+    return coins[first], times[first], kinds[first], list(coin_names), list(type_names)
+
+
+def trade_windows(coins, times, span):
+    """Merge each signal's [time, time + span] into non-overlapping (coin, start, end) windows"""
+    order = np.lexsort((times, coins))
+    coin, start = coins[order], times[order]
+    stop = start + span
+    # Every window has the same length, so within a coin the previous one ends last
+    new = np.ones(len(coin), dtype=bool)
+    new[1:] = (coin[1:] != coin[:-1]) | (start[1:] > stop[:-1])
+    last = np.r_[np.flatnonzero(new)[1:] - 1, len(coin) - 1]
+    return coin[new], start[new], stop[last]
+
+
+def load_prices(conn, coin_names, windows, resolution):
+    """Bars inside the trade windows, sorted by (coin, time).
+
+    Only the stretches some signal can trade are read, through the primary key and the
+    (coin_id, timestamp) index. Closed buckets come from price_rollups at `resolution`,
+    the tail that has not been rolled up yet from price_data.
+    """
+    conn.execute("CREATE TEMP TABLE bt_windows(coin_idx INTEGER, coin_id TEXT, start INTEGER, stop INTEGER)")
+    conn.executemany("INSERT INTO bt_windows VALUES(?, ?, ?, ?)", [
+        (int(coin), coin_names[coin], int(start), int(stop)) for coin, start, stop in zip(*windows)
+    ])
+
+    watermark = 0
+    parts = []
+    if table_exists(conn, "price_rollups"):
+        row = conn.execute("SELECT watermark FROM rollup_watermarks WHERE resolution = ?", (resolution,)).fetchone()
+        watermark = row[0] if row else 0
+        parts.append(conn.execute("""
+            SELECT w.coin_idx, r.bucket, r.close
+            FROM bt_windows w JOIN price_rollups r
+              ON r.coin_id = w.coin_id AND r.resolution = ? AND r.bucket BETWEEN w.start AND w.stop
+        """, (resolution,)))
+    parts.append(conn.execute("""
+        SELECT w.coin_idx, CAST(strftime('%s', p.timestamp) AS INTEGER), p.price
+        FROM bt_windows w JOIN price_data p
+          ON p.coin_id = w.coin_id
+         AND p.timestamp BETWEEN datetime(MAX(w.start, ?), 'unixepoch') AND datetime(w.stop, 'unixepoch')
+        WHERE w.stop >= ?
+    """, (watermark, watermark)))
+
+    dtype = [("coin", np.int64), ("ts", np.int64), ("price", np.float64)]
+    bars = np.concatenate([np.fromiter(cursor, dtype=dtype) for cursor in parts])
+    bars = bars[bars["price"] > 0]
+    bars = bars[np.argsort(bars["coin"] * COIN_SHIFT + bars["ts"], kind="stable")]
+    return bars["coin"], bars["ts"], bars["price"]
+
+
+def simulate(coins, times, bar_coins, bar_times, prices, hold, resolution, take_profit, stop_loss, fee, slippage):
+    """Net return, exit time and exit reason per signal; NaN return where there is no price after it.
+
+    Reasons: 0 no data, 1 take-profit, 2 stop-loss, 3 time exit.
+    """
+    keys = bar_coins * COIN_SHIFT + bar_times
+    coin_end = np.searchsorted(bar_coins, coins, side="right")
+    entry = np.searchsorted(keys, coins * COIN_SHIFT + times, side="left")
+
+    n = len(coins)
+    net = np.full(n, np.nan)
+    exit_time = times.copy()
+    reason = np.zeros(n, dtype=np.int8)
+    offsets = np.arange(1, hold + 1)
+    cost = (1 - slippage) / (1 + slippage) * (1 - fee) ** 2
+
+    for lo in range(0, n, CHUNK_SIGNALS):
+        hi = min(n, lo + CHUNK_SIGNALS)
+        e, end = entry[lo:hi], coin_end[lo:hi]
+        has_entry = e < end
+        e_safe = np.where(has_entry, e, 0)
+        # The first bar after the signal must be the next one, not one from a later window
+        has_entry &= bar_times[e_safe] < times[lo:hi] + resolution
+        entry_price = prices[e_safe]
+
+        path = e_safe[:, None] + offsets
+        valid = (path < end[:, None]) & has_entry[:, None]
+        path = np.where(valid, path, 0)
+        # Sparse history must not stretch a trade past its holding period
+        valid &= bar_times[path] <= (bar_times[e_safe] + hold * resolution)[:, None]
+        returns = np.where(valid, prices[path] / entry_price[:, None] - 1.0, np.nan)
+
+        hit_tp = valid & (returns >= take_profit)
+        hit_sl = valid & (returns <= -stop_loss)
+        first_tp = np.where(hit_tp.any(1), hit_tp.argmax(1), hold)
+        first_sl = np.where(hit_sl.any(1), hit_sl.argmax(1), hold)
+        last_valid = valid.sum(1) - 1 # valid bars are a prefix of each row
+
+        step = np.minimum(np.minimum(first_tp, first_sl), np.maximum(last_valid, 0))
+        rows = np.arange(hi - lo)
+        traded = last_valid >= 0
+        gross = np.where(traded, returns[rows, step] + 1.0, np.nan)
+
+        net[lo:hi] = gross * cost - 1.0
+        exit_time[lo:hi] = np.where(traded, bar_times[path[rows, step]], times[lo:hi])
+        reason[lo:hi] = np.where(~traded, 0, np.where(first_tp <= step, 1, np.where(first_sl <= step, 2, 3)))
+    return net, exit_time, reason
+
+
+def max_drawdown(pnl):
+    equity = np.concatenate([[0.0], np.cumsum(pnl)])
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+def summarize(net, exit_time, reason, kinds, type_names, stake):
+    results = []
+    for kind, name in enumerate(type_names + ["ALL"]):
+        mask = ~np.isnan(net) if name == "ALL" else (kinds == kind) & ~np.isnan(net)
+        returns = net[mask]
+        if not len(returns):
+            results.append({"signal": name, "trades": 0})
+            continue
+        pnl = returns[np.argsort(exit_time[mask], kind="stable")] * stake
+        results.append({
+            "signal": name,
+            "trades": int(len(returns)),
+            "hit_rate": float(np.mean(returns > 0)),
+            "avg_return": float(np.mean(returns)),
+            "median_return": float(np.median(returns)),
+            "pnl": float(pnl.sum()),
+            "max_drawdown": max_drawdown(pnl),
+            "take_profits": int(np.sum(reason[mask] == 1)),
+            "stop_losses": int(np.sum(reason[mask] == 2)),
+        })
+    return results
+
+
+def display_results(results, skipped, elapsed, stake):
+    console = Console()
+    table = Table(title=f"Signal Backtest (${stake:,.0f} per trade)", title_style="bold magenta")
+    table.add_column("Signal", style="cyan")
+    table.add_column("Trades", justify="right")
+    table.add_column("Hit Rate", justify="right")
+    table.add_column("Avg Return", justify="right")
+    table.add_column("Median", justify="right")
+    table.add_column("PnL", justify="right")
+    table.add_column("Max Drawdown", justify="right", style="red")
+    table.add_column("TP / SL", justify="right")
+
+    for row in results:
+        if not row["trades"]:
+            table.add_row(row["signal"], "0", "-", "-", "-", "-", "-", "-")
+            continue
+        pnl_color = "green" if row["pnl"] >= 0 else "red"
+        table.add_row(
+            row["signal"],
+            f"{row['trades']:,}",
+            f"{row['hit_rate']:.1%}",
+            f"{row['avg_return']:+.2%}",
+            f"{row['median_return']:+.2%}",
+            f"[{pnl_color}]${row['pnl']:,.2f}[/{pnl_color}]",
+            f"${row['max_drawdown']:,.2f}",
+            f"{row['take_profits']:,} / {row['stop_losses']:,}",
+        )
+
+    console.print(table)
+    console.print(f"[dim]{skipped:,} signals had no later price and were skipped; backtest took {elapsed:.2f}s[/dim]")
+
+
+def run_backtest(db_path, days=365, resolution=3600, hold=24, take_profit=0.5, stop_loss=0.2,
+                 fee=0.003, slippage=0.01, min_score=40.0, cooldown=None, stake=100.0):
+    started = time.perf_counter()
+    conn = connect(db_path)
+    try:
+        start = int(time.time()) - days * 86400
+        signals = load_signals(conn, start, min_score, cooldown or hold * resolution)
+        if signals is None:
+            return [], 0, time.perf_counter() - started
+        coins, times, kinds, coin_names, type_names = signals
+
+        windows = trade_windows(coins, times, (hold + 1) * resolution)
+        bar_coins, bar_times, prices = load_prices(conn, coin_names, windows, resolution)
+    finally:
+        conn.close()
+
+    net, exit_time, reason = simulate(coins, times, bar_coins, bar_times, prices,
+                                      hold, resolution, take_profit, stop_loss, fee, slippage)
+    results = summarize(net, exit_time, reason, kinds, type_names, stake)
+    return results, int(np.isnan(net).sum()), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest DIP_BUY / HYPE_TRAIN / NEW_GEM signals")
+    parser.add_argument("--db", default=os.getenv("DATABASE_PATH", "/data/algo-nalysis.db"))
+    parser.add_argument("--days", type=int, default=365, help="signals from the last N days")
+    parser.add_argument("--resolution", type=int, default=3600, help="price_rollups bar width, seconds")
+    parser.add_argument("--hold", type=int, default=24, help="bars before a time exit")
+    parser.add_argument("--tp", type=float, default=0.5, help="take-profit, fraction of entry")
+    parser.add_argument("--sl", type=float, default=0.2, help="stop-loss, fraction of entry")
+    parser.add_argument("--fee", type=float, default=0.003, help="fee per side")
+    parser.add_argument("--slippage", type=float, default=0.01, help="slippage per side")
+    parser.add_argument("--min-score", type=float, default=40.0)
+    parser.add_argument("--cooldown", type=int, default=None,
+                        help="seconds after a kept signal in which its repeats are dropped (default: the holding period)")
+    parser.add_argument("--stake", type=float, default=100.0, help="dollars per trade")
+    args = parser.parse_args()
+
+    results, skipped, elapsed = run_backtest(
+        args.db, args.days, args.resolution, args.hold, args.tp, args.sl,
+        args.fee, args.slippage, args.min_score, args.cooldown, args.stake,
+    )
+    if not results:
+        print("No signals in trading_potential for that period.")
+        return
+    display_results(results, skipped, elapsed, args.stake)
+
+
+if __name__ == "__main__":
+    main()
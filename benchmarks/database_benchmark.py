@@ -0,0 +1,81 @@
+"""Benchmark DatabaseManager write throughput: per-call connections, the persistent connection and BulkWriter batches.
+
+Run with: DATABASE_PATH=/tmp/algo-nalysis.db python -m benchmarks.database_benchmark [--rows 5000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from src.core.bulk_writer import BulkWriter
+from src.core.database import DatabaseManager
+
+console = Console()
+
+
+def coin_rows(count: int) -> List[Dict]:
+    return [
+        {"id": f"coin-{i}", "symbol": f"C{i % 1000}", "name": f"Coin {i}", "is_memecoin": i % 2 == 0}
+        for i in range(count)
+    ]
+
+
+def measure(persistent: bool, rows: List[Dict]) -> float:
+    """Rows/sec for insert_coin_data one row at a time, as the hunt writes today"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"), persistent=persistent)
+        started = time.perf_counter()
+        for row in rows:
+            db.insert_coin_data(row)
+        elapsed = time.perf_counter() - started
+        if persistent:
+            db.close()
+    return len(rows) / elapsed
+
+
+def measure_bulk(rows: List[Dict]) -> float:
+    """Rows/sec through BulkWriter: DATABASE_BATCH_SIZE rows per executemany transaction"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"), persistent=True)
+        writer = BulkWriter(db)
+        started = time.perf_counter()
+        for row in rows:
+            writer.add_coin(row)
+        writer.close()
+        elapsed = time.perf_counter() - started
+        db.close()
+    return len(rows) / elapsed
+
+
+def run(row_count: int) -> List[Dict]:
+    rows = coin_rows(row_count)
+    return [
+        {"mode": "per-call connection", "rows_per_sec": measure(False, rows)},
+        {"mode": "persistent WAL connection", "rows_per_sec": measure(True, rows)},
+        {"mode": "BulkWriter batches", "rows_per_sec": measure_bulk(rows)},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    baseline = results[0]["rows_per_sec"]
+
+    table = Table(title=f"insert_coin_data, {args.rows:,} rows")
+    table.add_column("Mode", style="cyan")
+    table.add_column("Rows/sec", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="yellow")
+    for row in results:
+        table.add_row(row["mode"], f"{row['rows_per_sec']:,.0f}", f"{row['rows_per_sec'] / baseline:.1f}x")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
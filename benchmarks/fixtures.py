@@ -0,0 +1,108 @@
+"""Deterministic Birdeye/Twitter fixtures and a local server that replays them for offline benchmarks."""
+import hashlib
+import random
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+from benchmarks.sentiment_benchmark import generate_tweets
+
+
+def token_fixtures(count: int, seed: int = 11) -> List[Dict]:
+    """Tokenlist entries shaped like /defi/tokenlist, all passing BirdeyeClient.meets_criteria"""
+    rng = random.Random(seed)
+    tokens = []
+    for i in range(count):
+        price = rng.uniform(0.00001, 2.0)
+        tokens.append({
+            "address": f"Tok{i:06d}{hashlib.blake2b(str(i).encode(), digest_size=8).hexdigest()}",
+            "symbol": f"MEME{i}"[:10],
+            "name": f"Meme Token {i}",
+            "price": price,
+            "liquidity": rng.uniform(50_000, 5_000_000),
+            "volume_24h": rng.uniform(100_000, 50_000_000),
+            "v24hUSD": rng.uniform(100_000, 50_000_000),
+            "mc": rng.uniform(100_000, 500_000_000),
+        })
+    return tokens
+
+
+def overview_fixture(token: Dict, seed: int = 11) -> Dict:
+    rng = random.Random(f"{seed}:{token['address']}")
+    return {"success": True, "data": {
+        "address": token["address"],
+        "symbol": token["symbol"],
+        "name": token["name"],
+        "price": token["price"],
+        "mc": token["mc"],
+        "liquidity": token["liquidity"],
+        "volume24h": token["v24hUSD"],
+        "price24hchangepercent": rng.uniform(-80, 400),
+    }}
+
+
+def security_fixture(token: Dict, seed: int = 11) -> Dict:
+    rng = random.Random(f"{seed}:security:{token['address']}")
+    return {"success": True, "data": {
+        "rug_pull": rng.random() < 0.05,
+        "is_blacklisted": rng.random() < 0.02,
+        "top_10_holder_percent": rng.uniform(0.05, 0.9),
+        "is_liquidity_locked": rng.random() < 0.6,
+    }}
+
+
+def tweet_fixtures(query: str, count: int) -> List[Dict]:
+    seed = int(hashlib.blake2b(query.encode(), digest_size=4).hexdigest(), 16)
+    return [{"id": f"{seed}-{i}", "text": text} for i, text in enumerate(generate_tweets(count, seed=seed))]
+
+
+class FixtureServer:
+    """Serves the Birdeye and Twitter endpoints the hunt uses, from fixtures, on 127.0.0.1"""
+
+    def __init__(self, tokens: List[Dict], tweets_per_query: int = 100):
+        self.tokens = tokens
+        self.by_address = {token["address"]: token for token in tokens}
+        self.tweets_per_query = tweets_per_query
+        self._tweets: Dict[str, List[Dict]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+        self.requests = 0
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/defi/tokenlist", self._tokenlist)
+        app.router.add_get("/defi/token_overview", self._overview)
+        app.router.add_get("/defi/token_security", self._security)
+        app.router.add_get("/2/tweets/search/recent", self._search_recent)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _tokenlist(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 50))
+        return web.json_response({"success": True, "data": {"tokens": self.tokens[offset:offset + limit]}})
+
+    async def _overview(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        return web.json_response(overview_fixture(self.by_address[request.query["address"]]))
+
+    async def _security(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        return web.json_response(security_fixture(self.by_address[request.query["address"]]))
+
+    async def _search_recent(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        query = request.query["query"]
+        if query not in self._tweets:
+            self._tweets[query] = tweet_fixtures(query, self.tweets_per_query)
+        tweets = self._tweets[query][:int(request.query.get("max_results", 100))]
+        return web.json_response({"data": tweets, "meta": {"result_count": len(tweets)}})
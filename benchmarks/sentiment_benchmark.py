@@ -0,0 +1,117 @@
+"""Benchmark SentimentAnalyzer.analyze_narrative_aspects against the original per-keyword loop.
+
+Run with: python -m benchmarks.sentiment_benchmark [--sizes 10000 50000 100000]
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from src.analyzers.sentiment_analyzer import SentimentAnalyzer
+from src.models.analysis_result import NarrativeIndicators
+
+console = Console()
+
+FILLER = [
+    "just", "bought", "some", "more", "today", "chart", "looks", "wild", "ngl", "ser", "wagmi",
+    "anyone", "watching", "this", "dev", "wallet", "sold", "volume", "up", "again", "holdings",
+]
+
+
+def generate_tweets(count: int, seed: int = 7) -> List[str]:
+    """Synthetic tweets: mostly filler, some keywords, some glued together so matches overlap"""
+    rng = random.Random(seed)
+    keywords = [kw for kws in SentimentAnalyzer(None).narrative_keywords.values() for kw in kws]
+    tweets = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(6, 20))
+        for _ in range(rng.choice([0, 0, 0, 0, 1, 1, 2, 3])):
+            keyword = rng.choice(keywords)
+            if rng.random() < 0.2:
+                keyword = keyword + rng.choice(keywords)  # e.g. "gemmeme", "pumpfomo"
+            words.insert(rng.randrange(len(words) + 1), keyword.upper() if rng.random() < 0.3 else keyword)
+        tweets.append(" ".join(words))
+    return tweets
+
+
+def legacy_analyze_narrative_aspects(analyzer: SentimentAnalyzer, tweets: List[str]) -> NarrativeIndicators:
+    """The original tweet x aspect x keyword loop, kept as the reference implementation"""
+    indicators = NarrativeIndicators()
+    if not tweets:
+        return indicators
+
+    aspect_scores = {aspect: [] for aspect in analyzer.narrative_keywords.keys()}
+    for tweet in tweets:
+        tweet_lower = tweet.lower()
+        sentiment = analyzer.vader.polarity_scores(tweet)
+        for aspect, keywords in analyzer.narrative_keywords.items():
+            aspect_score = 0
+            keyword_count = 0
+            for keyword in keywords:
+                if keyword in tweet_lower:
+                    keyword_count += 1
+                    aspect_score += sentiment['compound']
+            if keyword_count > 0:
+                aspect_scores[aspect].append(aspect_score / keyword_count)
+
+    indicators.hype_level = analyzer._calculate_aspect_score(aspect_scores['hype'])
+    indicators.fomo_intensity = analyzer._calculate_aspect_score(aspect_scores['fomo'])
+    indicators.community_growth = analyzer._calculate_aspect_score(aspect_scores['community'])
+    indicators.utility_mentions = analyzer._calculate_aspect_score(aspect_scores['utility'])
+    indicators.meme_virality = analyzer._calculate_aspect_score(aspect_scores['meme'])
+    indicators.risk_awareness = abs(analyzer._calculate_aspect_score(aspect_scores['risk']))
+    return indicators
+
+
+def run(sizes: List[int]) -> List[Dict]:
+    analyzer = SentimentAnalyzer(None)
+    results = []
+    for size in sizes:
+        tweets = generate_tweets(size)
+
+        started = time.perf_counter()
+        expected = legacy_analyze_narrative_aspects(analyzer, tweets)
+        legacy_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = analyzer.analyze_narrative_aspects(tweets)
+        matcher_seconds = time.perf_counter() - started
+
+        results.append({
+            "tweets": size,
+            "legacy_seconds": legacy_seconds,
+            "matcher_seconds": matcher_seconds,
+            "speedup": legacy_seconds / matcher_seconds if matcher_seconds else float("inf"),
+            "identical": expected == actual,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    table = Table(title="analyze_narrative_aspects")
+    table.add_column("Tweets", justify="right", style="cyan")
+    table.add_column("Legacy", justify="right")
+    table.add_column("Matcher", justify="right", style="green")
+    table.add_column("Speedup", justify="right", style="yellow")
+    table.add_column("Identical", justify="center")
+
+    for row in run(args.sizes):
+        table.add_row(
+            f"{row['tweets']:,}",
+            f"{row['legacy_seconds']:.2f}s",
+            f"{row['matcher_seconds']:.2f}s",
+            f"{row['speedup']:.1f}x",
+            "✅" if row['identical'] else "❌",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Offline benchmark suite for the hunt pipeline: throughput and p50/p95/p99 latency across input sizes.
+
+Everything runs against local fixtures, so no API key or network is needed.
+
+Run with: python -m benchmarks.suite [--sizes 50 200 1000] [--output results.json]
+          python -m benchmarks.suite --baseline benchmarks/baseline.json [--tolerance 0.2]
+
+_chain_hunt can also record its traffic to cassettes and replay them with injected faults:
+          python -m benchmarks.suite --only chain_hunt --record /tmp/cassettes
+          python -m benchmarks.suite --only chain_hunt --replay /tmp/cassettes --latency lognormal:80,0.6 --rate-429 0.02 --seed 1
+"""
+import os
+import tempfile
+
+# MemecoinHunter opens the shared DATABASE_PATH database; keep it off /data
+os.environ.setdefault("DATABASE_PATH", os.path.join(tempfile.mkdtemp(prefix="algo-bench-"), "bench.db"))
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.database_benchmark import coin_rows
+from benchmarks.fixtures import FixtureServer, overview_fixture, security_fixture, token_fixtures, tweet_fixtures
+from src.analyzers.memecoin_hunter import MemecoinPotentialScorer
+from src.analyzers.sentiment_analyzer import SentimentAnalyzer
+from src.analyzers.sentiment_cache import TweetSentimentCache
+from src.core.bulk_writer import opportunity_rows
+from src.core.config import settings
+from src.core.database import DatabaseManager
+from src.data_sources import birdeye_client
+from src.data_sources.birdeye_client import BirdeyeClient
+from src.data_sources.transport import Cassette, LiveTransport, RecordingTransport, ReplayTransport, Transport
+from src.main import MemecoinHunter
+from src.utils.cache import ResponseCache
+
+console = Console()
+
+# Metrics compared against a baseline: (key, True if higher is better)
+COMPARED_METRICS = [("items_per_sec", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)]
+
+
+def summarize(benchmark: str, size: int, unit: str, items: int,
+              latencies: List[float], elapsed: float) -> Dict:
+    latencies_ms = np.asarray(latencies) * 1000.0
+    return {
+        "benchmark": benchmark,
+        "size": size,
+        "unit": unit,
+        "items": items,
+        "seconds": elapsed,
+        "items_per_sec": items / elapsed if elapsed else 0.0,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+
+
+def timed_calls(calls: List[Callable[[], object]]):
+    """Run each call once; returns per-call latencies and total seconds"""
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        call_started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - call_started)
+    return latencies, time.perf_counter() - started
+
+
+def bench_score_potential(size: int) -> Dict:
+    """MemecoinPotentialScorer.score_potential, one call per token"""
+    scorer = MemecoinPotentialScorer()
+    analyzer = SentimentAnalyzer(None)
+    tokens = token_fixtures(size)
+    sentiment = analyzer.analyze_narrative_aspects([tweet["text"] for tweet in tweet_fixtures("$MEME", 100)])
+    inputs = [(overview_fixture(token)["data"], security_fixture(token)["data"]) for token in tokens]
+    latencies, elapsed = timed_calls([
+        lambda overview=overview, security=security: scorer.score_potential(overview, sentiment, security, "solana")
+        for overview, security in inputs
+    ])
+    return summarize("score_potential", size, "tokens", size, latencies, elapsed)
+
+
+def bench_sentiment(size: int) -> Dict:
+    """SentimentAnalyzer.analyze_narrative_aspects, one call per token over its 300 fixture tweets"""
+    analyzer = SentimentAnalyzer(None, TweetSentimentCache())
+    batches = []
+    for token in token_fixtures(size):
+        tweets = []
+        for query in (f"${token['symbol']}", token["name"], f"{token['symbol']} token"):
+            tweets.extend(tweet["text"] for tweet in tweet_fixtures(query, 100))
+        batches.append(tweets)
+    latencies, elapsed = timed_calls([lambda tweets=tweets: analyzer.analyze_narrative_aspects(tweets) for tweets in batches])
+    return summarize("analyze_narrative_aspects", size, "tokens", size, latencies, elapsed)
+
+
+def bench_database(size: int) -> List[Dict]:
+    """DatabaseManager write paths: insert_coin_data per row, write_batch per DATABASE_BATCH_SIZE opportunities"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "single.db"))
+        latencies, elapsed = timed_calls([lambda row=row: db.insert_coin_data(row) for row in coin_rows(size)])
+        db.close()
+        results.append(summarize("db.insert_coin_data", size, "rows", size, latencies, elapsed))
+
+        db = DatabaseManager(os.path.join(tmp, "batch.db"))
+        scorer = MemecoinPotentialScorer()
+        sentiment = SentimentAnalyzer(None).analyze_narrative_aspects([])
+        rows = [
+            opportunity_rows(scorer.score_potential(
+                overview_fixture(token)["data"], sentiment, security_fixture(token)["data"], "solana"
+            ))
+            for token in token_fixtures(size)
+        ]
+        batch_size = settings.DATABASE_BATCH_SIZE
+        batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        latencies, elapsed = timed_calls([
+            lambda batch=batch: db.write_batch(
+                [row["coin"] for row in batch], [row["price"] for row in batch],
+                [row["sentiment"] for row in batch], [row["potential"] for row in batch],
+            )
+            for batch in batches
+        ])
+        db.close()
+        # Four rows (one per table) per opportunity
+        results.append(summarize("db.write_batch", size, "rows", size * 4, latencies, elapsed))
+    return results
+
+
+def chain_hunt_transports(options: Dict) -> Dict[str, Transport]:
+    """Birdeye and Twitter transports for --record / --replay, plain HTTP to the fixture server otherwise"""
+    transports = {}
+    for provider in ("birdeye", "twitter"):
+        if options.get("replay"):
+            cassette = Cassette.load(os.path.join(options["replay"], f"{provider}.jsonl.gz"))
+            transports[provider] = ReplayTransport(
+                cassette, latency=options["latency"], rate_limit_rate=options["rate_429"],
+                timeout_rate=options["timeout_rate"], timeout_seconds=options["timeout_seconds"],
+                seed=options["seed"],
+            )
+        elif options.get("record"):
+            transports[provider] = RecordingTransport(
+                Cassette.load(os.path.join(options["record"], f"{provider}.jsonl.gz"))
+            )
+        else:
+            transports[provider] = LiveTransport()
+    return transports
+
+
+async def bench_chain_hunt(size: int, repeats: int, options: Optional[Dict] = None) -> Dict:
+    """MemecoinHunter._chain_hunt end to end against the fixture server (or a replayed cassette), `size` tokens per hunt"""
+    options = options or {}
+    server = None
+    base_url = "http://replay"
+    if not options.get("replay"):
+        server = FixtureServer(token_fixtures(size))
+        base_url = await server.start()
+    transports = chain_hunt_transports(options)
+
+    hunter = MemecoinHunter()
+    quiet = Console(quiet=True)
+    hunter.twitter_client.transport = transports["twitter"]
+    hunter.console = hunter.twitter_client.console = birdeye_client.console = quiet
+    hunter.twitter_client.base_url = base_url
+    # No response cache: every repeat pays for every lookup
+    hunter.birdeye = BirdeyeClient("benchmark", cache=ResponseCache(default_ttl=0, endpoint_ttls={}),
+                                   transport=transports["birdeye"])
+    hunter.birdeye.base_url = base_url
+
+    latencies = []
+    try:
+        # Untimed warm-up: fills the server's tweet fixtures and opens the connection pools
+        await hunter._chain_hunt("solana")
+        started = time.perf_counter()
+        for _ in range(repeats):
+            # Cold tweet cache per hunt, like a fresh process
+            hunter.sentiment_analyzer.cache = TweetSentimentCache()
+            hunt_started = time.perf_counter()
+            await hunter._chain_hunt("solana")
+            latencies.append(time.perf_counter() - hunt_started)
+        elapsed = time.perf_counter() - started
+    finally:
+        await hunter.birdeye.cleanup()
+        await hunter.twitter_client.cleanup()
+        await hunter.persistence.close()
+        if server:
+            await server.stop()
+    return summarize("_chain_hunt", size, "tokens", size * repeats, latencies, elapsed)
+
+
+def offline_settings():
+    """Settings for fixture runs: no rate limiting, incremental discovery off, discovery pages through every fixture"""
+    settings.RATE_LIMITS.update({"birdeye": 10_000_000, "twitter": 10_000_000})
+    settings.STREAMING_DISCOVERY = True
+    settings.INCREMENTAL_DISCOVERY = False
+
+
+def run(sizes: List[int], repeats: int, benchmarks: Optional[List[str]] = None,
+        transport_options: Optional[Dict] = None) -> List[Dict]:
+    offline_settings()
+    selected = set(benchmarks or ["score_potential", "sentiment", "database", "chain_hunt"])
+    results = []
+    for size in sizes:
+        if "score_potential" in selected:
+            results.append(bench_score_potential(size))
+        if "sentiment" in selected:
+            results.append(bench_sentiment(size))
+        if "database" in selected:
+            results.extend(bench_database(size))
+        if "chain_hunt" in selected:
+            results.append(asyncio.run(bench_chain_hunt(size, repeats, transport_options)))
+    return results
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[Dict]:
+    """Every metric that got worse than the baseline by more than `tolerance` (a fraction)"""
+    previous = {(row["benchmark"], row["size"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get((row["benchmark"], row["size"]))
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            if not old.get(metric):
+                continue
+            change = (row[metric] - old[metric]) / old[metric]
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append({
+                    "benchmark": row["benchmark"], "size": row["size"], "metric": metric,
+                    "baseline": old[metric], "current": row[metric], "change": change,
+                })
+    return regressions
+
+
+def print_results(results: List[Dict]):
+    table = Table(title="Hunt pipeline benchmarks")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Size", justify="right")
+    table.add_column("Items/sec", justify="right", style="green")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right", style="yellow")
+    for row in results:
+        table.add_row(
+            row["benchmark"], f"{row['size']:,} {row['unit']}", f"{row['items_per_sec']:,.0f}",
+            f"{row['p50_ms']:.2f}ms", f"{row['p95_ms']:.2f}ms", f"{row['p99_ms']:.2f}ms",
+        )
+    console.print(table)
+
+
+def print_regressions(regressions: List[Dict], tolerance: float):
+    if not regressions:
+        console.print(f"[green]✅ No regressions beyond {tolerance:.0%} of the baseline[/green]")
+        return
+    table = Table(title=f"Regressions beyond {tolerance:.0%}")
+    table.add_column("Benchmark", style="cyan")
+    table.add_column("Size", justify="right")
+    table.add_column("Metric")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right", style="red")
+    for row in regressions:
+        table.add_row(row["benchmark"], str(row["size"]), row["metric"],
+                      f"{row['baseline']:,.2f}", f"{row['current']:,.2f}", f"{row['change']:+.0%}")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeats", type=int, default=5, help="_chain_hunt runs per size")
+    parser.add_argument("--only", nargs="+", choices=["score_potential", "sentiment", "database", "chain_hunt"])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="results file to compare against; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    parser.add_argument("--record", metavar="DIR", help="capture _chain_hunt traffic to cassettes in DIR")
+    parser.add_argument("--replay", metavar="DIR", help="serve _chain_hunt from cassettes in DIR instead of the fixture server")
+    parser.add_argument("--latency", default="recorded", help="replay latency spec, see transport.latency_sampler")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of replayed requests answered with 429")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of replayed requests that time out")
+    parser.add_argument("--timeout-seconds", type=float, default=settings.REPLAY_TIMEOUT_SECONDS)
+    parser.add_argument("--seed", type=int, default=1, help="seed for replay latency and fault injection")
+    args = parser.parse_args()
+
+    transport_options = {
+        "record": args.record, "replay": args.replay, "latency": args.latency, "rate_429": args.rate_429,
+        "timeout_rate": args.timeout_rate, "timeout_seconds": args.timeout_seconds, "seed": args.seed,
+    }
+    results = run(args.sizes, args.repeats, args.only, transport_options)
+    print_results(results)
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "sizes": args.sizes,
+                "repeats": args.repeats,
+            },
+            "results": results,
+        }, f, indent=2)
+    console.print(f"[dim]Results written to {args.output}[/dim]")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        print_regressions(regressions, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
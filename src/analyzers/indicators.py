@@ -0,0 +1,289 @@
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+
+NAN = float("nan")
+
+
+class EMA:
+    """Exponential moving average, as ta.trend.EMAIndicator (span=window, adjust=False).
+
+    NaN until `window` values have been seen. The update replicates pandas'
+    ewm recursion, including its normalizing division, so values match bit for bit.
+    """
+    __slots__ = ("window", "alpha", "value", "count")
+
+    def __init__(self, window: int, alpha: Optional[float] = None):
+        self.window = window
+        self.alpha = alpha if alpha is not None else 2.0 / (window + 1.0)
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.value = x
+        else:
+            old_weight = 1.0 - self.alpha
+            self.value = (old_weight * self.value + self.alpha * x) / (old_weight + self.alpha)
+        return self.current
+
+    @property
+    def current(self) -> float:
+        return self.value if self.count >= self.window else NAN
+
+
+class RSI:
+    """Relative strength index, as ta.momentum.RSIIndicator: Wilder-smoothed gains over losses"""
+    __slots__ = ("window", "gains", "losses", "previous")
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.gains = EMA(window, alpha=1.0 / window)
+        self.losses = EMA(window, alpha=1.0 / window)
+        self.previous: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        # ta turns the first bar's missing diff into a zero gain and loss
+        change = 0.0 if self.previous is None else close - self.previous
+        self.previous = close
+        self.gains.update(change if change > 0 else 0.0)
+        self.losses.update(-change if change < 0 else 0.0)
+        return self.current
+
+    @property
+    def current(self) -> float:
+        up, down = self.gains.current, self.losses.current
+        if math.isnan(down):
+            return NAN
+        if down == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + up / down)
+
+
+class ATR:
+    """Average true range, as ta.volatility.AverageTrueRange.
+
+    ta reports 0 (not NaN) during warm-up, seeds with the mean of the first `window`
+    true ranges and then applies Wilder's smoothing.
+    """
+    __slots__ = ("window", "value", "count", "seed_total", "previous_close")
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.value = 0.0
+        self.count = 0
+        self.seed_total = 0.0
+        self.previous_close: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if self.previous_close is not None:
+            true_range = max(true_range, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.previous_close = close
+        self.count += 1
+        if self.count < self.window:
+            self.seed_total += true_range
+        elif self.count == self.window:
+            self.value = (self.seed_total + true_range) / self.window
+        else:
+            self.value = (self.value * (self.window - 1) + true_range) / float(self.window)
+        return self.value
+
+
+class _RollingWindow:
+    """Fixed-size window with O(1) running sums.
+
+    Running sums drift as values are added and removed, so they are recomputed from
+    the window once every `size` updates: still O(1) amortized, and the error never
+    builds up over a long-lived stream.
+    """
+    __slots__ = ("size", "values", "updates")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque(maxlen=size)
+        self.updates = 0
+
+    def push(self, value) -> Optional[object]:
+        """Append value; returns the value that fell out of the window, if any"""
+        evicted = self.values[0] if len(self.values) == self.size else None
+        self.values.append(value)
+        self.updates += 1
+        return evicted
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def resync_due(self) -> bool:
+        return self.updates % self.size == 0
+
+
+class BollingerBands:
+    """Middle, high and low bands, as ta.volatility.BollingerBands (population std, ddof=0).
+
+    Mean and squared deviations are kept with Welford's sliding-window update.
+    """
+    __slots__ = ("window", "window_dev", "closes", "mean", "m2")
+
+    def __init__(self, window: int = 20, window_dev: float = 2):
+        self.window = window
+        self.window_dev = window_dev
+        self.closes = _RollingWindow(window)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, close: float) -> Dict[str, float]:
+        evicted = self.closes.push(close)
+        if self.closes.resync_due():
+            values = self.closes.values
+            self.mean = sum(values) / len(values)
+            self.m2 = sum((value - self.mean) ** 2 for value in values)
+        elif evicted is None:
+            count = len(self.closes.values)
+            delta = close - self.mean
+            self.mean += delta / count
+            self.m2 += delta * (close - self.mean)
+        else:
+            previous_mean = self.mean
+            self.mean += (close - evicted) / self.window
+            self.m2 += (close - evicted) * (close - self.mean + evicted - previous_mean)
+        return self.current
+
+    @property
+    def current(self) -> Dict[str, float]:
+        if not self.closes.full:
+            return {"bb_mavg": NAN, "bb_hband": NAN, "bb_lband": NAN}
+        std = math.sqrt(max(0.0, self.m2) / self.window)
+        return {
+            "bb_mavg": self.mean,
+            "bb_hband": self.mean + self.window_dev * std,
+            "bb_lband": self.mean - self.window_dev * std,
+        }
+
+
+class VWAP:
+    """Rolling volume-weighted average of the typical price, as ta.volume.VolumeWeightedAveragePrice"""
+    __slots__ = ("window", "bars", "price_volume", "volume")
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.bars = _RollingWindow(window)
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        typical_price = (high + low + close) / 3.0
+        bar = (typical_price * volume, volume)
+        evicted = self.bars.push(bar)
+        if self.bars.resync_due():
+            self.price_volume = sum(price_volume for price_volume, _ in self.bars.values)
+            self.volume = sum(bar_volume for _, bar_volume in self.bars.values)
+        else:
+            self.price_volume += bar[0] - (evicted[0] if evicted else 0.0)
+            self.volume += bar[1] - (evicted[1] if evicted else 0.0)
+        return self.current
+
+    @property
+    def current(self) -> float:
+        if not self.bars.full or self.volume == 0:
+            return NAN
+        return self.price_volume / self.volume
+
+
+class TokenIndicators:
+    """Every indicator for one token, each updated in O(1) per bar or tick"""
+    __slots__ = ("ema_fast", "ema_slow", "rsi", "atr", "bollinger", "vwap", "bars")
+
+    def __init__(self, ema_fast: int = 12, ema_slow: int = 26, rsi_window: int = 14, atr_window: int = 14,
+                 bollinger_window: int = 20, bollinger_dev: float = 2, vwap_window: int = 14):
+        self.ema_fast = EMA(ema_fast)
+        self.ema_slow = EMA(ema_slow)
+        self.rsi = RSI(rsi_window)
+        self.atr = ATR(atr_window)
+        self.bollinger = BollingerBands(bollinger_window, bollinger_dev)
+        self.vwap = VWAP(vwap_window)
+        self.bars = 0
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: float = 0.0) -> Dict[str, float]:
+        """Add one bar; a bare price tick is a bar with high = low = close"""
+        high = close if high is None else high
+        low = close if low is None else low
+        self.bars += 1
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        self.rsi.update(close)
+        self.atr.update(high, low, close)
+        self.bollinger.update(close)
+        self.vwap.update(high, low, close, volume)
+        return self.values()
+
+    def values(self) -> Dict[str, float]:
+        return {
+            f"ema_{self.ema_fast.window}": self.ema_fast.current,
+            f"ema_{self.ema_slow.window}": self.ema_slow.current,
+            "rsi": self.rsi.current,
+            "atr": self.atr.value,
+            **self.bollinger.current,
+            "vwap": self.vwap.current,
+        }
+
+
+class IndicatorEngine:
+    """Per-token streaming indicators for any number of live tokens.
+
+    update() takes a completed bar or a single tick. update_candle() takes the
+    repeated, still-forming candles a chart feed sends: a candle is only committed
+    once a later candle starts, so the indicators see each bar once, closed, the
+    way a batch computation over candles would.
+    """
+
+    def __init__(self, **windows):
+        self.windows = windows
+        self.tokens: Dict[str, TokenIndicators] = {}
+        self._forming: Dict[str, tuple] = {} # token -> (bar_time, close, high, low, volume)
+
+    def _state(self, token: str) -> TokenIndicators:
+        state = self.tokens.get(token)
+        if state is None:
+            state = self.tokens[token] = TokenIndicators(**self.windows)
+        return state
+
+    def update(self, token: str, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: float = 0.0) -> Dict[str, float]:
+        return self._state(token).update(close, high, low, volume)
+
+    def update_candle(self, token: str, bar_time: int, close: float, high: Optional[float] = None,
+                      low: Optional[float] = None, volume: float = 0.0) -> Optional[Dict[str, float]]:
+        """Returns fresh values when this candle closed the previous one, else None"""
+        forming = self._forming.get(token)
+        if forming is not None and bar_time < forming[0]:
+            return None # late update for a candle that has already been committed
+        self._forming[token] = (bar_time, close, high, low, volume)
+        if forming is None or bar_time == forming[0]:
+            return None
+        _, closed, closed_high, closed_low, closed_volume = forming
+        return self.update(token, closed, closed_high, closed_low, closed_volume)
+
+    def forming_candle(self, token: str) -> Optional[Tuple[int, float, Optional[float], Optional[float], float]]:
+        """(bar_time, close, high, low, volume) of the candle still forming for `token`, if any"""
+        return self._forming.get(token)
+
+    def values(self, token: str) -> Optional[Dict[str, float]]:
+        state = self.tokens.get(token)
+        return state.values() if state else None
+
+    def remove(self, token: str):
+        self.tokens.pop(token, None)
+        self._forming.pop(token, None)
+
+    def retain(self, tokens: Iterable[str]):
+        """Drop every token not in `tokens`, including ones that have only sent a forming candle"""
+        keep = set(tokens)
+        for token in (self.tokens.keys() | self._forming.keys()) - keep:
+            self.remove(token)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
@@ -1,8 +1,46 @@
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..core.config import settings
 from ..models.analysis_result import NarrativeIndicators, MemecoinPotential
 from datetime import datetime 
 
+SENTIMENT_FIELDS = [
+    'hype_level', 'fomo_intensity', 'community_growth',
+    'utility_mentions', 'meme_virality', 'risk_awareness'
+]
+
+@dataclass(frozen=True)
+class ScoringParams:
+    """Weights and cutoffs of _calculate_potential_score; the defaults are the original hand-tuned values"""
+    # Sentiment mix
+    hype_weight: float = 0.3
+    fomo_weight: float = 0.2
+    community_weight: float = 0.2
+    virality_weight: float = 0.2
+    utility_weight: float = 0.1
+    risk_weight: float = 0.1
+    sentiment_share: float = 0.4 # of the sentiment mix in the overall score
+    
+    # Volume / liquidity
+    high_activity_ratio: float = 0.5
+    high_activity_points: float = 25.0
+    moderate_activity_ratio: float = 0.2
+    moderate_activity_points: float = 15.0
+    
+    # Market cap band
+    min_market_cap: float = 100000.0
+    max_market_cap: float = 10000000.0
+    band_points: float = 20.0
+    early_stage_points: float = 10.0 # below min_market_cap
+    
+    security_share: float = 0.3
+    qualify_score: float = settings.QUALIFY_SCORE_THRESHOLD # hunt keeps opportunities scoring at least this
+
 class MemecoinPotentialScorer:
+    def __init__(self, params: Optional[ScoringParams] = None):
+        self.params = params or ScoringParams()
     
     def score_potential(self,
                         token_data: Dict,
@@ -82,18 +120,19 @@ class MemecoinPotentialScorer:
                                 volume_24h: float,
                                 price_change_24h: float,
                                 security_score: float) -> Tuple[float, str, str]:
+        p = self.params
         score = 0
         reasoning_parts = []
         
         sentiment_score = (
-            sentiment.hype_level * 0.3 +
-            sentiment.fomo_intensity * 0.2 + 
-            sentiment.community_growth * 0.2 + 
-            sentiment.meme_virality * 0.2 +
-            sentiment.utility_mentions * 0.1 -
-            sentiment.risk_awareness * 0.1 
+            sentiment.hype_level * p.hype_weight +
+            sentiment.fomo_intensity * p.fomo_weight + 
+            sentiment.community_growth * p.community_weight + 
+            sentiment.meme_virality * p.virality_weight +
+            sentiment.utility_mentions * p.utility_weight -
+            sentiment.risk_awareness * p.risk_weight 
         )
-        score += sentiment_score * 0.4
+        score += sentiment_score * p.sentiment_share
         
         if sentiment_score > 60:
             reasoning_parts.append("🔥 Strong social sentiment")
@@ -101,21 +140,21 @@ class MemecoinPotentialScorer:
             reasoning_parts.append("📈 Moderate social interest")
             
         volume_to_liquidity = (volume_24h / liquidity) if liquidity > 0 else 0
-        if volume_to_liquidity > 0.5:
-            score += 25
+        if volume_to_liquidity > p.high_activity_ratio:
+            score += p.high_activity_points
             reasoning_parts.append("💥 High Volume/Liquidity Ratio")
-        elif volume_to_liquidity > 0.2:
-            score += 15
+        elif volume_to_liquidity > p.moderate_activity_ratio:
+            score += p.moderate_activity_points
             reasoning_parts.append("📊 Moderate Trading Activity")
             
-        if 100000 <= market_cap <= 10000000:
-            score += 20
+        if p.min_market_cap <= market_cap <= p.max_market_cap:
+            score += p.band_points
             reasoning_parts.append("🎯 Optimal Market cap range")
-        elif market_cap < 100000:
-            score += 10 
+        elif market_cap < p.min_market_cap:
+            score += p.early_stage_points 
             reasoning_parts.append("💎 Early stage potential: HIGH RISK")
             
-        security_weight  = security_score * 0.3
+        security_weight  = security_score * p.security_share
         score += security_weight
         
         if security_score >= 80:
@@ -159,4 +198,122 @@ class MemecoinPotentialScorer:
             base_confidence -= 15
             
         return min(100, max(10, base_confidence))
-     
\ No newline at end of file
+    
+    def score_batch(self, batch: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
+        """Vectorized score_potential over a columnar batch, matching the scalar path exactly.
+        
+        Columns follow the scalar inputs: market fields as in token_data ('mc', 'liquidity',
+        'volume24h', 'price24hchangepercent'), security flags as in security_data plus a
+        boolean 'has_security' (False where no security data came back), or a precomputed
+        'security_score', and the NarrativeIndicators fields. Missing columns count as 0/False.
+        Returns overall_score, potential_type, confidence, security_score and sentiment_score,
+        as a DataFrame for DataFrame input and a dict of arrays otherwise. Reasoning text is
+        not built here; score_potential still produces it per token.
+        """
+        is_frame = isinstance(batch, pd.DataFrame)
+        if is_frame:
+            size = len(batch)
+        else:
+            size = len(next(iter(batch.values()))) if batch else 0
+        
+        def column(name: str, default: float = 0.0) -> np.ndarray:
+            if name not in batch:
+                return np.full(size, default, dtype=np.float64)
+            return np.nan_to_num(np.asarray(batch[name], dtype=np.float64), nan=default)
+        
+        def flag(name: str) -> np.ndarray:
+            if name not in batch:
+                return np.zeros(size, dtype=bool)
+            values = np.asarray(batch[name])
+            if values.dtype.kind == 'f':
+                # NaN means the flag was missing, which the scalar path reads as falsy
+                return np.nan_to_num(values, nan=0.0) != 0
+            if values.dtype == object:
+                return np.array([bool(v) and v == v for v in values], dtype=bool)
+            return values.astype(bool)
+        
+        market_cap = column('mc')
+        liquidity = column('liquidity')
+        volume_24h = column('volume24h')
+        price_change_24h = column('price24hchangepercent')
+        sentiment = {name: column(name) for name in SENTIMENT_FIELDS}
+        
+        if 'security_score' in batch:
+            security_score = column('security_score')
+        else:
+            security_score = self._assess_security_batch(
+                flag('has_security') if 'has_security' in batch else np.ones(size, dtype=bool),
+                flag('rug_pull'), flag('is_blacklisted'),
+                column('top_10_holder_percent'), flag('is_liquidity_locked')
+            )
+        
+        overall_score, potential_type, sentiment_score = self._calculate_potential_score_batch(
+            sentiment, market_cap, liquidity, volume_24h, price_change_24h, security_score
+        )
+        confidence = self._calculate_confidence_batch(security_score, sentiment)
+        
+        result = {
+            'overall_score': overall_score,
+            'potential_type': potential_type,
+            'confidence': confidence,
+            'security_score': security_score,
+            'sentiment_score': sentiment_score,
+        }
+        return pd.DataFrame(result, index=batch.index) if is_frame else result
+    
+    def _assess_security_batch(self, has_security, rug_pull, is_blacklisted, top_10_holders, is_liquidity_locked) -> np.ndarray:
+        score = np.full(len(has_security), 100.0)
+        score -= np.where(rug_pull, 50.0, 0.0)
+        score -= np.where(is_blacklisted, 40.0, 0.0)
+        score -= np.where(top_10_holders > 80, 30.0, np.where(top_10_holders > 60, 15.0, 0.0))
+        score -= np.where(is_liquidity_locked, 0.0, 20.0)
+        return np.where(has_security, np.maximum(0.0, score), 50.0)
+    
+    def _calculate_potential_score_batch(self,
+                                         sentiment: Dict[str, np.ndarray],
+                                         market_cap: np.ndarray,
+                                         liquidity: np.ndarray,
+                                         volume_24h: np.ndarray,
+                                         price_change_24h: np.ndarray,
+                                         security_score: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Same operation order as _calculate_potential_score so floats come out bit-identical
+        p = self.params
+        sentiment_score = (
+            sentiment['hype_level'] * p.hype_weight +
+            sentiment['fomo_intensity'] * p.fomo_weight + 
+            sentiment['community_growth'] * p.community_weight + 
+            sentiment['meme_virality'] * p.virality_weight +
+            sentiment['utility_mentions'] * p.utility_weight -
+            sentiment['risk_awareness'] * p.risk_weight 
+        )
+        score = sentiment_score * p.sentiment_share
+        
+        volume_to_liquidity = np.divide(
+            volume_24h, liquidity, out=np.zeros_like(volume_24h), where=liquidity > 0
+        )
+        score = score + np.where(volume_to_liquidity > p.high_activity_ratio, p.high_activity_points,
+                                 np.where(volume_to_liquidity > p.moderate_activity_ratio, p.moderate_activity_points, 0.0))
+        score = score + np.where(
+            (market_cap >= p.min_market_cap) & (market_cap <= p.max_market_cap), p.band_points,
+            np.where(market_cap < p.min_market_cap, p.early_stage_points, 0.0)
+        )
+        score = score + security_score * p.security_share
+        
+        potential_type = np.where(
+            (price_change_24h < -20) & (sentiment_score > 50), "DIP_BUY",
+            np.where((sentiment_score > 70) & (volume_to_liquidity > 0.3), "HYPE_TRAIN", "NEW_GEM")
+        ).astype(object)
+        
+        return np.minimum(100.0, np.maximum(0.0, score)), potential_type, sentiment_score
+    
+    def _calculate_confidence_batch(self, security_score: np.ndarray, sentiment: Dict[str, np.ndarray]) -> np.ndarray:
+        confidence = np.full(len(security_score), 70.0)
+        confidence += np.where(security_score >= 80, 20.0, np.where(security_score < 40, -30.0, 0.0))
+        
+        active_aspects = (
+            (sentiment['hype_level'] > 10).astype(int) + (sentiment['fomo_intensity'] > 10) +
+            (sentiment['community_growth'] > 10) + (sentiment['meme_virality'] > 10)
+        )
+        confidence += np.where(active_aspects >= 3, 10.0, np.where(active_aspects < 2, -15.0, 0.0))
+        
+        return np.minimum(100.0, np.maximum(10.0, confidence))
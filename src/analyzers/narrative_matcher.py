@@ -0,0 +1,69 @@
+import re
+from typing import Dict, FrozenSet, List, Tuple
+
+
+class NarrativeMatcher:
+    """Finds every narrative keyword in a tweet with one precompiled regex.
+
+    The keywords are compiled into a single trie-shaped pattern whose optional
+    suffixes are greedy, so at any position it matches the longest keyword that
+    starts there. Every shorter keyword starting at that position is a prefix of
+    the match, so expanding each match to the keywords it contains, and resuming
+    the search one character later, yields exactly the set a per-keyword `in`
+    check would, overlapping keywords included.
+    """
+
+    def __init__(self, narrative_keywords: Dict[str, List[str]]):
+        keywords = sorted({kw for kws in narrative_keywords.values() for kw in kws if kw})
+        self._pattern = re.compile(self._trie_pattern(keywords)) if keywords else None
+
+        # keyword -> every keyword found inside it, itself included
+        self._contained: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in keywords if other in kw) for kw in keywords
+        }
+
+        # keyword -> (aspect, times it is listed under that aspect)
+        self._keyword_aspects: Dict[str, List[Tuple[str, int]]] = {kw: [] for kw in keywords}
+        for aspect, kws in narrative_keywords.items():
+            for kw in set(kws):
+                if kw:
+                    self._keyword_aspects[kw].append((aspect, kws.count(kw)))
+
+    @staticmethod
+    def _trie_pattern(keywords: List[str]) -> str:
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # A keyword ends here: the longer continuations are optional, tried first
+            return "(?:" + body + ")?" if "" in node else body
+
+        return build(trie)
+
+    def match(self, text_lower: str) -> Dict[str, int]:
+        """Aspect -> number of that aspect's keywords present in the (lower-cased) text"""
+        if self._pattern is None:
+            return {}
+
+        found = set()
+        search = self._pattern.search
+        hit = search(text_lower)
+        while hit is not None:
+            keyword = hit.group()
+            if keyword not in found:
+                found |= self._contained[keyword]
+            hit = search(text_lower, hit.start() + 1)
+
+        counts: Dict[str, int] = {}
+        for keyword in found:
+            for aspect, multiplicity in self._keyword_aspects[keyword]:
+                counts[aspect] = counts.get(aspect, 0) + multiplicity
+        return counts
@@ -0,0 +1,330 @@
+"""Parameter sweep for MemecoinPotentialScorer against stored history.
+
+Every analysis the hunter ran is in score_history, qualified or not, so a
+candidate that lowers qualify_score or shifts weights is judged on the same
+tokens the defaults saw, not only on the ones the defaults let through. Each
+observation is re-scored under every candidate ScoringParams and judged by the
+forward return of the tokens it would have qualified, HORIZON seconds later,
+from price_rollups / price_data. History is loaded once into a shared-memory
+block that every worker process maps read-only, and each finished evaluation is
+appended to a JSONL checkpoint, so re-running the same command resumes an
+interrupted sweep on the same window of data. The best values can be applied
+through the SCORING_PARAMS setting.
+
+Run with: python -m src.analyzers.param_sweep --param hype_weight=0.2,0.3,0.4 --param qualify_score=30,40,50
+          python -m src.analyzers.param_sweep --random 500 --param sentiment_share=0.2:0.6 --param min_market_cap=50000:500000
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, fields
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from .memecoin_hunter import SENTIMENT_FIELDS, MemecoinPotentialScorer, ScoringParams
+from ..core.config import settings
+
+console = Console()
+
+# score_batch column names, in shared-array order; the forward return is the last column
+COLUMNS = ['mc', 'liquidity', 'volume24h', 'price24hchangepercent', *SENTIMENT_FIELDS, 'security_score']
+PARAM_NAMES = {field.name for field in fields(ScoringParams)}
+SearchSpace = Dict[str, Union[List[float], Tuple[float, float]]] # values for a grid, (low, high) for sampling
+
+_OBSERVATIONS = """
+    SELECT id, address AS coin_id, CAST(analyzed_at AS INTEGER) AS ts, price,
+           market_cap AS mc, liquidity, volume_24h AS volume24h, price_change_24h AS price24hchangepercent,
+           {sentiment}, security_score
+    FROM score_history WHERE analyzed_at >= :start AND analyzed_at < :end
+"""
+
+# First price at least `horizon` after each observation, within `tolerance`, and known by the window's end
+_ROLLUP_PRICE = """
+    (SELECT close FROM price_rollups r
+     WHERE r.coin_id = obs.coin_id AND r.resolution = :resolution
+       AND r.bucket >= obs.ts + :horizon AND r.bucket < obs.ts + :horizon + :tolerance
+       AND r.bucket + :resolution <= :end
+     ORDER BY r.bucket LIMIT 1)
+"""
+_RAW_PRICE = """
+    (SELECT price FROM price_data p
+     WHERE p.coin_id = obs.coin_id
+       AND p.timestamp >= datetime(obs.ts + :horizon, 'unixepoch')
+       AND p.timestamp < datetime(MIN(obs.ts + :horizon + :tolerance, :end), 'unixepoch')
+     ORDER BY p.timestamp LIMIT 1)
+"""
+
+
+def load_history(db_path: str = settings.DATABASE_PATH, start: Optional[int] = None, end: Optional[int] = None,
+                 horizon: int = 24 * 3600, resolution: int = 3600) -> np.ndarray:
+    """(observations x COLUMNS + forward return) float64 matrix for analyses in [start, end).
+
+    Forward prices are only taken from before `end`, so the same window loads the
+    same matrix later on. Missing fields read as 0, like score_batch's missing
+    columns; observations with no price `horizon` later are dropped.
+    """
+    end = int(time.time()) if end is None else end
+    start = end - 365 * 86400 if start is None else start
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        observations = _OBSERVATIONS.format(sentiment=", ".join(SENTIMENT_FIELDS))
+        # Closed buckets are in the rollups, the recent tail only in raw rows
+        has_rollups = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='price_rollups'"
+        ).fetchone()
+        future = f"COALESCE({_ROLLUP_PRICE}, {_RAW_PRICE})" if has_rollups else _RAW_PRICE
+        features = ", ".join(f"IFNULL({name}, 0.0)" for name in COLUMNS)
+        rows = conn.execute(f"""
+            SELECT {features}, future_price / price - 1.0
+            FROM (SELECT obs.*, {future} AS future_price FROM ({observations}) AS obs WHERE obs.price > 0)
+            WHERE future_price IS NOT NULL
+            ORDER BY id
+        """, {
+            "start": start, "end": end, "horizon": horizon,
+            "tolerance": 2 * resolution, "resolution": resolution,
+        })
+        history = np.fromiter(rows, dtype=np.dtype((np.float64, len(COLUMNS) + 1)))
+    finally:
+        conn.close()
+    return history.reshape(-1, len(COLUMNS) + 1)
+
+
+def history_fingerprint(history: np.ndarray) -> str:
+    """Part of every candidate key, so results computed on different data are never mixed"""
+    return hashlib.sha1(np.ascontiguousarray(history).tobytes()).hexdigest()[:16]
+
+
+class SharedHistory:
+    """History matrix in a shared-memory block; workers map it instead of receiving a copy"""
+
+    def __init__(self, history: np.ndarray):
+        self.shape = history.shape
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, history.nbytes))
+        np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)[:] = history
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, int]]:
+        return self._shm.name, self.shape
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_batch: Dict[str, np.ndarray] = {}
+_worker_returns: Optional[np.ndarray] = None
+
+
+def _attach(spec: Tuple[str, Tuple[int, int]]):
+    """Pool initializer: map the shared history once per worker, as read-only column views"""
+    global _worker_shm, _worker_batch, _worker_returns
+    name, shape = spec
+    # Pool workers share the parent's resource tracker, so the block is still unlinked exactly once
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    history = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    history.flags.writeable = False
+    _worker_batch = {name: history[:, i] for i, name in enumerate(COLUMNS)}
+    _worker_returns = history[:, -1]
+
+
+def evaluate(params: Dict[str, float]) -> Dict[str, float]:
+    """Score the shared history under params; stats of the forward returns of what qualifies"""
+    scorer = MemecoinPotentialScorer(ScoringParams(**params))
+    scored = scorer.score_batch(_worker_batch)
+    qualified = scored['overall_score'] >= scorer.params.qualify_score
+    returns = _worker_returns[qualified]
+    result = {"observations": int(len(_worker_returns)), "qualified": int(len(returns))}
+    if len(returns):
+        result.update({
+            "mean_return": float(returns.mean()),
+            "median_return": float(np.median(returns)),
+            "hit_rate": float((returns > 0).mean()),
+        })
+        for potential_type in ("DIP_BUY", "HYPE_TRAIN", "NEW_GEM"):
+            typed = returns[scored['potential_type'][qualified] == potential_type]
+            result[f"{potential_type.lower()}_mean_return"] = float(typed.mean()) if len(typed) else None
+    return result
+
+
+def grid(space: SearchSpace) -> Iterator[Dict[str, float]]:
+    names = sorted(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_samples(space: SearchSpace, count: int, seed: int = 0) -> Iterator[Dict[str, float]]:
+    """Seeded, so a resumed sweep draws the same candidates again"""
+    rng = random.Random(seed)
+    names = sorted(space)
+    for _ in range(count):
+        yield {
+            name: rng.uniform(*space[name]) if isinstance(space[name], tuple) else rng.choice(space[name])
+            for name in names
+        }
+
+
+def candidate_key(params: Dict[str, float], evaluation: Dict) -> str:
+    payload = json.dumps({"params": params, "evaluation": evaluation}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def resume_window(records: Dict[str, Dict], days: int, horizon: int, resolution: int) -> Optional[Tuple[int, int]]:
+    """(start, end) of the newest checkpointed sweep run with the same settings, if any"""
+    windows = [
+        (record["evaluation"]["start"], record["evaluation"]["end"]) for record in records.values()
+        if {key: record["evaluation"].get(key) for key in ("days", "horizon", "resolution")}
+        == {"days": days, "horizon": horizon, "resolution": resolution} and "end" in record["evaluation"]
+    ]
+    return max(windows, key=lambda window: window[1]) if windows else None
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict]:
+    records = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue # torn last line from an interrupted write
+                records[record["key"]] = record
+    return records
+
+
+def sweep(candidates: Iterator[Dict[str, float]], history: np.ndarray, checkpoint: str,
+          evaluation: Dict, workers: Optional[int] = None) -> List[Dict]:
+    """Evaluate every candidate not already in the checkpoint; returns all records, resumed ones included"""
+    records = load_checkpoint(checkpoint)
+    todo = {}
+    for params in candidates:
+        key = candidate_key(params, evaluation)
+        if key not in records:
+            todo[key] = params
+    console.print(f"[dim]{len(history):,} observations, {len(records):,} candidates from checkpoint, "
+                  f"{len(todo):,} to evaluate[/dim]")
+
+    shared = SharedHistory(history)
+    workers = workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shared.spec,)) as pool, \
+                open(checkpoint, "a", encoding="utf-8") as out:
+            pending = {}
+            queue = iter(todo.items())
+            while True:
+                # Bounded in flight, so a huge random sweep is not materialized as futures up front
+                for key, params in itertools.islice(queue, max(0, workers * 4 - len(pending))):
+                    pending[pool.submit(evaluate, params)] = (key, params)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, params = pending.pop(future)
+                    record = {"key": key, "params": params, "evaluation": evaluation, "result": future.result()}
+                    records[key] = record
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+    finally:
+        shared.close()
+    return list(records.values())
+
+
+def parse_space(specs: List[str]) -> SearchSpace:
+    space: SearchSpace = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in PARAM_NAMES:
+            raise ValueError(f"Unknown scoring parameter {name!r}; one of {', '.join(sorted(PARAM_NAMES))}")
+        if ":" in values:
+            low, high = values.split(":")
+            space[name] = (float(low), float(high))
+        else:
+            space[name] = [float(value) for value in values.split(",")]
+    return space
+
+
+def print_results(records: List[Dict], evaluation: Dict, top: int, min_qualified: int):
+    ranked = sorted(
+        (record for record in records
+         if record["evaluation"] == evaluation and record["result"]["qualified"] >= max(1, min_qualified)),
+        key=lambda record: record["result"]["mean_return"], reverse=True,
+    )
+    defaults = asdict(ScoringParams())
+    table = Table(title=f"Top {min(top, len(ranked))} of {len(records)} scoring parameter sets")
+    table.add_column("Mean Fwd Return", justify="right", style="green")
+    table.add_column("Hit Rate", justify="right")
+    table.add_column("Qualified", justify="right")
+    table.add_column("Changed from defaults", style="cyan")
+    for record in ranked[:top]:
+        result = record["result"]
+        changed = ", ".join(
+            f"{name}={value:g}" for name, value in sorted(record["params"].items()) if value != defaults[name]
+        )
+        table.add_row(f"{result['mean_return']:+.2%}", f"{result['hit_rate']:.1%}",
+                      f"{result['qualified']:,}", changed or "(defaults)")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep MemecoinPotentialScorer weights and thresholds against history")
+    parser.add_argument("--db", default=settings.DATABASE_PATH)
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=V1,V2|LOW:HIGH",
+                        help="values to try (grid) or a range to sample (--random); repeatable")
+    parser.add_argument("--random", type=int, default=0, help="sample this many candidates instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=365, help="history window")
+    parser.add_argument("--end", type=int, default=None,
+                        help="window end, unix seconds; defaults to the window of a matching sweep in the checkpoint, else now")
+    parser.add_argument("--horizon", type=int, default=24 * 3600, help="forward return horizon, seconds")
+    parser.add_argument("--resolution", type=int, default=3600, help="price_rollups resolution for forward prices")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default="param_sweep.jsonl")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--min-qualified", type=int, default=30, help="ignore candidates that qualify fewer observations")
+    args = parser.parse_args()
+
+    try:
+        space = parse_space(args.param)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.random and any(isinstance(values, tuple) for values in space.values()):
+        parser.error("LOW:HIGH ranges need --random")
+
+    window = None if args.end is not None else resume_window(
+        load_checkpoint(args.checkpoint), args.days, args.horizon, args.resolution
+    )
+    if window is None:
+        end = int(time.time()) if args.end is None else args.end
+        window = (end - args.days * 86400, end)
+    start, end = window
+    history = load_history(args.db, start, end, args.horizon, args.resolution)
+    if not len(history):
+        console.print("[yellow]No scored tokens in score_history with a later price to evaluate against[/yellow]")
+        return
+
+    candidates = random_samples(space, args.random, args.seed) if args.random else grid(space)
+    # The hand-tuned defaults always run, as the baseline to beat
+    candidates = itertools.chain([{name: asdict(ScoringParams())[name] for name in sorted(space)}], candidates)
+    evaluation = {
+        "days": args.days, "start": start, "end": end, "horizon": args.horizon, "resolution": args.resolution,
+        "history": history_fingerprint(history),
+    }
+
+    started = time.perf_counter()
+    records = sweep(candidates, history, args.checkpoint, evaluation, args.workers)
+    console.print(f"[dim]Sweep finished in {time.perf_counter() - started:.1f}s, results in {args.checkpoint}[/dim]")
+    print_results(records, evaluation, args.top, args.min_qualified)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
+import hashlib
+import json
 from textblob import TextBlob
-from typing import List 
+from typing import List, Optional
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from ..models.analysis_result import NarrativeIndicators
+from .narrative_matcher import NarrativeMatcher
+from .sentiment_cache import TweetSentimentCache
 from ..data_sources.twitter_client import TwitterClient
+from ..utils.metrics import HUNT_STAGE_SECONDS
 
 class SentimentAnalyzer:
-    def __init__(self, twitter_client:TwitterClient):
+    def __init__(self, twitter_client:TwitterClient, cache: Optional[TweetSentimentCache] = None):
         self.twitter_client = twitter_client
         self.vader = SentimentIntensityAnalyzer()
+        self.cache = cache
         
         self.narrative_keywords = {
             'hype': ['moon', '🚀', 'rocket', 'bullish', 'pump', 'gem', 'alpha', 'lfg'],
@@ -17,6 +23,11 @@ class SentimentAnalyzer:
             'meme': ['meme', 'viral', 'funny', 'lol', 'hilarious', 'based'],
             'risk': ['rug', 'scam', 'careful', 'dyor', 'risky', 'beware', 'sus', 'copytraders', 'crash']
         }
+        self.matcher = NarrativeMatcher(self.narrative_keywords)
+        # Cached aspect hits are only valid for the keyword lists that produced them
+        self.cache_namespace = hashlib.blake2b(
+            json.dumps(self.narrative_keywords, sort_keys=True).encode("utf-8"), digest_size=4
+        ).hexdigest()
     
     async def analyze_token_sentiment(self, token_symbol: str, token_name: str = "") -> NarrativeIndicators:
           queries = [f"${token_symbol}", token_name, f"{token_symbol} token"]
@@ -24,13 +35,15 @@ class SentimentAnalyzer:
           all_tweets = []
           for query in queries:
               if query:
-                  tweets = await self.twitter_client.fetch_recent_tweets(query, max_results=100)
+                  with HUNT_STAGE_SECONDS.time(stage="twitter"):
+                      tweets = await self.twitter_client.fetch_recent_tweets(query, max_results=100)
                   all_tweets.extend(tweets)
                   
           if not all_tweets:
               return NarrativeIndicators()
           
-          return self.analyze_narrative_aspects(all_tweets)
+          with HUNT_STAGE_SECONDS.time(stage="vader_scoring"):
+              return self.analyze_narrative_aspects(all_tweets)
       
     def analyze_narrative_aspects(self,  tweets: List[str]) -> NarrativeIndicators:
         indicators = NarrativeIndicators()
@@ -41,20 +54,16 @@ class SentimentAnalyzer:
         aspect_scores = {aspect: [] for aspect in self.narrative_keywords.keys()}
         
         for tweet in tweets:
-            tweet_lower = tweet.lower()
-            sentiment = self.vader.polarity_scores(tweet)
+            compound, aspect_hits = self._score_tweet(tweet)
+            if not aspect_hits:
+                continue
             
-            # Check for narrative keywords
-            for aspect, keywords in self.narrative_keywords.items():
-               aspect_score = 0
-               keyword_count = 0
-               
-               for keyword in keywords:
-                   if keyword in tweet_lower:
-                       keyword_count += 1
-                       aspect_score += sentiment['compound']
-               if keyword_count > 0:
-                   aspect_scores[aspect].append(aspect_score / keyword_count)
+            for aspect, keyword_count in aspect_hits.items():
+                aspect_score = 0
+                # Summed per keyword like the per-keyword loop did, so averages stay bit-identical
+                for _ in range(keyword_count):
+                    aspect_score += compound
+                aspect_scores[aspect].append(aspect_score / keyword_count)
                    
         indicators.hype_level = self._calculate_aspect_score(aspect_scores['hype'])
         indicators.fomo_intensity = self._calculate_aspect_score(aspect_scores['fomo'])
@@ -65,6 +74,22 @@ class SentimentAnalyzer:
         
         return indicators
     
+    def _score_tweet(self, tweet: str):
+        """VADER compound score and aspect hits for one tweet, reused across hunts via the cache"""
+        if self.cache is not None:
+            cached = self.cache.get(tweet, self.cache_namespace)
+            if cached is not None:
+                return cached
+        
+        # Check for narrative keywords, all aspects in one pass
+        aspect_hits = self.matcher.match(tweet.lower())
+        # Only tweets that hit an aspect are worth scoring
+        compound = self.vader.polarity_scores(tweet)['compound'] if aspect_hits else 0.0
+        
+        if self.cache is not None:
+            self.cache.put(tweet, self.cache_namespace, compound, aspect_hits)
+        return compound, aspect_hits
+    
     def _calculate_aspect_score(self, scores: List[float]) -> float:
         if not scores:
             return 0.0
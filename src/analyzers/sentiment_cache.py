@@ -0,0 +1,86 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import settings
+
+# (vader compound score, aspect -> keyword hit count)
+CachedSentiment = Tuple[float, Dict[str, int]]
+
+
+class TweetSentimentCache:
+    """Bounded, content-addressed cache of per-tweet VADER scores and aspect hits.
+
+    Entries are keyed by a hash of the tweet text plus a namespace that changes
+    whenever the keyword lists change, so a retuned analyzer never reads stale hits.
+    New entries are queued in memory and written to the store by `flush()`, which
+    keeps SQLite off the scoring hot path.
+    """
+
+    def __init__(self, max_entries: int = settings.SENTIMENT_CACHE_MAX_ENTRIES, store=None):
+        self.max_entries = max_entries
+        self.store = store
+        self._entries: "OrderedDict[str, CachedSentiment]" = OrderedDict()
+        self._unsaved: Dict[str, CachedSentiment] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, namespace: str = "") -> str:
+        return namespace + ":" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, text: str, namespace: str = "") -> Optional[CachedSentiment]:
+        key = self.make_key(text, namespace)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, text: str, namespace: str, compound: float, aspect_hits: Dict[str, int]):
+        key = self.make_key(text, namespace)
+        self._insert(key, (compound, aspect_hits))
+        if self.store is not None:
+            self._unsaved[key] = (compound, aspect_hits)
+
+    def _insert(self, key: str, entry: CachedSentiment):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def load(self) -> int:
+        """Warm the memory cache with the most recently stored entries"""
+        if self.store is None:
+            return 0
+        rows = self.store.load_tweet_sentiments(limit=self.max_entries)
+        # Oldest first so the newest end up most recently used
+        for row in reversed(rows):
+            self._insert(row['tweet_key'], (row['compound'], json.loads(row['aspect_hits'])))
+        return len(rows)
+
+    def flush(self) -> int:
+        """Persist entries added since the last flush; safe to call from a worker thread"""
+        if self.store is None or not self._unsaved:
+            return 0
+        unsaved, self._unsaved = self._unsaved, {}
+        rows: List[Tuple[str, float, str]] = [
+            (key, compound, json.dumps(aspect_hits)) for key, (compound, aspect_hits) in unsaved.items()
+        ]
+        if not self.store.save_tweet_sentiments(rows):
+            # Keep them for the next flush rather than dropping them
+            self._unsaved.update(unsaved)
+            return 0
+        return len(rows)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,217 @@
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Tuple
+
+from .config import settings
+from .database import DatabaseManager
+from ..models.analysis_result import MemecoinPotential
+
+
+class BulkWriter:
+    """Buffers rows for coins, price_data, sentiment_data, trading_potential, token_snapshots and score_history.
+
+    Buffers are flushed together through DatabaseManager.write_batch, in one
+    transaction, once DATABASE_BATCH_SIZE rows are pending or DATABASE_FLUSH_INTERVAL
+    seconds have passed since the last flush. close() flushes whatever is left.
+
+    A failed flush keeps the rows and is retried after an exponential backoff
+    instead of on every add; once more than DATABASE_MAX_PENDING_ROWS are stuck
+    behind failing writes, they are dropped.
+    """
+
+    def __init__(self, db: DatabaseManager,
+                 batch_size: int = settings.DATABASE_BATCH_SIZE,
+                 flush_interval: float = settings.DATABASE_FLUSH_INTERVAL,
+                 retry_backoff_max: float = settings.DATABASE_RETRY_BACKOFF_MAX,
+                 max_pending: int = settings.DATABASE_MAX_PENDING_ROWS):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_backoff_max = retry_backoff_max
+        self.max_pending = max_pending
+
+        self._coins: Dict[str, Dict[str, Any]] = {}
+        self._prices: List[Dict[str, Any]] = []
+        self._sentiments: List[Dict[str, Any]] = []
+        self._potentials: List[Dict[str, Any]] = []
+        self._snapshots: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._history: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._failures = 0 # consecutive failed flushes
+        self._retry_at = 0.0
+
+        self.rows_written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dropped_rows = 0
+        self.last_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    @property
+    def pending(self) -> int:
+        return (len(self._coins) + len(self._prices) + len(self._sentiments) +
+                len(self._potentials) + len(self._snapshots) + len(self._history))
+
+    def add_coin(self, coin: Dict[str, Any]):
+        # Later snapshots of the same coin replace earlier ones within a batch
+        self._coins[coin['id']] = coin
+        self._maybe_flush()
+
+    def add_price(self, price: Dict[str, Any]):
+        self._prices.append(price)
+        self._maybe_flush()
+
+    def add_sentiment(self, sentiment: Dict[str, Any]):
+        self._sentiments.append(sentiment)
+        self._maybe_flush()
+
+    def add_potential(self, potential: Dict[str, Any]):
+        self._potentials.append(potential)
+        self._maybe_flush()
+
+    def add_snapshot(self, snapshot: Dict[str, Any]):
+        self._snapshots[(snapshot['address'], snapshot['chain'])] = snapshot
+        if snapshot.get('opportunity'):
+            # token_snapshots keeps the latest analysis, score_history every one of them
+            self._history.append(snapshot)
+        self._maybe_flush()
+
+    def add_opportunity(self, opportunity: MemecoinPotential):
+        """Buffer every row a scored opportunity produces, one per table"""
+        rows = opportunity_rows(opportunity)
+        self._coins[rows['coin']['id']] = rows['coin']
+        self._prices.append(rows['price'])
+        self._sentiments.append(rows['sentiment'])
+        self._potentials.append(rows['potential'])
+        self._maybe_flush()
+
+    def snapshot_leaderboard(self, potentials: List[Dict[str, Any]]) -> bool:
+        """Flush first, so buffered trading_potential rows are deactivated along with older ones.
+
+        Skipped when that flush fails: ranking rows that never landed would leave a stale snapshot.
+        """
+        self.flush()
+        if self.pending:
+            print(f"Database error: leaderboard snapshot skipped, {self.pending} buffered rows not written yet")
+            return False
+        if not self.db.snapshot_leaderboard(potentials):
+            self.failed_flushes += 1
+            return False
+        self.rows_written += len(potentials)
+        return True
+
+    def _maybe_flush(self):
+        if time.monotonic() < self._retry_at:
+            return # backing off after a failed flush
+        if self.pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def due_in(self) -> float:
+        """Seconds until the buffered rows are due for a flush, or a failed one for its retry"""
+        due = max(self._last_flush + self.flush_interval, self._retry_at)
+        return max(0.0, due - time.monotonic())
+
+    def flush_if_due(self) -> int:
+        """Flush once the interval (or retry backoff) has passed, without waiting for another add"""
+        if self.pending and self.due_in() == 0:
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        self._last_flush = time.monotonic()
+        count = self.pending
+        if not count:
+            return 0
+
+        coins, prices = list(self._coins.values()), self._prices
+        sentiments, potentials = self._sentiments, self._potentials
+        snapshots, history = list(self._snapshots.values()), self._history
+        started = time.perf_counter()
+        if not self.db.write_batch(coins, prices, sentiments, potentials, snapshots, history):
+            # Rows stay buffered for the next attempt, which waits longer after each failure
+            self.failed_flushes += 1
+            self._failures += 1
+            backoff = min(self.flush_interval * 2 ** (self._failures - 1), self.retry_backoff_max)
+            self._retry_at = time.monotonic() + backoff
+            if count > self.max_pending:
+                print(f"Database error: dropping {count} buffered rows after {self._failures} failed flushes")
+                self.dropped_rows += count
+                self._clear()
+            return 0
+
+        self.last_flush_seconds = time.perf_counter() - started
+        self.total_flush_seconds += self.last_flush_seconds
+        self.max_flush_seconds = max(self.max_flush_seconds, self.last_flush_seconds)
+        self._clear()
+        self._failures = 0
+        self._retry_at = 0.0
+        self.rows_written += count
+        self.flushes += 1
+        return count
+
+    def _clear(self):
+        self._coins, self._prices, self._sentiments, self._potentials = {}, [], [], []
+        self._snapshots, self._history = {}, []
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": self.pending,
+            "rows_written": self.rows_written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "dropped_rows": self.dropped_rows,
+            "last_flush_seconds": self.last_flush_seconds,
+            "avg_flush_seconds": self.total_flush_seconds / self.flushes if self.flushes else 0.0,
+            "max_flush_seconds": self.max_flush_seconds,
+        }
+
+
+def opportunity_rows(opportunity: MemecoinPotential) -> Dict[str, Dict[str, Any]]:
+    """Rows for the coins, price_data, sentiment_data and trading_potential tables"""
+    indicators = asdict(opportunity.narrative_indicators)
+    return {
+        'coin': {
+            'id': opportunity.token_address,
+            'symbol': opportunity.symbol,
+            'name': opportunity.name or opportunity.symbol,
+            'is_memecoin': True,
+        },
+        'price': {
+            'coin_id': opportunity.token_address,
+            'price': opportunity.price,
+            'volume_24h': opportunity.volume_24h,
+            'market_cap': opportunity.market_cap,
+            'timestamp': opportunity.timestamp,
+        },
+        'sentiment': {
+            'coin_id': opportunity.token_address,
+            'platform': "Twitter",
+            # Same blend the dashboard shows in its Sentiment column
+            'sentiment_score': (indicators['hype_level'] + indicators['fomo_intensity']) / 2,
+            'aspect_scores': indicators,
+            'timestamp': opportunity.timestamp,
+        },
+        'potential': {
+            'coin_id': opportunity.token_address,
+            'potential_type': opportunity.potential_type,
+            'confidence_score': opportunity.confidence,
+            'details': {
+                'chain': opportunity.chain,
+                'overall_score': opportunity.overall_score,
+                'security_score': opportunity.security_score,
+                'security_flags': opportunity.security_flags,
+                'reasoning': opportunity.reasoning,
+                'price': opportunity.price,
+                'market_cap': opportunity.market_cap,
+                'liquidity': opportunity.liquidity,
+                'volume_24h': opportunity.volume_24h,
+                'price_change_24h': opportunity.price_change_24h,
+                'narrative_indicators': indicators,
+            },
+            'created_at': opportunity.timestamp,
+        },
+    }
@@ -9,11 +9,28 @@ load_dotenv("/config/api_keys.env")
 class Settings:
     COINGECKO_API_KEY: str = os.getenv("COINGECKO_API_KEY", "")
     TWITTER_BEARER_TOKEN: str = os.getenv("TWITTER_BEARER_TOKEN", "")
+    TWITTER_API_URL: str = "https://api.twitter.com"
+    TWITTER_REQUEST_TIMEOUT: float = 30.0 # seconds per request, rate-limit waits excluded
     BIRDEYE_API_URL: str = "https://public-api.birdeye.so"
     BIRDEYE_API_KEY: str = os.getenv("BIRDEYE_API_KEY", "")
+    BIRDEYE_MULTI_PRICE_BATCH: int = 100 # max addresses per /defi/multi_price call
+    BIRDEYE_MULTI_MARKET_DATA_BATCH: int = 20 # max addresses per /defi/v3/token/market-data/multiple call
     
     # Database config 
-    DATABASE_PATH: str = "/data/algo-nalysis.db"
+    DATABASE_PATH: str = os.getenv("DATABASE_PATH", "/data/algo-nalysis.db")
+    DATABASE_PERSISTENT_CONNECTION: bool = True # one long-lived WAL connection per thread
+    DATABASE_CACHE_SIZE_KB: int = 64000 # SQLite page cache per connection
+    DATABASE_MMAP_SIZE: int = 256 * 1024 * 1024
+    DATABASE_STATEMENT_CACHE: int = 256 # prepared statements kept per connection
+    TIMESERIES_RESOLUTIONS: List[int] = field(default_factory=lambda: [60, 300, 3600, 86400]) # rollup buckets, seconds, finest first
+    TIMESERIES_RAW_RETENTION_DAYS: Optional[int] = 7 # raw price_data rows kept once rolled up, None keeps everything
+    TIMESERIES_ROLLUP_RETENTION_DAYS: Dict[int, int] = field(default_factory=lambda: {
+        60: 30,
+        300: 180,
+        3600: 730,
+    }) # resolution -> days kept, resolutions not listed are kept forever
+    TIMESERIES_ROLLUP_LAG: int = 60 # seconds a bucket stays open for late rows before it is rolled up
+    TIMESERIES_MAX_POINTS: int = 500 # range queries pick the finest resolution that fits in this many points
     
     # Analysis Thresholds
     MEMECOIN_VOLUME_SPIKE_THRESHOLD: float = 500.0
@@ -26,9 +43,36 @@ class Settings:
     SOCIAL_PLATFORMS: List[str] = field(default_factory=lambda: ["Twitter", "Reddit", "Telegram"])
 
     # Real-Time Settings
-    WEBSOCKET_RECONNECT_INTERVAL: int = 30
-    CONSOLE_UPDATE_INTERVAL: int = 10
+    WEBSOCKET_ENABLED: bool = False # stream live prices for the top opportunities between hunts
+    BIRDEYE_WS_URL: str = "wss://public-api.birdeye.so/socket"
+    WEBSOCKET_RECONNECT_INTERVAL: int = 30 # longest backoff between reconnect attempts, seconds
+    WEBSOCKET_CHART_TYPE: str = "1m" # candle interval for SUBSCRIBE_PRICE
+    WEBSOCKET_QUEUE_SIZE: int = 1000 # updates buffered per consumer before the oldest are dropped
+    WEBSOCKET_WATCHLIST_SIZE: int = 20 # opportunities per chain kept on the live feed
+    CONSOLE_UPDATE_INTERVAL: int = 10 # seconds between live dashboard re-renders
+    LIVE_DASHBOARD: bool = os.getenv("LIVE_DASHBOARD", "false").lower() == "true" # fill the table in while the hunt runs
+    LIVE_DASHBOARD_ROWS: int = 25 # top rows shown; every scored token is still tracked
     RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMITS: Dict[str, int] = field(default_factory=dict) # "birdeye" or "birdeye:/defi/token_security" -> requests/min
+    RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_MAX_RETRIES: int = 3 # retries after HTTP 429
+    RATE_LIMIT_BACKOFF_BASE: float = 1.0 # seconds, used when 429 has no Retry-After
+    RATE_LIMIT_BACKOFF_MAX: float = 60.0
+    
+    # HTTP transport: live, record (live + capture to cassettes) or replay (serve cassettes offline)
+    TRANSPORT_MODE: str = os.getenv("TRANSPORT_MODE", "live")
+    TRANSPORT_CASSETTE_DIR: str = os.getenv("TRANSPORT_CASSETTE_DIR", "/data/cassettes")
+    REPLAY_LATENCY: str = "recorded" # "recorded[:scale]", "fixed:MS", "uniform:LOW,HIGH", "lognormal:MEDIAN_MS,SIGMA" or "0"
+    REPLAY_429_RATE: float = 0.0 # fraction of replayed requests answered with a 429
+    REPLAY_TIMEOUT_RATE: float = 0.0 # fraction of replayed requests that hang and time out
+    REPLAY_TIMEOUT_SECONDS: float = 30.0
+    REPLAY_RETRY_AFTER: float = 1.0 # Retry-After sent with injected 429s
+    REPLAY_SEED: Optional[int] = None # fixed seed makes injected faults reproducible
+    
+    # Metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() == "true" # off: every instrument is a no-op
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9108 # Prometheus text at http://METRICS_HOST:METRICS_PORT/metrics
     
     # Alert System
     EMAIL_ALERTS_ENABLED: bool = True
@@ -37,7 +81,47 @@ class Settings:
     
     # Performance settings 
     MAX_CONCURRENT_REQUESTS: int = 15
+    CONCURRENT_ENRICHMENT: bool = True # fan out token lookups, capped by MAX_CONCURRENT_REQUESTS
+    STREAMING_DISCOVERY: bool = False # page through the whole token list instead of the top 50
+    DISCOVERY_PAGE_SIZE: int = 50
+    DISCOVERY_MAX_TOKENS: int = 5000 # per chain, per hunt
+    INCREMENTAL_DISCOVERY: bool = False # only re-analyze tokens that are new or moved past the deltas below
+    TOKEN_PRICE_DELTA: float = 0.10 # relative change since the last analysis that triggers a fresh one
+    TOKEN_VOLUME_DELTA: float = 0.25
+    TOKEN_LIQUIDITY_DELTA: float = 0.15
+    TOKEN_SCORE_HALF_LIFE: float = 3600.0 # seconds for a reused score to lose half its value
+    TOKEN_REANALYZE_AFTER: float = 4 * 3600.0 # seconds before a snapshot is refreshed regardless of deltas
+    QUALIFY_SCORE_THRESHOLD: float = 40.0 # overall_score an opportunity needs to be reported, stored and alerted on
+    SCORING_PARAMS: Dict[str, float] = field(default_factory=dict) # ScoringParams overrides, e.g. values picked by src.analyzers.param_sweep
+    SCORE_HISTORY_RETENTION_DAYS: Optional[int] = 365 # score_history rows kept for parameter sweeps, None keeps everything
+    LEADERBOARD_SIZE: int = 10 # top opportunities shown and snapshotted as active in trading_potential
+    LEADERBOARD_PRUNE_SCORE: float = 5.0 # leaderboard entries decayed below this are forgotten
+    ADAPTIVE_SCHEDULING: bool = False # multi-shot mode refreshes each token on its own deadline instead of a fixed interval
+    SCHEDULER_MIN_INTERVAL: float = 60.0 # seconds between refreshes of the hottest tokens
+    SCHEDULER_MAX_INTERVAL: float = 1800.0 # seconds between refreshes of dead tokens
+    SCHEDULER_DISCOVERY_INTERVAL: float = 900.0 # seconds between token list scans for new tokens
+    SCHEDULER_REQUEST_BUDGET: float = 60.0 # API requests per minute shared by all scheduled refreshes
+    SCHEDULER_REQUESTS_PER_REFRESH: int = 3 # overview + security + sentiment
+    SCHEDULER_TOKEN_TTL: float = 3600.0 # seconds a token no longer listed by discovery stays scheduled
+    SCHEDULER_VOLATILITY_SCALE: float = 0.20 # price move between refreshes that counts as fully volatile
+    SCHEDULER_TREND_SCALE: float = 20.0 # score gain between refreshes that counts as fully trending
+    CHAIN_CONCURRENCY_QUOTAS: Dict[str, int] = field(default_factory=dict) # chain -> max in-flight lookups, default even split
     CACHE_DURATION: int = 120 # seconds
+    CACHE_TTLS: Dict[str, int] = field(default_factory=lambda: {
+        "/defi/tokenlist": 0, # discovery has to see every new listing
+        "/defi/token_overview": 120,
+        "/defi/token_security": 1800, # security data barely moves between hunts
+    }) # endpoint -> seconds, 0 disables caching for that endpoint
+    CACHE_MAX_ENTRIES: int = 5000
+    CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    CACHE_PERSISTENT: bool = False
+    CACHE_DB_PATH: str = "/data/response_cache.db"
     DATABASE_BATCH_SIZE: int = 100 
+    DATABASE_FLUSH_INTERVAL: float = 5.0 # seconds before a partial batch is flushed anyway
+    DATABASE_RETRY_BACKOFF_MAX: float = 60.0 # longest wait before a failed flush is retried, seconds
+    DATABASE_MAX_PENDING_ROWS: int = 50000 # rows kept buffered while flushes fail; past this they are dropped
+    PERSISTENCE_QUEUE_SIZE: int = 10000 # rows waiting for the background writer before submit() blocks
+    SENTIMENT_CACHE_MAX_ENTRIES: int = 50000 # scored tweets kept in memory
+    SENTIMENT_CACHE_PERSISTENT: bool = False # keep scored tweets in SQLite across restarts
     
 settings = Settings()
@@ -1,13 +1,21 @@
 import sqlite3
 import json
-from config import settings
-from datetime import datetime 
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from .config import settings
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from contextlib import contextmanager
 
 class DatabaseManager:
-    def __init__(self, db_path: str = settings.DATABASE_PATH):
+    def __init__(self, db_path: str = settings.DATABASE_PATH, persistent: bool = settings.DATABASE_PERSISTENT_CONNECTION):
         self.db_path = db_path
+        self.persistent = persistent
+        
+        # Persistent mode keeps one tuned connection per thread, reused across calls
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self.init_database()
         
     def init_database(self):
@@ -64,13 +72,73 @@ class DatabaseManager:
                  )
                  """)
             
+            # Per-tweet sentiment cache, keyed by a hash of the tweet text
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tweet_sentiment_cache(
+                    tweet_key TEXT PRIMARY KEY,
+                    compound REAL NOT NULL,
+                    aspect_hits TEXT, -- JSON aspect -> keyword hit count
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+            
+            # Last analyzed snapshot per token, for incremental discovery
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_snapshots(
+                    address TEXT NOT NULL,
+                    chain TEXT NOT NULL,
+                    price REAL,
+                    liquidity REAL,
+                    volume_24h REAL,
+                    overall_score REAL,
+                    opportunity TEXT, -- JSON MemecoinPotential from the last analysis
+                    analyzed_at REAL NOT NULL, -- unix seconds
+                    PRIMARY KEY (address, chain)
+                )
+                """)
+            
+            # Every fresh analysis, qualified or not, so score tuning is not limited to past winners
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS score_history(
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    address TEXT NOT NULL,
+                    chain TEXT NOT NULL,
+                    price REAL,
+                    market_cap REAL,
+                    liquidity REAL,
+                    volume_24h REAL,
+                    price_change_24h REAL,
+                    hype_level REAL,
+                    fomo_intensity REAL,
+                    community_growth REAL,
+                    utility_mentions REAL,
+                    meme_virality REAL,
+                    risk_awareness REAL,
+                    security_score REAL,
+                    overall_score REAL,
+                    analyzed_at REAL NOT NULL -- unix seconds
+                )
+                """)
+            
             # Performance Indexing
             conn.execute("CREATE INDEX IF NOT EXISTS idx_price_timestamp ON price_data(timestamp)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_coin_symbol ON coins(symbol)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_potential_active ON trading_potential(is_active)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_potential_coin ON trading_potential(coin_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_score_history_time ON score_history(analyzed_at)")
     
     @contextmanager
     def get_connection(self):
+        if self.persistent:
+            conn = self._thread_connection()
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            return
+        
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         try:
@@ -82,6 +150,35 @@ class DatabaseManager:
         finally:
             conn.close()
             
+    def _thread_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # sqlite3 keeps prepared statements per connection, keyed by SQL text,
+            # so a long-lived connection re-uses them instead of re-parsing every call
+            conn = sqlite3.connect(
+                self.db_path,
+                cached_statements=settings.DATABASE_STATEMENT_CACHE,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA cache_size=-{int(settings.DATABASE_CACHE_SIZE_KB)}")
+            conn.execute(f"PRAGMA mmap_size={int(settings.DATABASE_MMAP_SIZE)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every persistent connection; the next call on any thread reopens its own"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+            
     def insert_coin_data(self, coin_data: Dict[str, Any]) -> bool:
         try: 
             with self.get_connection() as conn:
@@ -99,5 +196,219 @@ class DatabaseManager:
             print(f"Database error: {e}")
             return False
         
-# Database Instance        
-db = DatabaseManager()
\ No newline at end of file
+    def save_tweet_sentiments(self, rows: List[Tuple[str, float, str]]) -> bool:
+        try:
+            with self.get_connection() as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO tweet_sentiment_cache(tweet_key, compound, aspect_hits)
+                    VALUES(?, ?, ?)
+                """, rows)
+            return True
+        except Exception as e:
+            print(f"Database error: {e}")
+            return False
+        
+    def load_tweet_sentiments(self, limit: int) -> List[sqlite3.Row]:
+        try:
+            with self.get_connection() as conn:
+                return conn.execute("""
+                    SELECT tweet_key, compound, aspect_hits FROM tweet_sentiment_cache
+                    ORDER BY created_at DESC LIMIT ?
+                """, (limit,)).fetchall()
+        except Exception as e:
+            print(f"Database error: {e}")
+            return []
+        
+    def load_token_snapshots(self, since: float) -> List[sqlite3.Row]:
+        try:
+            with self.get_connection() as conn:
+                return conn.execute("""
+                    SELECT address, chain, price, liquidity, volume_24h, overall_score, opportunity, analyzed_at
+                    FROM token_snapshots WHERE analyzed_at >= ?
+                """, (since,)).fetchall()
+        except Exception as e:
+            print(f"Database error: {e}")
+            return []
+        
+    def upsert_coins(self, coins: List[Dict[str, Any]]) -> bool:
+        return self.write_batch(coins=coins)
+    
+    def insert_prices(self, prices: List[Dict[str, Any]]) -> bool:
+        return self.write_batch(prices=prices)
+    
+    def insert_sentiments(self, sentiments: List[Dict[str, Any]]) -> bool:
+        return self.write_batch(sentiments=sentiments)
+    
+    def insert_potentials(self, potentials: List[Dict[str, Any]]) -> bool:
+        return self.write_batch(potentials=potentials)
+    
+    def upsert_token_snapshots(self, snapshots: List[Dict[str, Any]]) -> bool:
+        return self.write_batch(snapshots=snapshots)
+    
+    def prune_score_history(self, retention_days: Optional[int] = settings.SCORE_HISTORY_RETENTION_DAYS,
+                            now: Optional[float] = None) -> int:
+        """Delete score_history rows older than retention_days; None keeps everything"""
+        if retention_days is None:
+            return 0
+        now = time.time() if now is None else now
+        try:
+            with self.get_connection() as conn:
+                return conn.execute(
+                    "DELETE FROM score_history WHERE analyzed_at < ?", (now - retention_days * 86400,)
+                ).rowcount
+        except Exception as e:
+            print(f"Database error: {e}")
+            return 0
+        
+    def snapshot_leaderboard(self, potentials: List[Dict[str, Any]]) -> bool:
+        """Make these the only active trading_potential rows, in one transaction.
+
+        Each coin's latest stored row on its chain is reactivated and ranked in place;
+        a row is only inserted for a coin that has none yet.
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.execute("""
+                    UPDATE trading_potential
+                    SET is_active = FALSE, details = json_remove(details, '$.rank', '$.leaderboard_score')
+                    WHERE is_active
+                """)
+                for potential in potentials:
+                    details = potential.get('details') or {}
+                    updated = conn.execute("""
+                        UPDATE trading_potential
+                        SET is_active = TRUE, details = json_set(details, '$.rank', ?, '$.leaderboard_score', ?)
+                        WHERE id = (
+                            SELECT MAX(id) FROM trading_potential
+                            WHERE coin_id = ? AND json_extract(details, '$.chain') IS ?
+                        )
+                    """, (details.get('rank'), details.get('overall_score'), potential['coin_id'],
+                          details.get('chain'))).rowcount
+                    if not updated:
+                        conn.execute("""
+                            INSERT INTO trading_potential(coin_id, potential_type, confidence_score, details, is_active, created_at)
+                            VALUES(?, ?, ?, ?, TRUE, COALESCE(?, CURRENT_TIMESTAMP))
+                        """, (potential['coin_id'], potential['potential_type'], potential['confidence_score'],
+                              json.dumps(dict(details, leaderboard_score=details.get('overall_score')), default=str),
+                              to_sqlite_timestamp(potential.get('created_at'))))
+            return True
+        except Exception as e:
+            print(f"Database error: {e}")
+            return False
+        
+    def write_batch(self,
+                    coins: Optional[List[Dict[str, Any]]] = None,
+                    prices: Optional[List[Dict[str, Any]]] = None,
+                    sentiments: Optional[List[Dict[str, Any]]] = None,
+                    potentials: Optional[List[Dict[str, Any]]] = None,
+                    snapshots: Optional[List[Dict[str, Any]]] = None,
+                    history: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Write rows for every table with executemany inside a single transaction.
+        
+        history takes token_snapshots rows too; each one with an opportunity is
+        appended to score_history.
+        """
+        try:
+            with self.get_connection() as conn:
+                if coins:
+                    # Upsert keeps first_detected, which INSERT OR REPLACE would reset
+                    conn.executemany("""
+                        INSERT INTO coins(id, symbol, name, is_memecoin, last_updated)
+                        VALUES(?, ?, ?, ?, CURRENT_TIMESTAMP)
+                        ON CONFLICT(id) DO UPDATE SET
+                            symbol = excluded.symbol,
+                            name = excluded.name,
+                            is_memecoin = excluded.is_memecoin,
+                            last_updated = CURRENT_TIMESTAMP
+                    """, [
+                        (coin['id'], coin['symbol'], coin['name'], coin.get('is_memecoin', False))
+                        for coin in coins
+                    ])
+                if prices:
+                    conn.executemany("""
+                        INSERT INTO price_data(coin_id, price, volume_24h, market_cap, timestamp)
+                        VALUES(?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                    """, [
+                        (price['coin_id'], price['price'], price.get('volume_24h'), price.get('market_cap'),
+                         to_sqlite_timestamp(price.get('timestamp')))
+                        for price in prices
+                    ])
+                if sentiments:
+                    conn.executemany("""
+                        INSERT INTO sentiment_data(coin_id, platform, sentiment_score, aspect_scores, mention_count, timestamp)
+                        VALUES(?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                    """, [
+                        (sentiment['coin_id'], sentiment['platform'], sentiment['sentiment_score'],
+                         json.dumps(sentiment.get('aspect_scores') or {}), sentiment.get('mention_count'),
+                         to_sqlite_timestamp(sentiment.get('timestamp')))
+                        for sentiment in sentiments
+                    ])
+                if potentials:
+                    conn.executemany("""
+                        INSERT INTO trading_potential(coin_id, potential_type, confidence_score, details, is_active, created_at)
+                        VALUES(?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                    """, [
+                        (potential['coin_id'], potential['potential_type'], potential['confidence_score'],
+                         json.dumps(potential.get('details') or {}, default=str), potential.get('is_active', True),
+                         to_sqlite_timestamp(potential.get('created_at')))
+                        for potential in potentials
+                    ])
+                if snapshots:
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO token_snapshots(
+                            address, chain, price, liquidity, volume_24h, overall_score, opportunity, analyzed_at
+                        )
+                        VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                    """, [
+                        (snapshot['address'], snapshot['chain'], snapshot.get('price'), snapshot.get('liquidity'),
+                         snapshot.get('volume_24h'), snapshot.get('overall_score'),
+                         json.dumps(snapshot['opportunity'], default=str) if snapshot.get('opportunity') else None,
+                         snapshot['analyzed_at'])
+                        for snapshot in snapshots
+                    ])
+                if history:
+                    conn.executemany("""
+                        INSERT INTO score_history(
+                            address, chain, price, market_cap, liquidity, volume_24h, price_change_24h,
+                            hype_level, fomo_intensity, community_growth, utility_mentions, meme_virality,
+                            risk_awareness, security_score, overall_score, analyzed_at
+                        )
+                        VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, [
+                        score_history_row(snapshot) for snapshot in history if snapshot.get('opportunity')
+                    ])
+            return True
+        except Exception as e:
+            print(f"Database error: {e}")
+            return False
+
+def score_history_row(snapshot: Dict[str, Any]) -> Tuple:
+    """score_history values from a token_snapshots row: the scorer's inputs and its score"""
+    opportunity = snapshot['opportunity']
+    indicators = opportunity['narrative_indicators']
+    return (
+        snapshot['address'], snapshot['chain'], opportunity['price'], opportunity['market_cap'],
+        opportunity['liquidity'], opportunity['volume_24h'], opportunity['price_change_24h'],
+        indicators['hype_level'], indicators['fomo_intensity'], indicators['community_growth'],
+        indicators['utility_mentions'], indicators['meme_virality'], indicators['risk_awareness'],
+        opportunity['security_score'], opportunity['overall_score'], snapshot['analyzed_at'],
+    )
+
+def to_sqlite_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """UTC 'YYYY-MM-DD HH:MM:SS', the same format CURRENT_TIMESTAMP writes; naive datetimes are local time"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+# Database Instance, opened on first access so importing this module never touches DATABASE_PATH
+_db: Optional[DatabaseManager] = None
+
+def __getattr__(name: str):
+    global _db
+    if name == "db":
+        if _db is None:
+            _db = DatabaseManager()
+        return _db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
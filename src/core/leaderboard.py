@@ -0,0 +1,149 @@
+import heapq
+import itertools
+import math
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bulk_writer import opportunity_rows
+from .config import settings
+from ..models.analysis_result import MemecoinPotential
+
+EntryKey = Tuple[str, str] # (chain, token_address)
+
+
+class OpportunityLeaderboard:
+    """Ranked opportunities across hunts, with scores decaying by a half-life.
+
+    A score s recorded at time t is worth s * 0.5 ** ((now - t) / half_life) at
+    any later moment. In log space that is log(s) + t * ln2 / half_life minus a
+    term shared by every entry, so ranking by that sum never changes as time
+    passes: the heap key is fixed at upsert time and nothing is re-sorted. An
+    upsert pushes a fresh heap entry and the superseded one is skipped when it
+    surfaces (lazy deletion), so upserts are O(log n) and top(k) is O(k log n).
+    Staleness is decided by the sequence number of the key's latest push, since
+    two pushes can share a rank (any two zero scores rank -inf).
+    """
+
+    def __init__(self, half_life: float = settings.TOKEN_SCORE_HALF_LIFE,
+                 prune_below: float = settings.LEADERBOARD_PRUNE_SCORE):
+        self.half_life = half_life
+        self.prune_below = prune_below
+        self._rate = math.log(2) / half_life
+        # key -> (rank, opportunity, scored_at, seq of its live heap item)
+        self._entries: Dict[EntryKey, Tuple[float, MemecoinPotential, float, int]] = {}
+        # (-rank, seq, key); items whose seq no longer matches _entries are stale
+        self._heap: List[Tuple[float, int, EntryKey]] = []
+        self._seq = itertools.count()
+        self.upserts = 0
+
+    def _rank(self, score: float, scored_at: float) -> float:
+        if score <= 0:
+            return -math.inf
+        return math.log(score) + scored_at * self._rate
+
+    def upsert(self, opportunity: MemecoinPotential, scored_at: Optional[float] = None):
+        scored_at = time.time() if scored_at is None else scored_at
+        key = (opportunity.chain, opportunity.token_address)
+        rank = self._rank(opportunity.overall_score, scored_at)
+        seq = next(self._seq)
+        self._entries[key] = (rank, opportunity, scored_at, seq)
+        heapq.heappush(self._heap, (-rank, seq, key))
+        self.upserts += 1
+        # Stale entries are only dropped as they surface; rebuild once they dominate
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+
+    def refresh_market_data(self, chain: str, market_data: Dict[str, Dict[str, Any]]) -> int:
+        """Update price, liquidity and market cap of tracked entries from a batched lookup.
+
+        Scores, ranks and heap positions stay as they are; returns the entries updated.
+        """
+        updated = 0
+        for address, data in market_data.items():
+            key = (chain, address)
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            changes = {
+                field: float(data[field]) for field in ("price", "liquidity", "market_cap")
+                if data.get(field) is not None
+            }
+            if changes:
+                rank, opportunity, scored_at, seq = entry
+                self._entries[key] = (rank, replace(opportunity, **changes), scored_at, seq)
+                updated += 1
+        return updated
+
+    def remove(self, chain: str, token_address: str):
+        self._entries.pop((chain, token_address), None)
+
+    def decayed_score(self, chain: str, token_address: str, now: Optional[float] = None) -> Optional[float]:
+        entry = self._entries.get((chain, token_address))
+        if entry is None:
+            return None
+        now = time.time() if now is None else now
+        _, opportunity, scored_at, _ = entry
+        return opportunity.overall_score * 0.5 ** ((now - scored_at) / self.half_life)
+
+    def top(self, k: int = settings.LEADERBOARD_SIZE, min_score: float = 0.0, chain: Optional[str] = None,
+            now: Optional[float] = None) -> List[MemecoinPotential]:
+        """Best k opportunities as of now, each with overall_score decayed to now"""
+        now = time.time() if now is None else now
+        results: List[MemecoinPotential] = []
+        popped = []
+        while self._heap and len(results) < k:
+            item = heapq.heappop(self._heap)
+            _, seq, key = item
+            entry = self._entries.get(key)
+            if entry is None or entry[3] != seq:
+                continue # superseded or removed
+            popped.append(item)
+            _, opportunity, scored_at, _ = entry
+            score = opportunity.overall_score * 0.5 ** ((now - scored_at) / self.half_life)
+            if score < min_score:
+                break # everything below ranks lower still
+            if chain is None or key[0] == chain:
+                results.append(replace(opportunity, overall_score=score))
+        for item in popped:
+            heapq.heappush(self._heap, item)
+        return results
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Forget entries that have decayed below LEADERBOARD_PRUNE_SCORE"""
+        now = time.time() if now is None else now
+        floor = math.log(self.prune_below) + now * self._rate if self.prune_below > 0 else -math.inf
+        stale = [key for key, (rank, _, _, _) in self._entries.items() if rank < floor]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._compact()
+        return len(stale)
+
+    def _compact(self):
+        self._heap = []
+        for key, (rank, opportunity, scored_at, _) in self._entries.items():
+            seq = next(self._seq)
+            self._entries[key] = (rank, opportunity, scored_at, seq)
+            self._heap.append((-rank, seq, key))
+        heapq.heapify(self._heap)
+
+    def snapshot_rows(self, k: int = settings.LEADERBOARD_SIZE, min_score: float = 0.0,
+                      now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """trading_potential rows for the current top k, ranked, with decayed scores"""
+        rows = []
+        for position, opportunity in enumerate(self.top(k, min_score, now=now), start=1):
+            row = opportunity_rows(opportunity)['potential']
+            row['details']['rank'] = position
+            rows.append(row)
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tracked": len(self._entries),
+            "heap_size": len(self._heap),
+            "upserts": self.upserts,
+        }
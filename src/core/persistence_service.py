@@ -0,0 +1,167 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .bulk_writer import BulkWriter
+from .config import settings
+from .database import DatabaseManager
+from ..models.analysis_result import MemecoinPotential
+
+_FLUSH = "flush"
+_STOP = "stop"
+
+
+class _FlushRequest:
+    """Queued by drain(); `done` is set once the writer has flushed, `ok` says whether everything landed"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+
+
+class AsyncPersistenceService:
+    """Async front for BulkWriter: coroutines enqueue rows, a dedicated thread writes them.
+
+    The queue is bounded; when it is full, submit() suspends the calling coroutine
+    (never the event loop) until the writer catches up. drain() waits until every
+    queued row is on disk, close() drains and stops the thread.
+    """
+
+    def __init__(self, db: DatabaseManager,
+                 max_queue_size: int = settings.PERSISTENCE_QUEUE_SIZE,
+                 batch_size: int = settings.DATABASE_BATCH_SIZE,
+                 flush_interval: float = settings.DATABASE_FLUSH_INTERVAL):
+        self.db = db
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        # Only the writer thread touches the BulkWriter and its buffers
+        self._writer = BulkWriter(db, batch_size=batch_size, flush_interval=flush_interval)
+        self._thread: Optional[threading.Thread] = None
+
+        self.enqueued = 0
+        self.max_queue_depth = 0
+        self.backpressure_waits = 0
+        self.total_queue_wait = 0.0
+        self.dequeued = 0
+        self.write_errors = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    async def submit(self, kind: str, row: Any):
+        """Queue a row of kind 'opportunity', 'coin', 'price', 'sentiment', 'potential', 'snapshot' or 'leaderboard'"""
+        self.start()
+        item = (kind, row, time.monotonic())
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                # Backpressure: park this coroutine only, let the writer drain
+                self.backpressure_waits += 1
+                await asyncio.sleep(0.01)
+        if kind not in (_FLUSH, _STOP):
+            self.enqueued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    async def submit_opportunity(self, opportunity: MemecoinPotential):
+        await self.submit("opportunity", opportunity)
+
+    async def submit_price(self, price: Dict[str, Any]):
+        await self.submit("price", price)
+
+    async def submit_sentiment(self, sentiment: Dict[str, Any]):
+        await self.submit("sentiment", sentiment)
+
+    async def submit_snapshot(self, snapshot: Dict[str, Any]):
+        await self.submit("snapshot", snapshot)
+
+    async def submit_leaderboard(self, potentials: List[Dict[str, Any]]):
+        await self.submit("leaderboard", potentials)
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been flushed to SQLite.
+
+        False if the timeout ran out or the flush failed and rows are still waiting for a retry.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        await self.submit(_FLUSH, request)
+        return await asyncio.to_thread(request.done.wait, timeout) and request.ok
+
+    async def close(self, timeout: Optional[float] = None):
+        if self._thread is None or not self._thread.is_alive():
+            return
+        await self.submit(_STOP, None)
+        await asyncio.to_thread(self._thread.join, timeout)
+
+    def _run(self):
+        while True:
+            # Wake up when the buffered rows are due, not a full interval after the last one arrived
+            timeout = self._writer.due_in() if self._writer.pending else self.flush_interval
+            try:
+                kind, row, queued_at = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Idle: push out a partial batch once it is old enough
+                self._safe(self._writer.flush_if_due)
+                continue
+
+            self.dequeued += 1
+            self.total_queue_wait += time.monotonic() - queued_at
+            if kind == _STOP:
+                self._safe(self._writer.close)
+                return
+            if kind == _FLUSH:
+                row.ok = self._safe(self._writer.flush) and not self._writer.pending
+                row.done.set()
+                continue
+            self._safe(self._dispatch, kind, row)
+
+    def _dispatch(self, kind: str, row: Any):
+        if kind == "opportunity":
+            self._writer.add_opportunity(row)
+        elif kind == "coin":
+            self._writer.add_coin(row)
+        elif kind == "price":
+            self._writer.add_price(row)
+        elif kind == "sentiment":
+            self._writer.add_sentiment(row)
+        elif kind == "potential":
+            self._writer.add_potential(row)
+        elif kind == "snapshot":
+            self._writer.add_snapshot(row)
+        elif kind == "leaderboard":
+            self._writer.snapshot_leaderboard(row)
+        else:
+            raise ValueError(f"Unknown persistence kind: {kind}")
+
+    def _safe(self, fn, *args) -> bool:
+        # One bad row must not kill the writer thread
+        try:
+            fn(*args)
+            return True
+        except Exception as e:
+            self.write_errors += 1
+            print(f"Database writer error: {e}")
+            return False
+
+    def metrics(self) -> Dict[str, float]:
+        writer_stats = self._writer.stats()
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "enqueued": self.enqueued,
+            "backpressure_waits": self.backpressure_waits,
+            "avg_queue_wait_seconds": self.total_queue_wait / self.dequeued if self.dequeued else 0.0,
+            "rows_written": writer_stats["rows_written"],
+            "flushes": writer_stats["flushes"],
+            "avg_write_seconds": writer_stats["avg_flush_seconds"],
+            "max_write_seconds": writer_stats["max_flush_seconds"],
+            "write_errors": self.write_errors + writer_stats["failed_flushes"],
+            "dropped_rows": writer_stats["dropped_rows"],
+        }
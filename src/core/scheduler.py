@@ -0,0 +1,229 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .config import settings
+from ..models.analysis_result import MemecoinPotential
+from ..utils.rate_limiter import TokenBucket
+
+TokenKey = Tuple[str, str] # (chain, address)
+
+
+@dataclass
+class ScheduledToken:
+    token: Dict
+    chain: str
+    due_at: float = 0.0
+    interval: float = 0.0
+    last_price: Optional[float] = None
+    volatility: float = 0.0 # relative price move between the last two refreshes
+    score: float = 0.0
+    score_trend: float = 0.0 # score change between the last two refreshes
+    refreshes: int = 0
+    failures: int = 0 # failed refreshes in a row
+    last_seen: float = field(default_factory=time.monotonic) # last time discovery listed it
+
+
+class RefreshScheduler:
+    """Refreshes each token on its own deadline instead of re-running the whole hunt.
+
+    Tokens sit in a min-heap keyed by their next due time. After every refresh a
+    token's interval is interpolated geometrically between SCHEDULER_MAX_INTERVAL
+    and SCHEDULER_MIN_INTERVAL by an urgency built from its recent volatility,
+    its score and its score trend, so hot tokens come back within minutes while
+    dead ones wait. A refresh that fails doubles the token's wait, from
+    SCHEDULER_MIN_INTERVAL up to SCHEDULER_MAX_INTERVAL. Refreshes draw from one global SCHEDULER_REQUEST_BUDGET token
+    bucket, so a burst of due work queues instead of blowing through API quota.
+    Discovery still runs every SCHEDULER_DISCOVERY_INTERVAL to pick up new tokens.
+    """
+
+    def __init__(self,
+                 discover: Callable[[str], Awaitable[List[Dict]]],
+                 refresh: Callable[[Dict, str], Awaitable[Optional[MemecoinPotential]]],
+                 chains: List[str],
+                 on_result: Optional[Callable[[MemecoinPotential], Awaitable[None]]] = None,
+                 min_interval: float = settings.SCHEDULER_MIN_INTERVAL,
+                 max_interval: float = settings.SCHEDULER_MAX_INTERVAL,
+                 discovery_interval: float = settings.SCHEDULER_DISCOVERY_INTERVAL,
+                 request_budget: float = settings.SCHEDULER_REQUEST_BUDGET,
+                 requests_per_refresh: int = settings.SCHEDULER_REQUESTS_PER_REFRESH,
+                 max_in_flight: int = settings.MAX_CONCURRENT_REQUESTS,
+                 token_ttl: float = settings.SCHEDULER_TOKEN_TTL):
+        self.discover = discover
+        self.refresh = refresh
+        self.chains = chains
+        self.on_result = on_result
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.discovery_interval = discovery_interval
+        self.requests_per_refresh = requests_per_refresh
+        self.token_ttl = token_ttl
+        self.budget = TokenBucket(request_budget, max(settings.RATE_LIMIT_BURST, requests_per_refresh))
+        self.max_in_flight = max_in_flight
+
+        self.tokens: Dict[TokenKey, ScheduledToken] = {}
+        # (due_at, seq, key); entries whose due_at no longer matches the token are stale and skipped
+        self._heap: List[Tuple[float, int, TokenKey]] = []
+        self._seq = itertools.count()
+        self._running: set = set()
+        self._wake = asyncio.Event() # set whenever the heap changes while run() is idle
+        self._next_discovery = 0.0
+
+        self.refreshes = 0
+        self.discoveries = 0
+        self.errors = 0
+
+    def urgency(self, state: ScheduledToken) -> float:
+        """0 (dead) .. 1 (hot) from volatility, score and score trend"""
+        volatility = min(1.0, state.volatility / settings.SCHEDULER_VOLATILITY_SCALE)
+        score = min(1.0, max(0.0, state.score / 100.0))
+        trend = min(1.0, max(0.0, state.score_trend / settings.SCHEDULER_TREND_SCALE))
+        return min(1.0, 0.4 * volatility + 0.4 * score + 0.2 * trend)
+
+    def refresh_interval(self, state: ScheduledToken) -> float:
+        ratio = self.min_interval / self.max_interval
+        return self.max_interval * math.pow(ratio, self.urgency(state))
+
+    def schedule(self, key: TokenKey, due_at: float):
+        state = self.tokens[key]
+        state.due_at = due_at
+        heapq.heappush(self._heap, (due_at, next(self._seq), key))
+        self._wake.set()
+
+    def add_tokens(self, tokens: List[Dict], chain: str, now: Optional[float] = None):
+        """New tokens are due immediately; known ones just get their listing data updated"""
+        now = time.monotonic() if now is None else now
+        for token in tokens:
+            key = (chain, token.get('address', ''))
+            state = self.tokens.get(key)
+            if state is None:
+                self.tokens[key] = ScheduledToken(token=token, chain=chain, last_seen=now)
+                self.schedule(key, now)
+            else:
+                state.token = token
+                state.last_seen = now
+
+    def _pop_due(self, now: float) -> Optional[TokenKey]:
+        while self._heap:
+            due_at, _, key = self._heap[0]
+            state = self.tokens.get(key)
+            if state is None or state.due_at != due_at:
+                heapq.heappop(self._heap)
+                continue
+            if due_at > now:
+                return None
+            heapq.heappop(self._heap)
+            return key
+        return None
+
+    def next_due(self) -> Optional[float]:
+        while self._heap:
+            due_at, _, key = self._heap[0]
+            state = self.tokens.get(key)
+            if state is None or state.due_at != due_at:
+                heapq.heappop(self._heap)
+                continue
+            return due_at
+        return None
+
+    async def run(self, stop: Optional[asyncio.Event] = None):
+        stop = stop or asyncio.Event()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        try:
+            while not stop.is_set():
+                now = time.monotonic()
+                if now >= self._next_discovery:
+                    await self._discover_all(now)
+                    self._next_discovery = now + self.discovery_interval
+
+                key = self._pop_due(now)
+                if key is None:
+                    next_due = self.next_due()
+                    wake_at = self._next_discovery if next_due is None else min(next_due, self._next_discovery)
+                    await self._idle(stop, wake_at)
+                    continue
+
+                await slots.acquire()
+                await self.budget.acquire(self.requests_per_refresh)
+                task = asyncio.create_task(self._refresh(key))
+                self._running.add(task)
+                task.add_done_callback(lambda done: (self._running.discard(done), slots.release()))
+        finally:
+            for task in self._running:
+                task.cancel()
+
+    async def _idle(self, stop: asyncio.Event, wake_at: float):
+        """Sleep until wake_at, a stop request, or a finished refresh putting a token back on the heap"""
+        self._wake.clear()
+        waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wake.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=max(0.0, wake_at - time.monotonic()),
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _discover_all(self, now: float):
+        results = await asyncio.gather(*(self.discover(chain) for chain in self.chains), return_exceptions=True)
+        for chain, tokens in zip(self.chains, results):
+            if isinstance(tokens, Exception) or not tokens:
+                continue
+            self.add_tokens(tokens, chain, now)
+        self.discoveries += 1
+
+        # Forget tokens discovery has stopped listing, unless they are still hot
+        for key, state in list(self.tokens.items()):
+            if now - state.last_seen > self.token_ttl and self.urgency(state) < 0.5:
+                del self.tokens[key]
+
+    async def _refresh(self, key: TokenKey):
+        state = self.tokens.get(key)
+        if state is None:
+            return
+        try:
+            opportunity = await self.refresh(state.token, state.chain)
+        except Exception:
+            opportunity = None
+        self.refreshes += 1
+
+        if key not in self.tokens:
+            return
+        try:
+            if opportunity is None:
+                # Failed: retry, doubling the wait from min_interval with every failure in a row
+                state.failures += 1
+                state.interval = min(self.max_interval, self.min_interval * 2 ** (state.failures - 1))
+            else:
+                self.update(state, opportunity)
+                if self.on_result:
+                    await self.on_result(opportunity)
+        except Exception as e:
+            # A failing callback must not drop the token from the schedule
+            self.errors += 1
+            print(f"Scheduler callback error: {e}")
+        self.schedule(key, time.monotonic() + max(state.interval, self.min_interval))
+
+    def update(self, state: ScheduledToken, opportunity: MemecoinPotential):
+        if state.last_price:
+            state.volatility = abs(opportunity.price - state.last_price) / state.last_price
+        if state.refreshes:
+            state.score_trend = opportunity.overall_score - state.score
+        state.last_price = opportunity.price
+        state.score = opportunity.overall_score
+        state.refreshes += 1
+        state.failures = 0
+        state.interval = self.refresh_interval(state)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "tracked": len(self.tokens),
+            "refreshes": self.refreshes,
+            "discoveries": self.discoveries,
+            "errors": self.errors,
+            "in_flight": len(self._running),
+            "queued": len(self._heap),
+        }
@@ -0,0 +1,251 @@
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .database import DatabaseManager
+
+RAW = 0 # resolution id for un-aggregated price_data rows
+
+# OHLCV for one resolution, computed from `src` rows of (coin_id, bucket, ts, seq, open, high, low, close, volume, samples).
+# open/close come from the first/last row of each bucket; volume is the last observed 24h volume.
+_AGGREGATE_SQL = """
+    SELECT coin_id, bucket,
+           MAX(CASE WHEN first_rank = 1 THEN open END) AS open,
+           MAX(high) AS high,
+           MIN(low) AS low,
+           MAX(CASE WHEN last_rank = 1 THEN close END) AS close,
+           MAX(CASE WHEN last_rank = 1 THEN volume END) AS volume,
+           SUM(samples) AS samples
+    FROM (
+        SELECT coin_id, bucket, open, high, low, close, volume, samples,
+               ROW_NUMBER() OVER (PARTITION BY coin_id, bucket ORDER BY ts, seq) AS first_rank,
+               ROW_NUMBER() OVER (PARTITION BY coin_id, bucket ORDER BY ts DESC, seq DESC) AS last_rank
+        FROM ({src})
+    )
+    GROUP BY coin_id, bucket
+"""
+
+_RAW_SRC = """
+    SELECT coin_id, CAST(strftime('%s', timestamp) AS INTEGER) / :res * :res AS bucket,
+           timestamp AS ts, id AS seq, price AS open, price AS high, price AS low, price AS close,
+           volume_24h AS volume, 1 AS samples
+    FROM price_data
+    WHERE timestamp >= :start_text AND timestamp < :end_text {coin_filter}
+"""
+
+_ROLLUP_SRC = """
+    SELECT coin_id, bucket / :res * :res AS bucket,
+           bucket AS ts, 0 AS seq, open, high, low, close, volume, samples
+    FROM price_rollups
+    WHERE resolution = :child AND bucket >= :start AND bucket < :end {coin_filter}
+"""
+
+
+def epoch_to_sqlite(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class PriceTimeSeries:
+    """Time-series layer over price_data: OHLCV rollups, retention and range queries.
+
+    Raw rows roll up into the finest resolution, and each coarser resolution rolls
+    up from the one below it, so no pass ever rescans raw history. A watermark per
+    resolution records how far it has been built; only closed buckets (older than
+    TIMESERIES_ROLLUP_LAG) are rolled up, and raw rows are only deleted once every
+    resolution has consumed them.
+    """
+
+    def __init__(self, db: DatabaseManager,
+                 resolutions: Optional[List[int]] = None,
+                 raw_retention_days: Optional[int] = settings.TIMESERIES_RAW_RETENTION_DAYS,
+                 rollup_retention_days: Optional[Dict[int, int]] = None,
+                 rollup_lag: int = settings.TIMESERIES_ROLLUP_LAG):
+        self.db = db
+        self.resolutions = sorted(resolutions or settings.TIMESERIES_RESOLUTIONS)
+        self.raw_retention_days = raw_retention_days
+        self.rollup_retention_days = (rollup_retention_days if rollup_retention_days is not None
+                                      else dict(settings.TIMESERIES_ROLLUP_RETENTION_DAYS))
+        self.rollup_lag = rollup_lag
+        self.init_schema()
+
+    def init_schema(self):
+        with self.db.get_connection() as conn:
+            # Covers per-coin history reads without touching the table itself
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_price_coin_time
+                ON price_data(coin_id, timestamp, price, volume_24h)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS price_rollups(
+                    coin_id TEXT NOT NULL,
+                    resolution INTEGER NOT NULL, -- bucket width in seconds
+                    bucket INTEGER NOT NULL, -- bucket start, unix seconds UTC
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL, -- last 24h volume seen in the bucket
+                    samples INTEGER NOT NULL,
+                    PRIMARY KEY (coin_id, resolution, bucket)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollup_watermarks(
+                    resolution INTEGER PRIMARY KEY,
+                    watermark INTEGER NOT NULL -- everything before this is rolled up
+                )
+            """)
+
+    def maintain(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Roll up closed buckets, then apply retention; cheap enough to call after every hunt"""
+        now = time.time() if now is None else now
+        stats = {f"rolled_{res}": count for res, count in self.rollup(now).items()}
+        stats.update(self.apply_retention(now))
+        return stats
+
+    def rollup(self, now: Optional[float] = None) -> Dict[int, int]:
+        now = time.time() if now is None else now
+        closed = int(now) - self.rollup_lag
+        watermarks = self._watermarks()
+        written: Dict[int, int] = {}
+
+        child = RAW
+        for res in self.resolutions:
+            end = closed // res * res
+            if child != RAW:
+                # A coarse bucket is only complete once its children are
+                end = min(end, watermarks.get(child, 0) // res * res)
+            start = watermarks.get(res)
+            if start is None:
+                start = self._first_bucket(child, res)
+            if start is not None and end > start:
+                written[res] = self._build(res, child, start, end)
+                watermarks[res] = end
+            child = res
+        return written
+
+    def _build(self, res: int, child: int, start: int, end: int) -> int:
+        if child == RAW:
+            src = _RAW_SRC.format(coin_filter="")
+            params = {"res": res, "start_text": epoch_to_sqlite(start), "end_text": epoch_to_sqlite(end)}
+        else:
+            src = _ROLLUP_SRC.format(coin_filter="")
+            params = {"res": res, "child": child, "start": start, "end": end}
+
+        with self.db.get_connection() as conn:
+            cursor = conn.execute(f"""
+                INSERT INTO price_rollups(coin_id, resolution, bucket, open, high, low, close, volume, samples)
+                SELECT coin_id, :res, bucket, open, high, low, close, volume, samples
+                FROM ({_AGGREGATE_SQL.format(src=src)})
+                WHERE true
+                ON CONFLICT(coin_id, resolution, bucket) DO UPDATE SET
+                    open = excluded.open, high = excluded.high, low = excluded.low,
+                    close = excluded.close, volume = excluded.volume, samples = excluded.samples
+            """, params)
+            conn.execute("""
+                INSERT INTO rollup_watermarks(resolution, watermark) VALUES(?, ?)
+                ON CONFLICT(resolution) DO UPDATE SET watermark = excluded.watermark
+            """, (res, end))
+            return cursor.rowcount
+
+    def _first_bucket(self, child: int, res: int) -> Optional[int]:
+        with self.db.get_connection() as conn:
+            if child == RAW:
+                row = conn.execute(
+                    "SELECT CAST(strftime('%s', MIN(timestamp)) AS INTEGER) FROM price_data"
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT MIN(bucket) FROM price_rollups WHERE resolution = ?", (child,)
+                ).fetchone()
+        return None if row[0] is None else row[0] // res * res
+
+    def _watermarks(self) -> Dict[int, int]:
+        with self.db.get_connection() as conn:
+            return {row[0]: row[1] for row in conn.execute("SELECT resolution, watermark FROM rollup_watermarks")}
+
+    def apply_retention(self, now: Optional[float] = None) -> Dict[str, int]:
+        now = time.time() if now is None else now
+        deleted: Dict[str, int] = {}
+        watermarks = self._watermarks()
+
+        with self.db.get_connection() as conn:
+            if self.raw_retention_days is not None and self.resolutions:
+                # Never drop raw rows a resolution still has to roll up or serve as its live tail
+                cutoff = min([int(now) - self.raw_retention_days * 86400] +
+                             [watermarks.get(res, 0) for res in self.resolutions])
+                deleted["raw"] = conn.execute(
+                    "DELETE FROM price_data WHERE timestamp < ?", (epoch_to_sqlite(cutoff),)
+                ).rowcount
+
+            for res, days in self.rollup_retention_days.items():
+                cutoff = int(now) - days * 86400
+                deleted[f"rollup_{res}"] = conn.execute(
+                    "DELETE FROM price_rollups WHERE resolution = ? AND bucket < ?", (res, cutoff)
+                ).rowcount
+        return deleted
+
+    def choose_resolution(self, start: int, end: int, max_points: int = settings.TIMESERIES_MAX_POINTS,
+                          now: Optional[float] = None) -> int:
+        """Coarsest resolution the range needs: the finest one that fits in max_points and still holds the range"""
+        now = time.time() if now is None else now
+        span = max(0, end - start)
+        candidates = [(RAW, self.raw_retention_days)] + [
+            (res, self.rollup_retention_days.get(res)) for res in self.resolutions
+        ]
+        for res, retention_days in candidates:
+            if retention_days is not None and start < now - retention_days * 86400:
+                continue
+            # Raw rows arrive roughly once per hunt, budget them like the finest rollup
+            width = res or (self.resolutions[0] if self.resolutions else 1)
+            if span / width <= max_points:
+                return res
+        return self.resolutions[-1] if self.resolutions else RAW
+
+    def query_range(self, coin_id: str, start: datetime, end: datetime,
+                    max_points: int = settings.TIMESERIES_MAX_POINTS,
+                    resolution: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """(resolution, OHLCV rows) for a coin between start and end, oldest first.
+
+        Buckets past the resolution's watermark are aggregated on the fly from raw
+        rows, so the newest candle is always present even before it is rolled up.
+        """
+        start_epoch = int(start.timestamp())
+        end_epoch = int(end.timestamp())
+        if resolution is None:
+            resolution = self.choose_resolution(start_epoch, end_epoch, max_points)
+
+        with self.db.get_connection() as conn:
+            if resolution == RAW:
+                rows = conn.execute("""
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER) AS bucket,
+                           price AS open, price AS high, price AS low, price AS close,
+                           volume_24h AS volume, 1 AS samples
+                    FROM price_data
+                    WHERE coin_id = ? AND timestamp >= ? AND timestamp < ?
+                    ORDER BY timestamp, id
+                """, (coin_id, epoch_to_sqlite(start_epoch), epoch_to_sqlite(end_epoch))).fetchall()
+                return RAW, [dict(row) for row in rows]
+
+            watermark = self._watermarks().get(resolution, 0)
+            rollup_end = min(end_epoch, watermark)
+            rows = conn.execute("""
+                SELECT bucket, open, high, low, close, volume, samples
+                FROM price_rollups
+                WHERE coin_id = ? AND resolution = ? AND bucket >= ? AND bucket < ?
+                ORDER BY bucket
+            """, (coin_id, resolution, start_epoch // resolution * resolution, rollup_end)).fetchall()
+            result = [dict(row) for row in rows]
+
+            if end_epoch > watermark:
+                tail_start = max(start_epoch, watermark)
+                tail = conn.execute(f"""
+                    SELECT bucket, open, high, low, close, volume, samples
+                    FROM ({_AGGREGATE_SQL.format(src=_RAW_SRC.format(coin_filter="AND coin_id = :coin_id"))})
+                    ORDER BY bucket
+                """, {"res": resolution, "coin_id": coin_id,
+                      "start_text": epoch_to_sqlite(tail_start),
+                      "end_text": epoch_to_sqlite(end_epoch)}).fetchall()
+                result.extend(dict(row) for row in tail)
+        return resolution, result
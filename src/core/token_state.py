@@ -0,0 +1,156 @@
+import json
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .config import settings
+from .database import DatabaseManager
+from ..models.analysis_result import MemecoinPotential, NarrativeIndicators
+
+
+@dataclass
+class TokenSnapshot:
+    price: float
+    liquidity: float
+    volume_24h: float
+    analyzed_at: float
+    opportunity: Optional[MemecoinPotential]
+
+
+def token_metrics(token: Dict) -> Tuple[float, float, float]:
+    """(price, liquidity, 24h volume) from a tokenlist entry"""
+    def number(*keys) -> float:
+        for key in keys:
+            value = token.get(key)
+            if value is not None:
+                try:
+                    return float(value)
+                except (TypeError, ValueError):
+                    pass
+        return 0.0
+    return number('price'), number('liquidity'), number('v24hUSD', 'volume_24h', 'volume24h')
+
+
+def relative_change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float('inf')
+    return abs(new - old) / abs(old)
+
+
+class TokenStateIndex:
+    """Seen-token index for incremental discovery.
+
+    Keeps the market snapshot each token had when it was last fully analyzed.
+    A token is only sent back through overview, security and sentiment lookups
+    when it is new, its price, liquidity or volume moved past the configured
+    deltas, or its snapshot is older than TOKEN_REANALYZE_AFTER. Otherwise its
+    previous opportunity is reused with the score decayed by age.
+    """
+
+    def __init__(self, db: Optional[DatabaseManager] = None,
+                 price_delta: float = settings.TOKEN_PRICE_DELTA,
+                 volume_delta: float = settings.TOKEN_VOLUME_DELTA,
+                 liquidity_delta: float = settings.TOKEN_LIQUIDITY_DELTA,
+                 score_half_life: float = settings.TOKEN_SCORE_HALF_LIFE,
+                 reanalyze_after: float = settings.TOKEN_REANALYZE_AFTER):
+        self.db = db
+        self.price_delta = price_delta
+        self.volume_delta = volume_delta
+        self.liquidity_delta = liquidity_delta
+        self.score_half_life = score_half_life
+        self.reanalyze_after = reanalyze_after
+        self._snapshots: Dict[Tuple[str, str], TokenSnapshot] = {}
+        self.analyzed = 0
+        self.reused = 0
+
+    def load(self) -> int:
+        """Restore snapshots recent enough to still be reused"""
+        if self.db is None:
+            return 0
+        rows = self.db.load_token_snapshots(since=time.time() - self.reanalyze_after)
+        for row in rows:
+            opportunity = opportunity_from_json(row['opportunity']) if row['opportunity'] else None
+            self._snapshots[(row['chain'], row['address'])] = TokenSnapshot(
+                row['price'] or 0.0, row['liquidity'] or 0.0, row['volume_24h'] or 0.0,
+                row['analyzed_at'], opportunity
+            )
+        return len(rows)
+
+    def needs_analysis(self, token: Dict, chain: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        snapshot = self._snapshots.get((chain, token.get('address', '')))
+        if snapshot is None or now - snapshot.analyzed_at >= self.reanalyze_after:
+            return True
+        price, liquidity, volume_24h = token_metrics(token)
+        return (
+            relative_change(snapshot.price, price) > self.price_delta or
+            relative_change(snapshot.liquidity, liquidity) > self.liquidity_delta or
+            relative_change(snapshot.volume_24h, volume_24h) > self.volume_delta
+        )
+
+    def reuse(self, token: Dict, chain: str, now: Optional[float] = None) -> Optional[MemecoinPotential]:
+        """Previous opportunity with fresh market numbers and its score decayed by age"""
+        now = time.time() if now is None else now
+        snapshot = self._snapshots.get((chain, token.get('address', '')))
+        self.reused += 1
+        if snapshot is None or snapshot.opportunity is None:
+            return None
+
+        price, liquidity, volume_24h = token_metrics(token)
+        decay = 0.5 ** ((now - snapshot.analyzed_at) / self.score_half_life)
+        previous = snapshot.opportunity
+        return replace(
+            previous,
+            price=price or previous.price,
+            liquidity=liquidity or previous.liquidity,
+            volume_24h=volume_24h or previous.volume_24h,
+            overall_score=previous.overall_score * decay,
+            timestamp=datetime.now(),
+        )
+
+    def opportunities(self) -> Iterator[Tuple[MemecoinPotential, float]]:
+        """(opportunity, analyzed_at) for every snapshot that produced one"""
+        for snapshot in self._snapshots.values():
+            if snapshot.opportunity is not None:
+                yield snapshot.opportunity, snapshot.analyzed_at
+
+    def record(self, token: Dict, chain: str, opportunity: Optional[MemecoinPotential],
+               now: Optional[float] = None) -> Dict[str, Any]:
+        """Remember a fresh analysis; returns the token_snapshots row to persist"""
+        now = time.time() if now is None else now
+        price, liquidity, volume_24h = token_metrics(token)
+        address = token.get('address', '')
+        self._snapshots[(chain, address)] = TokenSnapshot(price, liquidity, volume_24h, now, opportunity)
+        self.analyzed += 1
+        return {
+            'address': address,
+            'chain': chain,
+            'price': price,
+            'liquidity': liquidity,
+            'volume_24h': volume_24h,
+            'overall_score': opportunity.overall_score if opportunity else None,
+            'opportunity': asdict(opportunity) if opportunity else None,
+            'analyzed_at': now,
+        }
+
+    def reset_stats(self):
+        """Start the analyzed/reused counters over, e.g. for a new hunt session"""
+        self.analyzed = 0
+        self.reused = 0
+
+    def stats(self) -> Dict[str, float]:
+        seen = self.analyzed + self.reused
+        return {
+            "tracked": len(self._snapshots),
+            "analyzed": self.analyzed,
+            "reused": self.reused,
+            "reuse_ratio": self.reused / seen if seen else 0.0,
+        }
+
+
+def opportunity_from_json(raw: str) -> MemecoinPotential:
+    data = json.loads(raw)
+    data['narrative_indicators'] = NarrativeIndicators(**data['narrative_indicators'])
+    data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+    return MemecoinPotential(**data)
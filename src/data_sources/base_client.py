@@ -2,41 +2,47 @@ from abc import ABC, abstractmethod
 import asyncio 
 import aiohttp
 from typing import Dict, Any, Optional
-import time 
+from ..core.config import settings
+from ..utils.rate_limiter import rate_limiters, endpoint_path, retry_after_delay
+from .transport import Transport, transport_from_settings
+from ..utils.metrics import observe_request
 
 class BaseAPIClient(ABC):
     
-    def __init__(self, base_url: str, rate_limit_per_minute: int = 60):
+    def __init__(self, base_url: str, rate_limit_per_minute: int = settings.RATE_LIMIT_PER_MINUTE,
+                 provider: Optional[str] = None, transport: Optional[Transport] = None):
         self.base_url = base_url
         self.rate_limit = rate_limit_per_minute
-        self.last_request_time = 0
+        self.provider = provider or type(self).__name__.lower()
         self.session: Optional[aiohttp.ClientSession] = None
+        self.transport = transport if transport is not None else transport_from_settings(self.provider)
         
     async def get_session(self) -> aiohttp.ClientSession:
         if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession()
         return self.session
     
-    async def rate_limit_wait(self):
-        elapsed = time.time() - self.last_request_time
-        min_interval = 60 / self.rate_limit
-        if elapsed < min_interval:
-            await asyncio.sleep(min_interval - elapsed)
-        self.last_request_time = time.time()
+    async def rate_limit_wait(self, endpoint: Optional[str] = None):
+        await rate_limiters.acquire(self.provider, endpoint, default_rate=self.rate_limit)
         
     async def make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        await self.rate_limit_wait()
-        
+        path = endpoint_path(endpoint)
         try:
-            session = await self.get_session()
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             
-            async with session.get(url, params=params) as response:
-                if response.status != 200:
+            for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+                await self.rate_limit_wait(path)
+                response = await observe_request(self.provider, path, self.transport.request(
+                    "GET", url, self.get_session, params=params
+                ))
+                if response.status == 200:
                     return await response.json()
-                else:
-                    raise Exception(f"API Error {response.status}: {await response.text()}")
-                return None
+                if response.status == 429:
+                    delay = retry_after_delay(response.headers.get("Retry-After"), attempt)
+                    rate_limiters.penalize(self.provider, path, delay)
+                    continue
+                raise Exception(f"API Error {response.status}: {await response.text()}")
+            raise Exception(f"API Error 429: still rate limited on {path} after {attempt + 1} attempts")
             
         except Exception as e:
             print(f"Request failed: {e}")
@@ -48,5 +54,6 @@ class BaseAPIClient(ABC):
         pass
     
     async def cleanup(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
\ No newline at end of file
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.transport.close()
\ No newline at end of file
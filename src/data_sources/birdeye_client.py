@@ -1,17 +1,26 @@
 import asyncio
 import aiohttp 
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from rich.console import Console 
+from ..core.config import settings
+from ..utils.rate_limiter import rate_limiters, endpoint_path, retry_after_delay
+from ..utils.cache import ResponseCache
+from ..utils.singleflight import SingleFlight
+from .transport import Transport, transport_from_settings
+from ..utils.metrics import HUNT_STAGE_SECONDS, observe_request
 
 console = Console()
 
 class BirdeyeClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None, transport: Optional[Transport] = None):
         self.api_key = api_key
         self.base_url = "https://public-api.birdeye.so"
         self.headers = {"X-API-KEY": self.api_key, "Content-Type": "application/json"}
         self.session: Optional[aiohttp.ClientSession] = None
+        self.cache = cache if cache is not None else ResponseCache.from_settings()
+        self.inflight = SingleFlight()
+        self.transport = transport if transport is not None else transport_from_settings("birdeye")
 
         self.chains = {
             "solana": "solana",
@@ -25,6 +34,8 @@ class BirdeyeClient:
         if self.session and not self.session.closed:
             await self.session.close()
             self.session = None
+        self.cache.close()
+        self.transport.close()
 
     async def get_session(self):
         if self.session is None or self.session.closed:
@@ -32,16 +43,44 @@ class BirdeyeClient:
         return self.session
     
     async def make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        cached = await self.cache.get(endpoint, params)
+        if cached is not None:
+            return cached
+        
+        # Identical requests already on the wire share that response instead of firing again
+        key = ResponseCache.make_key(endpoint, params)
+        return await self.inflight.do(key, lambda: self._fetch_and_cache(endpoint, params))
+    
+    async def _fetch_and_cache(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        response = await self._fetch(endpoint, params)
+        if response is not None:
+            await self.cache.set(endpoint, params, response)
+        return response
+    
+    def cache_stats(self) -> Dict:
+        return self.cache.stats()
+    
+    async def _fetch(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
+        path = endpoint_path(endpoint)
         try:
-            session = await self.get_session()
-            url = f"{self.base_url}/{endpoint}"
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
             
-            async with session.get(url, headers=self.headers, params=params) as response:
+            for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+                await rate_limiters.acquire("birdeye", path)
+                response = await observe_request("birdeye", path, self.transport.request(
+                    "GET", url, self.get_session, params=params, headers=self.headers
+                ))
                 if response.status == 200:
                     return await response.json()
+                elif response.status == 429:
+                    delay = retry_after_delay(response.headers.get("Retry-After"), attempt)
+                    rate_limiters.penalize("birdeye", path, delay)
+                    console.print(f"[yellow]Birdeye rate limited on {path}, backing off {delay:.1f}s[/yellow]")
                 else:
                     console.print(f"[red]Birdeye API Error {response.status}: {await response.text()}[/red]")
                     return None
+            console.print(f"[red]Birdeye API Error 429: gave up on {path} after {attempt + 1} attempts[/red]")
+            return None
         except Exception as e:
             console.print(f"[red]Request Failed: {e}[/red]")
             return None
@@ -49,24 +88,58 @@ class BirdeyeClient:
     async def discover_new_tokens(self, chain: str = "solana") -> List[Dict]:
         console.print(f"[yellow]🔍 Scanning {chain.upper()} for new memecoins...[/yellow]")
         
+        new_tokens = []
+        for token in await self._fetch_token_page(chain, offset=0, limit=50):
+            if self.meets_criteria(token):
+                new_tokens.append(token)
+
+        console.print(f"[green]✅ Found {len(new_tokens)} potential new tokens on {chain.upper()}[/green]")
+        return new_tokens
+    
+    async def stream_new_tokens(self,
+                                chain: str = "solana",
+                                page_size: int = settings.DISCOVERY_PAGE_SIZE,
+                                max_tokens: int = settings.DISCOVERY_MAX_TOKENS) -> AsyncIterator[Dict]:
+        """Page through the token list, yielding qualifying tokens while the next page is prefetched"""
+        console.print(f"[yellow]🔍 Streaming {chain.upper()} token list for new memecoins...[/yellow]")
+        
+        offset = 0
+        found = 0
+        next_page = asyncio.ensure_future(self._fetch_token_page(chain, offset, min(page_size, max_tokens)))
+        try:
+            while next_page is not None:
+                tokens = await next_page
+                requested = min(page_size, max_tokens - offset)
+                offset += len(tokens)
+                next_page = None
+                if len(tokens) == requested and offset < max_tokens:
+                    next_page = asyncio.ensure_future(
+                        self._fetch_token_page(chain, offset, min(page_size, max_tokens - offset))
+                    )
+                
+                for token in tokens:
+                    if self.meets_criteria(token):
+                        found += 1
+                        yield token
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+        
+        console.print(f"[green]✅ Streamed {found} potential new tokens from {offset} on {chain.upper()}[/green]")
+    
+    async def _fetch_token_page(self, chain: str, offset: int, limit: int) -> List[Dict]:
         params = {
             "sort_by": "v24hUSD",
             "sort_type": "desc",
-            "offset": 0,
-            "limit": 50
+            "offset": offset,
+            "limit": limit
         }
         
-        response = await self.make_request(f"/defi/tokenlist?chain={chain}", params)
+        with HUNT_STAGE_SECONDS.time(stage="discovery"):
+            response = await self.make_request(f"/defi/tokenlist?chain={chain}", params)
         if not response or 'data' not in response:
             return []
-        
-        new_tokens = []
-        for token in response['data']['tokens']:
-            if self.meets_criteria(token):
-                new_tokens.append(token)
-
-        console.print(f"[green]✅ Found {len(new_tokens)} potential new tokens on {chain.upper()}[/green]")
-        return new_tokens
+        return response['data'].get('tokens') or []
     
     def meets_criteria(self, token: Dict) -> bool:
         """Check if token meets our memecoin criteria"""
@@ -94,4 +167,31 @@ class BirdeyeClient:
     
     async def get_detailed_token_info(self, token_address: str, chain: str) -> Dict:
         params = {"address": token_address}
-        return await self.make_request(f"/defi/token_overview?chain={chain}", params)
\ No newline at end of file
+        return await self.make_request(f"/defi/token_overview?chain={chain}", params)
+    
+    async def get_multi_price(self, token_addresses: List[str], chain: str) -> Dict[str, Dict]:
+        """Prices for many tokens, BIRDEYE_MULTI_PRICE_BATCH addresses per request, keyed by address"""
+        return await self._batched_lookup(
+            f"/defi/multi_price?chain={chain}", token_addresses, settings.BIRDEYE_MULTI_PRICE_BATCH
+        )
+    
+    async def get_multi_market_data(self, token_addresses: List[str], chain: str) -> Dict[str, Dict]:
+        """Price, liquidity and market cap for many tokens, BIRDEYE_MULTI_MARKET_DATA_BATCH per request"""
+        return await self._batched_lookup(
+            f"/defi/v3/token/market-data/multiple?chain={chain}", token_addresses,
+            settings.BIRDEYE_MULTI_MARKET_DATA_BATCH
+        )
+    
+    async def _batched_lookup(self, endpoint: str, token_addresses: List[str], batch_size: int) -> Dict[str, Dict]:
+        addresses = list(dict.fromkeys(token_addresses))
+        chunks = [addresses[i:i + batch_size] for i in range(0, len(addresses), batch_size)]
+        responses = await asyncio.gather(*(
+            self.make_request(endpoint, {"list_address": ",".join(chunk)}) for chunk in chunks
+        ))
+        
+        # A failed chunk only loses its own addresses
+        merged = {}
+        for response in responses:
+            if response and isinstance(response.get('data'), dict):
+                merged.update({address: data for address, data in response['data'].items() if data})
+        return merged
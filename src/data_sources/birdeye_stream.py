@@ -0,0 +1,197 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+import websockets
+from rich.console import Console
+
+from ..core.config import settings
+
+console = Console()
+
+
+@dataclass
+class MarketUpdate:
+    """One price candle (kind 'price') or trade (kind 'txs') from the Birdeye socket"""
+    kind: str
+    chain: str
+    address: str
+    price: float
+    volume: float
+    unix_time: int
+    received_at: float = field(default_factory=time.time)
+    raw: Dict = field(default_factory=dict)
+
+
+class BirdeyeStream:
+    """Birdeye WebSocket price/transaction feed for one chain's watchlist.
+
+    Every watched address gets a SUBSCRIBE_PRICE (and optionally SUBSCRIBE_TXS)
+    subscription. After a dropped connection the stream reconnects with
+    exponential backoff capped at WEBSOCKET_RECONNECT_INTERVAL and resubscribes
+    the whole watchlist. Updates fan out to every consumer queue from subscribe();
+    the queues are bounded and drop their oldest update when a consumer falls
+    behind, so a slow consumer never stalls the socket.
+    """
+
+    def __init__(self, api_key: str, chain: str = "solana",
+                 url: str = settings.BIRDEYE_WS_URL,
+                 chart_type: str = settings.WEBSOCKET_CHART_TYPE,
+                 include_txs: bool = True,
+                 reconnect_interval: float = settings.WEBSOCKET_RECONNECT_INTERVAL,
+                 reconnect_min_delay: float = 1.0):
+        self.api_key = api_key
+        self.chain = chain
+        self.url = url
+        self.chart_type = chart_type
+        self.include_txs = include_txs
+        self.reconnect_interval = reconnect_interval
+        self.reconnect_min_delay = reconnect_min_delay
+
+        self.watchlist: Set[str] = set()
+        self.latest: Dict[str, MarketUpdate] = {}
+        self._consumers: List[asyncio.Queue] = []
+        self._connection = None
+        self._task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+
+        self.messages = 0
+        self.dropped = 0
+        self.connects = 0
+
+    def subscribe(self, maxsize: int = settings.WEBSOCKET_QUEUE_SIZE) -> asyncio.Queue:
+        """A new consumer queue that receives every MarketUpdate from now on"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._consumers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._consumers:
+            self._consumers.remove(queue)
+
+    async def watch(self, addresses: Iterable[str]):
+        new = [address for address in addresses if address not in self.watchlist]
+        self.watchlist.update(new)
+        await self._send_subscriptions(new, subscribe=True)
+
+    async def unwatch(self, addresses: Iterable[str]):
+        gone = [address for address in addresses if address in self.watchlist]
+        self.watchlist.difference_update(gone)
+        for address in gone:
+            self.latest.pop(address, None)
+        await self._send_subscriptions(gone, subscribe=False)
+
+    async def set_watchlist(self, addresses: Iterable[str]):
+        wanted = set(addresses)
+        await self.unwatch(self.watchlist - wanted)
+        await self.watch(wanted)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        delay = self.reconnect_min_delay
+        while True:
+            try:
+                async with websockets.connect(
+                    f"{self.url}/{self.chain}?x-api-key={self.api_key}",
+                    origin="ws://public-api.birdeye.so",
+                    subprotocols=["echo-protocol"],
+                ) as connection:
+                    self._connection = connection
+                    self.connects += 1
+                    delay = self.reconnect_min_delay
+                    await self._send_subscriptions(self.watchlist, subscribe=True)
+                    self.connected.set()
+                    async for message in connection:
+                        self._handle(message)
+            except asyncio.CancelledError:
+                raise
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                console.print(f"[yellow]Birdeye {self.chain} stream dropped ({e}), reconnecting in {delay:.0f}s[/yellow]")
+            finally:
+                self._connection = None
+                self.connected.clear()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_interval)
+
+    async def _send_subscriptions(self, addresses: Iterable[str], subscribe: bool):
+        connection = self._connection
+        if connection is None:
+            # Sent on the next (re)connect instead
+            return
+        action = "SUBSCRIBE" if subscribe else "UNSUBSCRIBE"
+        try:
+            for address in list(addresses):
+                await connection.send(json.dumps({
+                    "type": f"{action}_PRICE",
+                    "data": {"queryType": "simple", "chartType": self.chart_type,
+                             "address": address, "currency": "usd"},
+                }))
+                if self.include_txs:
+                    await connection.send(json.dumps({
+                        "type": f"{action}_TXS",
+                        "data": {"queryType": "simple", "address": address},
+                    }))
+        except websockets.exceptions.ConnectionClosed:
+            # run() notices the closed socket and resubscribes after reconnecting
+            pass
+
+    def _handle(self, message):
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            return
+        update = parse_update(payload, self.chain)
+        if update is None or update.address not in self.watchlist:
+            return
+
+        self.messages += 1
+        self.latest[update.address] = update
+        for queue in self._consumers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(update)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "watched": len(self.watchlist),
+            "messages": self.messages,
+            "dropped": self.dropped,
+            "connects": self.connects,
+        }
+
+
+def parse_update(payload: Dict, chain: str) -> Optional[MarketUpdate]:
+    """MarketUpdate from a PRICE_DATA or TXS_DATA message, None for anything else"""
+    data = payload.get("data") or {}
+    try:
+        if payload.get("type") == "PRICE_DATA":
+            return MarketUpdate(
+                kind="price", chain=chain, address=data["address"],
+                price=float(data["c"]), volume=float(data.get("v") or 0.0),
+                unix_time=int(data.get("unixTime") or time.time()), raw=data,
+            )
+        if payload.get("type") == "TXS_DATA":
+            return MarketUpdate(
+                kind="txs", chain=chain, address=data.get("address") or data["tokenAddress"],
+                price=float(data.get("tokenPrice") or 0.0), volume=float(data.get("volumeUSD") or 0.0),
+                unix_time=int(data.get("blockUnixTime") or time.time()), raw=data,
+            )
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None
@@ -0,0 +1,233 @@
+import asyncio
+import gzip
+import json
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from ..core.config import settings
+
+SessionFactory = Callable[[], Awaitable[aiohttp.ClientSession]]
+
+# Response headers worth keeping in a cassette; the rest is noise
+RECORDED_HEADERS = ("Content-Type", "Retry-After", "x-rate-limit-reset", "x-rate-limit-remaining")
+
+
+class TransportResponse:
+    """A fully read HTTP response, the same shape whichever transport produced it"""
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes, elapsed_ms: float = 0.0):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.elapsed_ms = elapsed_ms
+
+    async def json(self):
+        return json.loads(self.body)
+
+    async def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+def request_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+    """'GET /defi/token_overview?address=...&chain=solana': host-independent, params sorted"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query) + [(k, str(v)) for k, v in (params or {}).items()]
+    return f"{method.upper()} {parts.path}?{urlencode(sorted(query))}"
+
+
+class Transport(ABC):
+    @abstractmethod
+    async def request(self, method: str, url: str, session_factory: SessionFactory,
+                      params: Optional[Dict] = None, headers: Optional[Dict] = None) -> TransportResponse:
+        """Send one request and return the fully read response"""
+
+    def close(self):
+        pass
+
+
+class LiveTransport(Transport):
+    """Real HTTP through the client's aiohttp session"""
+
+    async def request(self, method, url, session_factory, params=None, headers=None) -> TransportResponse:
+        session = await session_factory()
+        started = time.perf_counter()
+        async with session.request(method, url, params=params, headers=headers) as response:
+            body = await response.read()
+            return TransportResponse(
+                response.status,
+                response.headers.copy(), # every header, still case-insensitive
+                body,
+                (time.perf_counter() - started) * 1000.0,
+            )
+
+
+class Cassette:
+    """Recorded responses, stored as gzipped JSON lines keyed by request_key.
+
+    JSON bodies are stored parsed rather than as escaped strings, which keeps the
+    file compact and readable with zcat. A key recorded several times replays its
+    responses in order and then cycles.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, List[Dict]] = {}
+        self._cursor: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        cassette = cls(path)
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        cassette.entries.setdefault(entry["key"], []).append(entry)
+        return cassette
+
+    def add(self, key: str, response: TransportResponse):
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        entry = {"key": key, "status": response.status, "headers": headers,
+                 "elapsed_ms": round(response.elapsed_ms, 3)}
+        try:
+            entry["json"] = json.loads(response.body)
+        except ValueError:
+            entry["text"] = response.body.decode("utf-8", errors="replace")
+        self.entries.setdefault(key, []).append(entry)
+
+    def next(self, key: str) -> Optional[TransportResponse]:
+        entries = self.entries.get(key)
+        if not entries:
+            return None
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        entry = entries[index % len(entries)]
+        body = json.dumps(entry["json"]) if "json" in entry else entry.get("text", "")
+        return TransportResponse(entry["status"], CIMultiDict(entry.get("headers") or {}),
+                                 body.encode("utf-8"), entry.get("elapsed_ms", 0.0))
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for entries in self.entries.values():
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+class RecordingTransport(LiveTransport):
+    """Live requests, with every response also captured to a cassette written on close()"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    async def request(self, method, url, session_factory, params=None, headers=None) -> TransportResponse:
+        response = await super().request(method, url, session_factory, params, headers)
+        self.cassette.add(request_key(method, url, params), response)
+        return response
+
+    def close(self):
+        self.cassette.save()
+
+
+def latency_sampler(spec: str) -> Callable[[random.Random, float], float]:
+    """Seconds of injected latency from a spec string.
+
+    'recorded' replays each response's recorded latency, 'fixed:MS', 'uniform:LOW_MS,HIGH_MS'
+    and 'lognormal:MEDIAN_MS,SIGMA' draw from that distribution, and '' or '0' adds none.
+    """
+    kind, _, args = (spec or "0").partition(":")
+    values = [float(value) for value in args.split(",") if value]
+    if kind in ("", "0", "none"):
+        return lambda rng, recorded_ms: 0.0
+    if kind == "recorded":
+        scale = values[0] if values else 1.0
+        return lambda rng, recorded_ms: recorded_ms * scale / 1000.0
+    if kind == "fixed":
+        return lambda rng, recorded_ms: values[0] / 1000.0
+    if kind == "uniform":
+        return lambda rng, recorded_ms: rng.uniform(values[0], values[1]) / 1000.0
+    if kind == "lognormal":
+        median_ms, sigma = values
+        return lambda rng, recorded_ms: rng.lognormvariate(0.0, sigma) * median_ms / 1000.0
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+
+class ReplayTransport(Transport):
+    """Serves responses from a cassette, with optional latency, 429 and timeout injection.
+
+    Faults are drawn from a seeded RNG, so a given seed reproduces the same sequence
+    of slow, throttled and timed-out requests on every run. Requests missing from
+    the cassette get a 404.
+    """
+
+    def __init__(self, cassette: Cassette,
+                 latency: str = settings.REPLAY_LATENCY,
+                 rate_limit_rate: float = settings.REPLAY_429_RATE,
+                 timeout_rate: float = settings.REPLAY_TIMEOUT_RATE,
+                 timeout_seconds: float = settings.REPLAY_TIMEOUT_SECONDS,
+                 retry_after: float = settings.REPLAY_RETRY_AFTER,
+                 seed: Optional[int] = settings.REPLAY_SEED):
+        self.cassette = cassette
+        self.sample_latency = latency_sampler(latency)
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+
+        self.served = 0
+        self.misses = 0
+        self.injected_429s = 0
+        self.injected_timeouts = 0
+
+    async def request(self, method, url, session_factory, params=None, headers=None) -> TransportResponse:
+        roll = self.rng.random()
+        if roll < self.timeout_rate:
+            self.injected_timeouts += 1
+            await asyncio.sleep(self.timeout_seconds)
+            raise asyncio.TimeoutError(f"Injected timeout for {url}")
+
+        response = self.cassette.next(request_key(method, url, params))
+        delay = self.sample_latency(self.rng, response.elapsed_ms if response else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if roll < self.timeout_rate + self.rate_limit_rate:
+            self.injected_429s += 1
+            return TransportResponse(429, CIMultiDict({"Retry-After": str(self.retry_after)}),
+                                     b'{"message":"Too many requests"}')
+        if response is None:
+            self.misses += 1
+            return TransportResponse(404, CIMultiDict(), b'{"message":"Not in cassette"}')
+        self.served += 1
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "served": self.served,
+            "misses": self.misses,
+            "injected_429s": self.injected_429s,
+            "injected_timeouts": self.injected_timeouts,
+        }
+
+
+def transport_from_settings(provider: str) -> Transport:
+    """Transport for TRANSPORT_MODE: live, record (to <TRANSPORT_CASSETTE_DIR>/<provider>.jsonl.gz) or replay"""
+    mode = settings.TRANSPORT_MODE
+    if mode == "live":
+        return LiveTransport()
+    path = os.path.join(settings.TRANSPORT_CASSETTE_DIR, f"{provider}.jsonl.gz")
+    if mode == "record":
+        return RecordingTransport(Cassette.load(path))
+    if mode == "replay":
+        return ReplayTransport(Cassette.load(path))
+    raise ValueError(f"Unknown TRANSPORT_MODE: {mode}")
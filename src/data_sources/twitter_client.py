@@ -1,42 +1,120 @@
-import tweepy 
+import time
+import aiohttp
 from typing import Dict, List, Optional
 from rich.console import Console
+from ..core.config import settings
+from ..utils.rate_limiter import rate_limiters, retry_after_delay
+from .transport import Transport, transport_from_settings
+from ..utils.metrics import observe_request
 
 class TwitterClient:
-    def __init__(self, bearer_token: str):
-        self.client = tweepy.Client(bearer_token=bearer_token, wait_on_rate_limit=True)
+    """Native aiohttp client for the v2 recent-search endpoint.
+
+    Rate-limit waits are asyncio sleeps inside the calling coroutine, so a
+    throttled search never stalls Birdeye calls or the dashboard.
+    """
+    SEARCH_ENDPOINT = "/2/tweets/search/recent"
+
+    def __init__(self, bearer_token: str, base_url: str = settings.TWITTER_API_URL,
+                 transport: Optional[Transport] = None):
+        self.bearer_token = bearer_token
+        self.base_url = base_url
+        self.headers = {"Authorization": f"Bearer {self.bearer_token}"}
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.transport = transport if transport is not None else transport_from_settings("twitter")
         self.console = Console()
-        
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.TWITTER_REQUEST_TIMEOUT)
+            )
+        return self.session
+
+    async def cleanup(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.session = None
+        self.transport.close()
+
+    async def search_recent(self, query: str, max_results: int = 100) -> List[Dict]:
+        """Tweet objects (id, text, created_at, public_metrics) for a query, following next_token pages"""
+        tweets: List[Dict] = []
+        params = {
+            "query": f"{query} -is:retweet lang:en",
+            "tweet.fields": "created_at,public_metrics",
+        }
+
+        while len(tweets) < max_results:
+            # The endpoint accepts 10-100 results per page
+            params["max_results"] = max(10, min(100, max_results - len(tweets)))
+            page = await self._request(params)
+            if not page:
+                break
+            tweets.extend(page.get("data", []))
+
+            next_token = page.get("meta", {}).get("next_token")
+            if not next_token:
+                break
+            params["next_token"] = next_token
+
+        return tweets[:max_results]
+
     async def fetch_recent_tweets(self, query: str, max_results: int = 100) -> List[str]:
-        try: 
-            tweets = tweepy.Paginator(
-                self.client.search_recent_tweets,
-                query= f"{query}-is:retweet lang:en",
-                max_results=max_results,
-                tweet_fields=['created_at','public_metrics']
-            ).flatten(limit=max_results)
-            
-            return [tweet.text for tweet in tweets if tweet.text]
+        try:
+            tweets = await self.search_recent(query, max_results)
+            return [tweet["text"] for tweet in tweets if tweet.get("text")]
         except Exception as e:
             self.console.print(f"[red]Twitter API Error: {e}[/red]")
             return []
-        
+
     async def get_tweet_metrics(self, query:str) -> dict:
         """Get metrics for a tweets about a topic"""
         try:
-            tweets = await self.fetch_recent_tweets(query)
+            tweets = await self.search_recent(query)
             if not tweets:
                 return {"error": "No tweets found"}
 
             # Get metrics for each tweet
             metrics = {}
             for tweet in tweets:
-                metrics[tweet.id] = {
-                    "likes": tweet.public_metrics['like_count'],
-                    "retweets": tweet.public_metrics['retweet_count'],
-                    "replies": tweet.public_metrics['reply_count'],
+                public_metrics = tweet.get("public_metrics", {})
+                metrics[tweet["id"]] = {
+                    "likes": public_metrics.get('like_count', 0),
+                    "retweets": public_metrics.get('retweet_count', 0),
+                    "replies": public_metrics.get('reply_count', 0),
                 }
             return metrics
         except Exception as e:
             self.console.print(f"[red]Twitter API Error: {e}[/red]")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    async def _request(self, params: Dict) -> Optional[Dict]:
+        url = f"{self.base_url}{self.SEARCH_ENDPOINT}"
+
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            await rate_limiters.acquire("twitter", self.SEARCH_ENDPOINT)
+            response = await observe_request("twitter", self.SEARCH_ENDPOINT, self.transport.request(
+                "GET", url, self.get_session, params=params, headers=self.headers
+            ))
+            if response.status == 200:
+                return await response.json()
+            if response.status != 429:
+                raise Exception(f"HTTP {response.status}: {await response.text()}")
+
+            delay = self._rate_limit_delay(response.headers, attempt)
+            rate_limiters.penalize("twitter", self.SEARCH_ENDPOINT, delay)
+            self.console.print(f"[yellow]Twitter rate limited, resuming in {delay:.0f}s[/yellow]")
+
+        raise Exception(f"HTTP 429: still rate limited after {attempt + 1} attempts")
+
+    @staticmethod
+    def _rate_limit_delay(headers, attempt: int) -> float:
+        # Twitter reports the window reset as a unix timestamp
+        reset = headers.get("x-rate-limit-reset")
+        if reset:
+            try:
+                return max(0.0, float(reset) - time.time())
+            except ValueError:
+                pass
+        return retry_after_delay(headers.get("Retry-After"), attempt)
@@ -1,4 +1,8 @@
 import asyncio 
+import time
+from contextlib import aclosing, nullcontext
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -6,10 +10,21 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .data_sources.birdeye_client import BirdeyeClient
 from .data_sources.twitter_client import TwitterClient
+from .data_sources.birdeye_stream import BirdeyeStream
 from .analyzers.sentiment_analyzer import SentimentAnalyzer
-from .analyzers.memecoin_hunter import MemecoinPotentialScorer
+from .analyzers.memecoin_hunter import MemecoinPotentialScorer, ScoringParams
+from .analyzers.sentiment_cache import TweetSentimentCache
+from .analyzers.indicators import IndicatorEngine
+from .models.analysis_result import MemecoinPotential, NarrativeIndicators
 from .output.console_dashboard import ConsoleDashboard
+from .output.live_dashboard import LiveDashboard
 from .core.config import settings  
+from .core.persistence_service import AsyncPersistenceService
+from .core.timeseries import PriceTimeSeries
+from .core.token_state import TokenStateIndex
+from .core.leaderboard import OpportunityLeaderboard
+from .core.scheduler import RefreshScheduler
+from .utils.metrics import HUNT_STAGE_SECONDS, metrics
 
 console = Console()
 
@@ -20,15 +35,46 @@ class MemecoinHunter:
         # Initializing all components 
         self.birdeye = None
         self.twitter_client = TwitterClient(settings.TWITTER_BEARER_TOKEN)
-        self.sentiment_analyzer = SentimentAnalyzer(self.twitter_client)
-        self.potential_scorer = MemecoinPotentialScorer()
+        # Imported here so that importing src.main does not open DATABASE_PATH
+        from .core.database import db
+        self.db = db
+        self.persistence = AsyncPersistenceService(db)
+        self.timeseries = PriceTimeSeries(db)
+        self.token_state = TokenStateIndex(db)
+        self.token_state.load()
+        # Ranked across hunts; seeded with the scores of the last few hours
+        self.leaderboard = OpportunityLeaderboard()
+        for opportunity, analyzed_at in self.token_state.opportunities():
+            self.leaderboard.upsert(opportunity, scored_at=analyzed_at)
+        self.sentiment_cache = TweetSentimentCache(store=db if settings.SENTIMENT_CACHE_PERSISTENT else None)
+        self.sentiment_cache.load()
+        self.sentiment_analyzer = SentimentAnalyzer(self.twitter_client, self.sentiment_cache)
+        self.potential_scorer = MemecoinPotentialScorer(ScoringParams(**settings.SCORING_PARAMS))
         self.dashboard = ConsoleDashboard()
+        self.live_dashboard: Optional[LiveDashboard] = None
         
         self.target_chains = ["solana", "base"]
         self.opportunities = []
+        self.request_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+        # Sentiment waits out Twitter's rate-limit windows, so it gets its own cap instead of Birdeye's slots
+        self.sentiment_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_REQUESTS)
+        self.chain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.chain_timings: Dict[str, float] = {}
+        self.streams: Dict[str, BirdeyeStream] = {}
+        self.stream_consumers: List[asyncio.Task] = []
+        self.indicators = IndicatorEngine()
+        
+    @property
+    def qualify_score(self) -> float:
+        """overall_score an opportunity needs to be reported; tunable through SCORING_PARAMS"""
+        return self.potential_scorer.params.qualify_score
         
     async def initialize_systems(self):
         self.birdeye = BirdeyeClient(settings.BIRDEYE_API_KEY)
+        self._register_gauges()
+        metrics_url = await metrics.start_server()
+        if metrics_url:
+            self.console.print(f"[dim]Prometheus metrics at {metrics_url}[/dim]")
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -50,6 +96,20 @@ class MemecoinHunter:
             await asyncio.sleep(0.5)
             progress.update(init_task, advance=1, description="All systems online! ✅")
             
+    def _register_gauges(self):
+        metrics.gauge("birdeye_cache_hit_ratio", "Birdeye response cache hit ratio",
+                      lambda: self.birdeye.cache_stats()['hit_ratio'])
+        metrics.gauge("birdeye_inflight_shared_total", "Birdeye lookups served by an identical in-flight request",
+                      lambda: self.birdeye.inflight.stats()['shared'])
+        metrics.gauge("tweet_sentiment_cache_hit_ratio", "Per-tweet sentiment cache hit ratio",
+                      lambda: self.sentiment_cache.stats()['hit_ratio'])
+        metrics.gauge("token_state_reuse_ratio", "Share of discovered tokens reused without re-analysis",
+                      lambda: self.token_state.stats()['reuse_ratio'])
+        metrics.gauge("db_writer_queue_depth", "Rows waiting for the background database writer",
+                      lambda: self.persistence.metrics()['queue_depth'])
+        metrics.gauge("indicator_tokens", "Tokens with streaming indicator state",
+                      lambda: len(self.indicators))
+        
     async def golden_gem_hunt(self):
         hunt_panel = Panel.fit(
             "🎯 [bold cyan]MEMECOIN HUNTER ACTIVATED[/bold cyan]\n\n" +
@@ -61,59 +121,157 @@ class MemecoinHunter:
         )
         self.console.print(hunt_panel)
         all_opportunities = []
+        self.chain_timings = {}
         
-        for chain in self.target_chains:
-            chain_opportunities = await self._chain_hunt(chain)
-            all_opportunities.extend(chain_opportunities)
+        # Hunt every chain at once and merge each one's results as soon as it finishes
+        if settings.LIVE_DASHBOARD:
+            # Progress is drawn inside the live table instead of running its own display
+            progress = Progress(console=self.console, auto_refresh=False)
+            display = self.live_dashboard = LiveDashboard(self.console, progress, threshold=self.qualify_score)
+        else:
+            display = progress = Progress(console=self.console)
+        with display:
+            chain_hunts = [self._timed_chain_hunt(chain, progress) for chain in self.target_chains]
+            for finished in asyncio.as_completed(chain_hunts):
+                chain, chain_opportunities, elapsed = await finished
+                self.chain_timings[chain] = elapsed
+                all_opportunities.extend(chain_opportunities)
+                for opportunity in chain_opportunities:
+                    await self.persistence.submit_opportunity(opportunity)
+                self.console.print(
+                    f"[green]✅ {chain.upper()} hunt done in {elapsed:.1f}s "
+                    f"({len(chain_opportunities)} opportunities)[/green]"
+                )
         
-        # Display results    
-        all_opportunities.sort(key=lambda x: x.overall_score, reverse=True)
+        self.live_dashboard = None
         
         # results of opportunities that meet criteria 
-        qualified_opportunities = [opp for opp in all_opportunities if opp.overall_score >= 40]
+        qualified_opportunities = [opp for opp in all_opportunities if opp.overall_score >= self.qualify_score]
+        await self._refresh_leaderboard_market_data()
+        # Current top-K across hunts, earlier scores decayed by age
+        self.opportunities = self.leaderboard.top(settings.LEADERBOARD_SIZE, min_score=self.qualify_score)
+        await self._snapshot_leaderboard()
         
-        self.dashboard.display_opportunities(qualified_opportunities[:10])
+        with HUNT_STAGE_SECONDS.time(stage="rendering"):
+            self.dashboard.display_chain_timings(self.chain_timings)
+            if settings.LIVE_DASHBOARD:
+                self.dashboard.display_summary(qualified_opportunities)
+            else:
+                self.dashboard.display_opportunities(self.opportunities)
+            if settings.WEBSOCKET_ENABLED:
+                self.dashboard.display_indicators(self._indicator_rows())
+        if metrics.enabled:
+            self.dashboard.display_metrics(metrics.summary())
+        if settings.WEBSOCKET_ENABLED:
+            await self._update_live_feeds()
         return qualified_opportunities
     
-    async def _chain_hunt(self, chain: str):
+    async def _refresh_leaderboard_market_data(self):
+        """Bring price, liquidity and market cap of the ranked tokens up to date, batched per chain"""
+        async def refresh(chain: str):
+            top = self.leaderboard.top(settings.LEADERBOARD_SIZE, min_score=self.qualify_score, chain=chain)
+            addresses = [opp.token_address for opp in top]
+            if not addresses:
+                return
+            market_data = await self.birdeye.get_multi_market_data(addresses, chain)
+            # multi_price covers tokens the market-data endpoint has nothing for
+            missing = [address for address in addresses if address not in market_data]
+            if missing:
+                for address, data in (await self.birdeye.get_multi_price(missing, chain)).items():
+                    market_data[address] = {'price': data.get('value'), 'liquidity': data.get('liquidity')}
+            self.leaderboard.refresh_market_data(chain, market_data)
+        
+        with HUNT_STAGE_SECONDS.time(stage="market_data"):
+            await asyncio.gather(*(refresh(chain) for chain in self.target_chains), return_exceptions=True)
+    
+    async def _snapshot_leaderboard(self):
+        """Mark the current top-K as the active trading_potential rows"""
+        self.leaderboard.prune()
+        await self.persistence.submit_leaderboard(
+            self.leaderboard.snapshot_rows(settings.LEADERBOARD_SIZE, min_score=self.qualify_score)
+        )
+    
+    async def _update_live_feeds(self):
+        """Keep each chain's top opportunities on the Birdeye socket between hunts"""
+        watched = set()
+        for chain in self.target_chains:
+            stream = self.streams.get(chain)
+            if stream is None:
+                stream = self.streams[chain] = BirdeyeStream(settings.BIRDEYE_API_KEY, chain)
+                self.stream_consumers.append(asyncio.create_task(self._record_live_prices(stream)))
+                stream.start()
+            top = self.leaderboard.top(settings.WEBSOCKET_WATCHLIST_SIZE, min_score=self.qualify_score, chain=chain)
+            watched.update(opp.token_address for opp in top)
+            await stream.set_watchlist([opp.token_address for opp in top])
+        self.indicators.retain(watched)
+    
+    def _indicator_rows(self) -> List[Tuple[MemecoinPotential, Dict[str, float]]]:
+        """Streamed indicators for the current top opportunities that have closed candles on the live feed"""
+        rows = []
+        for opportunity in self.opportunities:
+            values = self.indicators.values(opportunity.token_address)
+            if values is not None:
+                rows.append((opportunity, values))
+        return rows
+    
+    async def _record_live_prices(self, stream: BirdeyeStream):
+        """Feed streamed candles into the streaming indicators, and closed ones into price_data, between hunts"""
+        updates = stream.subscribe()
+        while True:
+            update = await updates.get()
+            if update.kind != "price":
+                continue
+            forming = self.indicators.forming_candle(update.address)
+            if self.indicators.update_candle(update.address, update.unix_time, update.price,
+                                             high=update.raw.get('h'), low=update.raw.get('l'),
+                                             volume=update.volume) is None:
+                continue
+            # Only a closed candle is final: one row per candle, never the ticks of the one still forming
+            bar_time, close = forming[0], forming[1]
+            await self.persistence.submit_price({
+                'coin_id': update.address,
+                'price': close,
+                'timestamp': datetime.fromtimestamp(bar_time, timezone.utc),
+            })
+    
+    async def _timed_chain_hunt(self, chain: str, progress: Progress):
+        started = time.perf_counter()
+        try:
+            chain_opportunities = await self._chain_hunt(chain, progress)
+        except Exception as e:
+            # One broken chain must not cost the others their results
+            self.console.print(f"[red]{chain.upper()} hunt failed: {e}[/red]")
+            chain_opportunities = []
+        return chain, chain_opportunities, time.perf_counter() - started
+    
+    async def _chain_hunt(self, chain: str, progress: Optional[Progress] = None):
         self.console.print(f"\n[yellow]Hunting {chain.upper()} chain...[/yellow]")
         
         try:
+            if settings.STREAMING_DISCOVERY:
+                with nullcontext(progress) if progress else Progress(console=self.console) as progress:
+                    return await self._stream_chain_hunt(chain, progress)
+            
             new_tokens = await self.birdeye.discover_new_tokens(chain)
             if not new_tokens:
                 self.console.print(f"[dim]No new tokens found on {chain}[/dim]")
                 return []
             opportunities  = []
             
-            with Progress(console=self.console) as progress:
+            with nullcontext(progress) if progress else Progress(console=self.console) as progress:
                 task = progress.add_task(f"Analyzing {chain} tokens...", total=len(new_tokens))
                 
-                for token in new_tokens:
-                    try:
-                        # Gather data
-                        token_details = await self.birdeye.get_detailed_token_info(token['address'], chain)
-                        security_data = await self.birdeye.get_token_security(token['address'], chain)
-                        sentiment = await self.sentiment_analyzer.analyze_token_sentiment(
-                            token['symbol'], token.get('name', '')
-                        ) 
-                        
-                        opportunity = self.opportunity_scorer.score_opportunity(
-                            token_details.get('data', token) if token_details else token, 
-                            sentiment,
-                            security_data.get('data', {}) if security_data else {},
-                            chain
-                        )
-                        
-                        if opportunity.overall_score >= 40:
+                if settings.CONCURRENT_ENRICHMENT:
+                    results = await asyncio.gather(*(
+                        self._enrich_token(token, chain, progress, task) for token in new_tokens
+                    ))
+                    opportunities = [opp for opp in results if opp and opp.overall_score >= self.qualify_score]
+                else:
+                    for token in new_tokens:
+                        opportunity = await self._enrich_token(token, chain, progress, task)
+                        if opportunity and opportunity.overall_score >= self.qualify_score:
                             opportunities.append(opportunity)
-                            
-                        progress.advance(task)
                         await asyncio.sleep(0.5)
-                        
-                    except Exception as e:
-                        self.console.print(f"[red]Error analyzing {token.get('symbol', 'Unknown')}: {e}[/red]")
-                        progress.advance(task)
-                        continue
                     
             return opportunities
         
@@ -121,14 +279,158 @@ class MemecoinHunter:
             self.console.print(f"[red]Error finding prey in {chain}: {e}[/red]")
             return []
     
+    async def _stream_chain_hunt(self, chain: str, progress: Progress):
+        """Start enriching each qualifying token as soon as discovery yields it"""
+        task = progress.add_task(f"Analyzing {chain} tokens...", total=0)
+        opportunities = []
+        pending = set()
+        max_pending = settings.MAX_CONCURRENT_REQUESTS * 2
+        
+        def collect(done):
+            for finished in done:
+                opportunity = finished.result()
+                if opportunity and opportunity.overall_score >= self.qualify_score:
+                    opportunities.append(opportunity)
+        
+        discovered = 0
+        try:
+            # Closed on the way out so an early exit cancels the page being prefetched right away
+            async with aclosing(self.birdeye.stream_new_tokens(chain)) as tokens:
+                async for token in tokens:
+                    discovered += 1
+                    progress.update(task, total=discovered)
+                    pending.add(asyncio.create_task(self._enrich_token(token, chain, progress, task)))
+                    
+                    # Bounded backlog: stop pulling pages until some enrichment finishes
+                    if len(pending) >= max_pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        collect(done)
+            
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                collect(done)
+        finally:
+            for unfinished in pending:
+                unfinished.cancel()
+        
+        if not discovered:
+            self.console.print(f"[dim]No new tokens found on {chain}[/dim]")
+        return opportunities
+    
+    def _chain_quota(self, chain: str) -> asyncio.Semaphore:
+        """Per-chain share of MAX_CONCURRENT_REQUESTS so one busy chain cannot starve the rest"""
+        if chain not in self.chain_semaphores:
+            quota = settings.CHAIN_CONCURRENCY_QUOTAS.get(
+                chain, max(1, settings.MAX_CONCURRENT_REQUESTS // max(1, len(self.target_chains)))
+            )
+            self.chain_semaphores[chain] = asyncio.Semaphore(quota)
+        return self.chain_semaphores[chain]
+    
+    async def _limited(self, coro, chain: str):
+        """Run a single Birdeye lookup under its chain quota and the shared MAX_CONCURRENT_REQUESTS cap"""
+        async with self._chain_quota(chain), self.request_semaphore:
+            return await coro
+    
+    async def _sentiment(self, token: Dict) -> NarrativeIndicators:
+        async with self.sentiment_semaphore:
+            return await self.sentiment_analyzer.analyze_token_sentiment(token['symbol'], token.get('name', ''))
+    
+    @staticmethod
+    async def _timed(stage: str, coro):
+        with HUNT_STAGE_SECONDS.time(stage=stage):
+            return await coro
+    
+    async def _enrich_token(self, token: Dict, chain: str, progress: Optional[Progress] = None, task=None,
+                            force: bool = False) -> Optional[MemecoinPotential]:
+        """Fetch overview, security and sentiment for one token concurrently and score it"""
+        try:
+            # Unchanged since the last hunt: skip the lookups and reuse the decayed score
+            if not force and settings.INCREMENTAL_DISCOVERY and not self.token_state.needs_analysis(token, chain):
+                return self._scored(self.token_state.reuse(token, chain))
+            
+            # Gather data
+            results = await asyncio.gather(
+                self._limited(self._timed("token_overview", self.birdeye.get_detailed_token_info(token['address'], chain)), chain),
+                self._limited(self._timed("token_security", self.birdeye.get_token_security(token['address'], chain)), chain),
+                self._sentiment(token),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+            token_details, security_data, sentiment = results
+            
+            with HUNT_STAGE_SECONDS.time(stage="scoring"):
+                opportunity = self.potential_scorer.score_potential(
+                    token_details.get('data', token) if token_details else token, 
+                    sentiment,
+                    security_data.get('data', {}) if security_data else {},
+                    chain
+                )
+            await self.persistence.submit_snapshot(self.token_state.record(token, chain, opportunity))
+            return self._scored(opportunity)
+            
+        except Exception as e:
+            self.console.print(f"[red]Error analyzing {token.get('symbol', 'Unknown')}: {e}[/red]")
+            return None
+        finally:
+            if progress:
+                progress.advance(task)
+    
+    def _scored(self, opportunity: Optional[MemecoinPotential]) -> Optional[MemecoinPotential]:
+        if opportunity is not None:
+            self.leaderboard.upsert(opportunity)
+            if self.live_dashboard is not None:
+                self.live_dashboard.upsert(opportunity)
+        return opportunity
+    
     async def cleanup(self):
         if self.birdeye:
             await self.birdeye.cleanup()
+        await self.twitter_client.cleanup()
+        if not await self.persistence.drain():
+            self.console.print("[red]Database writer could not flush every row, they stay queued for a retry[/red]")
+        # Roll up this hunt's prices and trim old raw rows once they are on disk
+        await asyncio.to_thread(self.timeseries.maintain)
+        await asyncio.to_thread(self.db.prune_score_history)
+        
+    async def shutdown(self):
+        for stream in self.streams.values():
+            await stream.stop()
+        for consumer in self.stream_consumers:
+            consumer.cancel()
+        await self.cleanup()
+        await self.persistence.close()
+        await metrics.stop_server()
             
     async def start_hunt_session(self):
         try:
+            self.token_state.reset_stats()
             await self.golden_gem_hunt()
             
+            cache_stats = self.birdeye.cache_stats()
+            self.console.print(
+                f"[dim]Birdeye cache: {cache_stats['hits'] + cache_stats['persistent_hits']} hits / "
+                f"{cache_stats['misses']} misses ({cache_stats['hit_ratio']:.0%} hit ratio)[/dim]"
+            )
+            sentiment_stats = self.sentiment_cache.stats()
+            self.console.print(
+                f"[dim]Tweet sentiment cache: {sentiment_stats['hits']} reused / "
+                f"{sentiment_stats['misses']} scored ({sentiment_stats['hit_ratio']:.0%} hit ratio)[/dim]"
+            )
+            await asyncio.to_thread(self.sentiment_cache.flush)
+            state_stats = self.token_state.stats()
+            self.console.print(
+                f"[dim]Incremental discovery: {state_stats['analyzed']} analyzed / "
+                f"{state_stats['reused']} reused ({state_stats['reuse_ratio']:.0%} skipped)[/dim]"
+            )
+            db_metrics = self.persistence.metrics()
+            self.console.print(
+                f"[dim]DB writer: {db_metrics['rows_written']} rows in {db_metrics['flushes']} flushes, "
+                f"queue {db_metrics['queue_depth']} (max {db_metrics['max_queue_depth']}), "
+                f"avg write {db_metrics['avg_write_seconds'] * 1000:.1f}ms[/dim]"
+            )
+            
             if self.opportunities:
                 self.console.print(f"\n[bold green]🔎 Found {len(self.opportunities)} qualified opportunities![/bold green]")
             else:
@@ -146,6 +448,42 @@ class MemecoinHunter:
             self.console.print(f"\n[dim]Next hunt in {interval_minutes} minutes...[/dim]")
             await asyncio.sleep(interval_minutes * 60)
 
+    async def scheduled_hunt(self):
+        """Continuous hunt: each token is refreshed on its own adaptive deadline"""
+        self.console.print("[cyan]Starting Adaptive Hunt (hot tokens refresh first, dead ones wait)[/cyan]")
+        scheduler = RefreshScheduler(
+            discover=self.birdeye.discover_new_tokens,
+            refresh=lambda token, chain: self._enrich_token(token, chain, force=True),
+            chains=self.target_chains,
+            on_result=self._record_scheduled_result,
+        )
+        await asyncio.gather(scheduler.run(), self._maintenance_loop(scheduler))
+    
+    async def _record_scheduled_result(self, opportunity: MemecoinPotential):
+        if opportunity.overall_score < self.qualify_score:
+            return
+        await self.persistence.submit_opportunity(opportunity)
+        self.console.print(
+            f"[green]🔄 {opportunity.symbol} ({opportunity.chain}) scored {opportunity.overall_score:.0f} "
+            f"- {opportunity.potential_type}[/green]"
+        )
+    
+    async def _maintenance_loop(self, scheduler: RefreshScheduler):
+        while True:
+            await asyncio.sleep(settings.SCHEDULER_DISCOVERY_INTERVAL)
+            await self._refresh_leaderboard_market_data()
+            self.opportunities = self.leaderboard.top(settings.LEADERBOARD_SIZE, min_score=self.qualify_score)
+            await self._snapshot_leaderboard()
+            await self.persistence.drain()
+            await asyncio.to_thread(self.timeseries.maintain)
+            await asyncio.to_thread(self.db.prune_score_history)
+            await asyncio.to_thread(self.sentiment_cache.flush)
+            stats = scheduler.stats()
+            self.console.print(
+                f"[dim]Scheduler: {stats['tracked']} tokens tracked, {stats['refreshes']} refreshes, "
+                f"{stats['in_flight']} in flight[/dim]"
+            )
+
 async def main():
     
     # Welcome Message 
@@ -183,7 +521,10 @@ async def main():
         if hunt_style in ["1", "One shot"]:
             await hunter.start_hunt_session()
         elif hunt_style in ["2", "multi-shot"]:
-            await hunter.hunt_loop(interval_minutes=15)
+            if settings.ADAPTIVE_SCHEDULING:
+                await hunter.scheduled_hunt()
+            else:
+                await hunter.hunt_loop(interval_minutes=15)
         else:
             console.print("[green]Demo mode[/green]")
             
@@ -192,6 +533,7 @@ async def main():
     except Exception as e:
         console.print(f"[red]Unexpected error: {e}[/red]")
     finally:
+        await hunter.shutdown()
         console.print("[dim]Session ended. Happy Hunt Sir! 🎯[/dim]")
     
 if __name__ == "__main__":
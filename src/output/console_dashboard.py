@@ -1,7 +1,8 @@
+import math
 from rich.console import Console
 from rich.table import Table 
 from rich.panel import Panel
-from typing import List
+from typing import Dict, List, Tuple
 from ..models.analysis_result import MemecoinPotential
 from datetime import datetime 
 
@@ -13,6 +14,15 @@ class ConsoleDashboard:
         if not opportunities:
             self.console.print("[yellow] No Opportunities found meeting set criteria's[/yellow]")
         
+        table = self.opportunity_table()
+        for opp in opportunities:
+            table.add_row(*self.opportunity_row(opp))
+            
+        self.console.print(table)
+        self.display_summary(opportunities)
+        
+    @staticmethod
+    def opportunity_table() -> Table:
         table = Table(title="🎯 POTENTIAL MEMECOIN GEMS")
         table.add_column("Symbol", style="cyan", width=8) 
         table.add_column("Chain", style="magenta", width=8) 
@@ -22,26 +32,29 @@ class ConsoleDashboard:
         table.add_column("Sentiment", style="green", width=8) 
         table.add_column("Security", style="red", width=8) 
         table.add_column("Reasoning", style="white", width=40)
+        return table
+    
+    @staticmethod
+    def opportunity_row(opp: MemecoinPotential) -> Tuple[str, ...]:
+        mc_str = f"${opp.market_cap/1000:.0f}K" if opp.market_cap < 1000000 else f"${opp.market_cap/1000000:.1f}M"
+        sentiment_avg = (opp.narrative_indicators.hype_level + opp.narrative_indicators.fomo_intensity) / 2
+        score_color = "green" if opp.overall_score >= 70 else "yellow" if opp.overall_score >= 50 else "red"
+        security_color ="green" if opp.security_score >= 70 else "yellow" if opp.security_score >= 50 else "red"
         
-        for opp in opportunities:
-            mc_str = f"${opp.market_cap/1000:.0f}K" if opp.market_cap < 1000000 else f"${opp.market_cap/1000000:.1f}M"
-            sentiment_avg = (opp.narrative_indicators.hype_level + opp.narrative_indicators.fomo_intensity) / 2
-            score_color = "green" if opp.overall_score >= 70 else "yellow" if opp.overall_score >= 50 else "red"
-            security_color ="green" if opp.security_score >= 70 else "yellow" if opp.security_score >= 50 else "red"
-            
-            table.add_row(
-                f"${opp.symbol}", 
-                opp.chain.upper(),
-                f"$[{score_color}]{opp.overall_score:.0f}[/{score_color}]",
-                opp.potential_type.replace('_', ' ').title(),
-                mc_str,
-                f"{sentiment_avg:.0f}",
-                f"[{security_color}] {opp.security_score:.0f}[/{security_color}]",
-                opp.reasoning[:40] + "..." if len(opp.reasoning) > 40 else opp.reasoning
-            )
-            
-        self.console.print(table)
+        return (
+            f"${opp.symbol}", 
+            opp.chain.upper(),
+            f"$[{score_color}]{opp.overall_score:.0f}[/{score_color}]",
+            opp.potential_type.replace('_', ' ').title(),
+            mc_str,
+            f"{sentiment_avg:.0f}",
+            f"[{security_color}] {opp.security_score:.0f}[/{security_color}]",
+            opp.reasoning[:40] + "..." if len(opp.reasoning) > 40 else opp.reasoning
+        )
         
+    def display_summary(self, opportunities: List[MemecoinPotential]):
+        if not opportunities:
+            return
         avg_score = sum(opp.overall_score for opp in opportunities) / len(opportunities)
         high_confidence = len([opp for opp in opportunities if opp.confidence >= 70])
         
@@ -55,4 +68,71 @@ class ConsoleDashboard:
             border_style="green"
         )
         
-        self.console.print(summary)
\ No newline at end of file
+        self.console.print(summary)
+        
+    def display_chain_timings(self, chain_timings: Dict[str, float]):
+        if not chain_timings:
+            return
+        
+        table = Table(title="⏱️ CHAIN HUNT TIMINGS")
+        table.add_column("Chain", style="magenta", width=10)
+        table.add_column("Duration", style="cyan", width=10)
+        
+        for chain, elapsed in sorted(chain_timings.items(), key=lambda item: item[1], reverse=True):
+            table.add_row(chain.upper(), f"{elapsed:.1f}s")
+            
+        self.console.print(table)
+        
+    def display_indicators(self, rows: List[Tuple[MemecoinPotential, Dict[str, float]]]):
+        """Streamed EMA/RSI/ATR/Bollinger/VWAP values for opportunities on the live price feed"""
+        if not rows:
+            return
+        
+        names = list(rows[0][1])
+        table = Table(title="📉 LIVE INDICATORS")
+        table.add_column("Symbol", style="cyan", width=8)
+        table.add_column("Chain", style="magenta", width=8)
+        for name in names:
+            table.add_column(name.replace('_', ' ').upper(), justify="right", width=10)
+        
+        for opp, values in rows:
+            cells = []
+            for name in names:
+                value = values[name]
+                if math.isnan(value): # NaN while the indicator is still warming up
+                    cells.append("[dim]-[/dim]")
+                elif name == "rsi":
+                    rsi_color = "red" if value >= 70 else "green" if value <= 30 else "white"
+                    cells.append(f"[{rsi_color}]{value:.0f}[/{rsi_color}]")
+                else:
+                    cells.append(f"{value:.4g}")
+            table.add_row(f"${opp.symbol}", opp.chain.upper(), *cells)
+            
+        self.console.print(table)
+        
+    def display_metrics(self, summary: Dict[str, list]):
+        """Where the hunt spent its time, request/error counts per endpoint and cache hit ratios"""
+        if summary["stages"]:
+            table = Table(title="📈 HUNT STAGE TIMINGS")
+            table.add_column("Stage", style="cyan", width=16)
+            table.add_column("Calls", justify="right", width=8)
+            table.add_column("Total", justify="right", style="yellow", width=10)
+            table.add_column("Avg", justify="right", width=10)
+            table.add_column("p95 ≤", justify="right", width=10)
+            for stage in summary["stages"]:
+                table.add_row(
+                    stage["stage"], str(stage["calls"]), f"{stage['total_seconds']:.1f}s",
+                    f"{stage['avg_ms']:.0f}ms", f"{stage['p95_ms']:.0f}ms",
+                )
+            self.console.print(table)
+        
+        lines = [
+            f"{row['provider']} {row['endpoint']}: {row['requests']} requests, "
+            f"[{'red' if row['errors'] else 'green'}]{row['errors']} errors[/]"
+            for row in summary["requests"]
+        ]
+        lines += [
+            f"{gauge['name']}: {gauge['value']:.2f}" for gauge in summary["gauges"] if gauge["value"] is not None
+        ]
+        if lines:
+            self.console.print(Panel.fit("\n".join(lines), title="[bold]Requests & Caches[/bold]", border_style="blue"))
@@ -0,0 +1,128 @@
+import asyncio
+import bisect
+import time
+from typing import Dict, List, Optional, Tuple
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress import Progress
+from rich.text import Text
+
+from .console_dashboard import ConsoleDashboard
+from ..core.config import settings
+from ..models.analysis_result import MemecoinPotential
+
+RowKey = Tuple[str, str] # (chain, token_address)
+
+
+class LiveDashboard:
+    """Opportunity table that fills in while the hunt runs, built on rich.Live.
+
+    Each scored token upserts one row. A row's cells are parsed into Text once,
+    when its displayed values change, and reused on every later render; the
+    rows are kept sorted by score so a render only assembles the top
+    LIVE_DASHBOARD_ROWS cached rows, whatever the table holds. Renders are
+    throttled to one per CONSOLE_UPDATE_INTERVAL seconds: the first change after
+    a quiet spell renders at once, later ones are coalesced into a single
+    trailing render.
+    """
+
+    def __init__(self, console: Console, progress: Optional[Progress] = None,
+                 interval: float = settings.CONSOLE_UPDATE_INTERVAL,
+                 max_rows: int = settings.LIVE_DASHBOARD_ROWS,
+                 threshold: float = settings.QUALIFY_SCORE_THRESHOLD):
+        self.console = console
+        self.progress = progress
+        self.interval = interval
+        self.max_rows = max_rows
+        self.threshold = threshold
+
+        self._rows: Dict[RowKey, Tuple[Tuple, Tuple[Text, ...]]] = {} # key -> (display values, cached cells)
+        self._scores: Dict[RowKey, float] = {}
+        self._order: List[Tuple[float, RowKey]] = [] # (-score, key), best first
+        self._live: Optional[Live] = None
+        self._pending: Optional[asyncio.TimerHandle] = None
+        self._last_render = 0.0
+        self._dirty = False
+
+        self.upserts = 0
+        self.rows_rendered = 0
+        self.renders = 0
+
+    def __enter__(self):
+        self._live = Live(self._renderable(), console=self.console, auto_refresh=False)
+        self._live.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        self.render() # final state stays on screen
+        self._live.__exit__(*exc)
+        self._live = None
+        return False
+
+    def upsert(self, opportunity: MemecoinPotential):
+        key = (opportunity.chain, opportunity.token_address)
+        values = ConsoleDashboard.opportunity_row(opportunity)
+        self.upserts += 1
+
+        cached = self._rows.get(key)
+        if cached is None or cached[0] != values:
+            self._rows[key] = (values, tuple(Text.from_markup(cell) for cell in values))
+            self.rows_rendered += 1
+            self._dirty = True
+
+        score = opportunity.overall_score
+        previous = self._scores.get(key)
+        if previous != score:
+            if previous is not None:
+                del self._order[bisect.bisect_left(self._order, (-previous, key))]
+            bisect.insort(self._order, (-score, key))
+            self._scores[key] = score
+            self._dirty = True
+
+        if self._dirty:
+            self._schedule_render()
+
+    def _schedule_render(self):
+        if self._pending is not None or self._live is None:
+            return
+        delay = self._last_render + self.interval - time.monotonic()
+        if delay <= 0:
+            self.render()
+        else:
+            self._pending = asyncio.get_running_loop().call_later(delay, self._trailing_render)
+
+    def _trailing_render(self):
+        self._pending = None
+        if self._dirty:
+            self.render()
+
+    def render(self):
+        if self._live is None:
+            return
+        self._live.update(self._renderable(), refresh=True)
+        self._last_render = time.monotonic()
+        self._dirty = False
+        self.renders += 1
+
+    def _renderable(self):
+        table = ConsoleDashboard.opportunity_table()
+        for _, key in self._order[:self.max_rows]:
+            table.add_row(*self._rows[key][1])
+        qualified = bisect.bisect_right(self._order, -self.threshold, key=lambda entry: entry[0])
+        table.caption = (
+            f"{len(self._order)} scored · {qualified} at {self.threshold:.0f}+ · "
+            f"top {min(self.max_rows, len(self._order))} shown · updated {time.strftime('%H:%M:%S')}"
+        )
+        return Group(self.progress, table) if self.progress is not None else table
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rows": len(self._order),
+            "upserts": self.upserts,
+            "rows_rendered": self.rows_rendered,
+            "renders": self.renders,
+        }
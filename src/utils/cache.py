@@ -0,0 +1,176 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.config import settings
+from .rate_limiter import endpoint_path
+
+
+class SQLiteCacheStore:
+    """Persistent cache layer so cached responses survive restarts"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so the store can be closed at cleanup and reused by the next hunt
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache(
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row and row[1] > time.time():
+            return row[0], row[1]
+        return None
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache(key, value, expires_at) VALUES(?, ?, ?)",
+                (key, value, expires_at)
+            )
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ResponseCache:
+    """Async TTL + LRU cache for API responses, bounded by entry count and approximate bytes"""
+
+    def __init__(self,
+                 default_ttl: float = settings.CACHE_DURATION,
+                 endpoint_ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = settings.CACHE_MAX_ENTRIES,
+                 max_bytes: int = settings.CACHE_MAX_BYTES,
+                 store: Optional[SQLiteCacheStore] = None):
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = endpoint_ttls if endpoint_ttls is not None else dict(settings.CACHE_TTLS)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.store = store
+
+        # key -> (expires_at, size, value); most recently used at the end
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        store = SQLiteCacheStore(settings.CACHE_DB_PATH) if settings.CACHE_PERSISTENT else None
+        return cls(store=store)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        return f"{endpoint}|{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.endpoint_ttls.get(endpoint_path(endpoint), self.default_ttl)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        if self.ttl_for(endpoint) <= 0:
+            return None
+        key = self.make_key(endpoint, params)
+
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, _, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._remove(key)
+            self.expirations += 1
+
+        if self.store:
+            stored = await asyncio.to_thread(self.store.get, key)
+            if stored:
+                raw, expires_at = stored
+                value = json.loads(raw)
+                self._insert(key, value, expires_at, len(raw))
+                self.persistent_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, endpoint: str, params: Optional[Dict], value: Any):
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or value is None:
+            return
+        key = self.make_key(endpoint, params)
+        raw = json.dumps(value, default=str)
+        expires_at = time.time() + ttl
+        self._insert(key, value, expires_at, len(raw))
+        if self.store:
+            await asyncio.to_thread(self.store.set, key, raw, expires_at)
+
+    def _insert(self, key: str, value: Any, expires_at: float, size: int):
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = (expires_at, size, value)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hit_ratio": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        if self.store:
+            self.store.close()
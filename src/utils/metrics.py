@@ -0,0 +1,307 @@
+import bisect
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from ..core.config import settings
+
+LabelValues = Tuple[str, ...]
+
+# Prometheus' default latency buckets, seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self.values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def time(self, **labels) -> _Timer:
+        """Context manager observing the seconds spent inside it"""
+        return _Timer(self, labels)
+
+    def quantile(self, key: LabelValues, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile, the usual bucketed estimate"""
+        counts, _, count = self.values[key]
+        rank = q * count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """Value read from a callback at scrape time, e.g. a cache hit ratio"""
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], float]):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+
+    def value(self) -> Optional[float]:
+        try:
+            return float(self.callback())
+        except Exception:
+            return None
+
+    def render(self) -> List[str]:
+        value = self.value()
+        if value is None:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {value}"]
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NoopMetric:
+    """What an instrument does while metrics are disabled: each call is a no-op"""
+    _timer = _NoopTimer()
+
+    def inc(self, amount: float = 1.0, **labels):
+        pass
+
+    def observe(self, value: float, **labels):
+        pass
+
+    def time(self, **labels) -> _NoopTimer:
+        return self._timer
+
+
+_NOOP = _NoopMetric()
+
+
+class _Instrument:
+    """Handle for a registered counter or histogram that checks `registry.enabled` on every call.
+
+    Module-level instruments are created at import time; deciding there would leave
+    them no-ops for good if metrics are switched on later.
+    """
+    __slots__ = ("registry", "name", "factory", "_metric")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, factory: Callable[[], object]):
+        self.registry = registry
+        self.name = name
+        self.factory = factory
+        self._metric = None
+
+    def _target(self):
+        if not self.registry.enabled:
+            return _NOOP
+        if self._metric is None:
+            self._metric = self.registry._metrics.setdefault(self.name, self.factory())
+        return self._metric
+
+    def inc(self, amount: float = 1.0, **labels):
+        self._target().inc(amount, **labels)
+
+    def observe(self, value: float, **labels):
+        self._target().observe(value, **labels)
+
+    def time(self, **labels):
+        return self._target().time(**labels)
+
+
+class MetricsRegistry:
+    """Counters, histograms and gauges for the hunt, exposed as Prometheus text.
+
+    Instruments check `enabled` when used, not when created: with metrics off the
+    instrumented hot paths pay an attribute check and nothing else, and turning
+    them on later (e.g. `metrics.enabled = True`) takes effect everywhere.
+    """
+
+    def __init__(self, enabled: bool = settings.METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> _Instrument:
+        return _Instrument(self, name, lambda: Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> _Instrument:
+        return _Instrument(self, name, lambda: Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], float]):
+        # Kept while disabled too, the callback is only read when rendering.
+        # Re-registering replaces the callback, e.g. when a client is recreated
+        self._gauges[name] = Gauge(name, help_text, callback)
+
+    def get(self, name: str):
+        return self._metrics.get(name, self._gauges.get(name))
+
+    def render_prometheus(self) -> str:
+        if not self.enabled:
+            return "\n"
+        lines: List[str] = []
+        for metric in list(self._metrics.values()) + list(self._gauges.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    async def start_server(self, host: str = settings.METRICS_HOST, port: int = settings.METRICS_PORT) -> Optional[str]:
+        """Serve /metrics in Prometheus text format; returns the URL"""
+        if not self.enabled or self._runner is not None:
+            return None
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/metrics"
+
+    async def stop_server(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.render_prometheus(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    def summary(self) -> Dict[str, list]:
+        """Rows for the dashboard panel: stage timings, request counts and gauges"""
+        stages = []
+        stage_histogram = self._metrics.get("hunt_stage_seconds")
+        if isinstance(stage_histogram, Histogram):
+            for key, (_, total, count) in sorted(stage_histogram.values.items(), key=lambda item: -item[1][1]):
+                stages.append({
+                    "stage": key[0], "calls": count, "total_seconds": total,
+                    "avg_ms": total / count * 1000.0 if count else 0.0,
+                    "p95_ms": stage_histogram.quantile(key, 0.95) * 1000.0,
+                })
+
+        requests = []
+        request_counter = self._metrics.get("api_requests_total")
+        error_counter = self._metrics.get("api_errors_total")
+        if isinstance(request_counter, Counter):
+            totals: Dict[Tuple[str, str], float] = {}
+            for (provider, endpoint, _status), value in request_counter.values.items():
+                totals[(provider, endpoint)] = totals.get((provider, endpoint), 0.0) + value
+            errors: Dict[Tuple[str, str], float] = {}
+            if isinstance(error_counter, Counter):
+                for (provider, endpoint, _kind), value in error_counter.values.items():
+                    errors[(provider, endpoint)] = errors.get((provider, endpoint), 0.0) + value
+            for (provider, endpoint), total in sorted(totals.items()):
+                requests.append({"provider": provider, "endpoint": endpoint, "requests": int(total),
+                                 "errors": int(errors.get((provider, endpoint), 0))})
+
+        gauges = [{"name": gauge.name, "value": gauge.value()} for gauge in self._gauges.values()]
+        return {"stages": stages, "requests": requests, "gauges": gauges}
+
+
+metrics = MetricsRegistry()
+
+# Shared instruments; no-ops while metrics.enabled is off
+HUNT_STAGE_SECONDS = metrics.histogram(
+    "hunt_stage_seconds", "Seconds spent in each hunt stage", ("stage",)
+)
+API_REQUESTS = metrics.counter(
+    "api_requests_total", "HTTP requests sent, by provider, endpoint and status", ("provider", "endpoint", "status")
+)
+API_ERRORS = metrics.counter(
+    "api_errors_total", "Failed HTTP requests, by provider, endpoint and kind", ("provider", "endpoint", "kind")
+)
+API_REQUEST_SECONDS = metrics.histogram(
+    "api_request_seconds", "HTTP request latency, by provider and endpoint", ("provider", "endpoint")
+)
+
+
+async def observe_request(provider: str, endpoint: str, request):
+    """Await an HTTP request coroutine, counting and timing it under provider/endpoint"""
+    if not metrics.enabled:
+        return await request
+    started = time.perf_counter()
+    try:
+        response = await request
+    except Exception as e:
+        API_REQUESTS.inc(provider=provider, endpoint=endpoint, status="error")
+        API_ERRORS.inc(provider=provider, endpoint=endpoint, kind=type(e).__name__)
+        raise
+    finally:
+        API_REQUEST_SECONDS.observe(time.perf_counter() - started, provider=provider, endpoint=endpoint)
+    API_REQUESTS.inc(provider=provider, endpoint=endpoint, status=response.status)
+    if response.status >= 400:
+        API_ERRORS.inc(provider=provider, endpoint=endpoint, kind=f"http_{response.status}")
+    return response
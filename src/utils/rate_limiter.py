@@ -0,0 +1,114 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from ..core.config import settings
+
+
+class TokenBucket:
+    """Async token bucket: refills `rate_per_minute` tokens a minute and holds up to `burst` of them"""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = max(rate_per_minute, 1e-9) / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio.Lock wakes waiters in arrival order, which is what keeps the queue fair
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    def _refill(self, now: float):
+        # `updated` sits in the future while the bucket is blocked: nothing accrues until the block ends
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._get_lock():
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def penalize(self, delay: float):
+        """Pause the bucket after a 429 and drain it so resumed callers trickle back in"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, now + max(0.0, delay))
+        self.updated = max(self.updated, self.blocked_until)
+
+
+class RateLimiterRegistry:
+    """Shared buckets per provider, plus per-endpoint buckets where RATE_LIMITS defines one"""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+
+    def get(self, provider: str, endpoint: Optional[str] = None,
+            default_rate: Optional[float] = None) -> Optional[TokenBucket]:
+        key = (provider, endpoint)
+        if key not in self._buckets:
+            if endpoint is None:
+                rate = settings.RATE_LIMITS.get(provider, default_rate or settings.RATE_LIMIT_PER_MINUTE)
+            elif f"{provider}:{endpoint}" in settings.RATE_LIMITS:
+                rate = settings.RATE_LIMITS[f"{provider}:{endpoint}"]
+            else:
+                return None
+            self._buckets[key] = TokenBucket(rate, settings.RATE_LIMIT_BURST)
+        return self._buckets[key]
+
+    async def acquire(self, provider: str, endpoint: Optional[str] = None,
+                      default_rate: Optional[float] = None):
+        if endpoint:
+            endpoint_bucket = self.get(provider, endpoint)
+            if endpoint_bucket:
+                await endpoint_bucket.acquire()
+        await self.get(provider, default_rate=default_rate).acquire()
+
+    def penalize(self, provider: str, endpoint: Optional[str], delay: float):
+        self.get(provider).penalize(delay)
+        if endpoint:
+            endpoint_bucket = self.get(provider, endpoint)
+            if endpoint_bucket:
+                endpoint_bucket.penalize(delay)
+
+
+def endpoint_path(endpoint: str) -> str:
+    """'/defi/token_overview?chain=solana' -> '/defi/token_overview'"""
+    return "/" + endpoint.split("?", 1)[0].lstrip("/")
+
+
+def retry_after_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to back off after a 429, from Retry-After (seconds or HTTP date) or exponential backoff"""
+    backoff = min(settings.RATE_LIMIT_BACKOFF_BASE * (2 ** attempt), settings.RATE_LIMIT_BACKOFF_MAX)
+    if not retry_after:
+        return backoff
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return backoff
+
+
+rate_limiters = RateLimiterRegistry()
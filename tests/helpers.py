@@ -0,0 +1,17 @@
+"""Shared builders for the offline tests."""
+from datetime import datetime
+
+from src.models.analysis_result import MemecoinPotential, NarrativeIndicators
+
+
+def make_opportunity(address: str, score: float = 90.0, chain: str = "solana", **fields) -> MemecoinPotential:
+    """A scored token with plausible market numbers; `fields` override any MemecoinPotential field"""
+    values = dict(
+        token_address=address, symbol=address.upper(), name=address, chain=chain,
+        price=1.0, market_cap=250_000, liquidity=50_000, volume_24h=100_000, price_change_24h=5.0,
+        narrative_indicators=NarrativeIndicators(hype_level=60.0), security_score=80, security_flags=[],
+        overall_score=score, potential_type="early_gem", confidence=70, reasoning="test",
+        timestamp=datetime(2024, 1, 1, 12, 0), # fixed, so equal inputs build equal opportunities
+    )
+    values.update(fields)
+    return MemecoinPotential(**values)
@@ -0,0 +1,127 @@
+"""Local stand-ins for the external APIs, used by the offline tests."""
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Set
+
+from aiohttp import web
+
+
+class TwitterStubServer:
+    """Serves /2/tweets/search/recent from canned pages.
+
+    The first `rate_limited_requests` calls get a 429 whose x-rate-limit-reset is
+    `reset_after` seconds away, like the real API at the end of a window.
+    """
+
+    def __init__(self, pages: List[List[Dict]], rate_limited_requests: int = 0,
+                 reset_after: float = 1.0, page_delay: float = 0.0):
+        self.pages = pages
+        self.rate_limited_requests = rate_limited_requests
+        self.reset_after = reset_after
+        self.page_delay = page_delay
+        self.requests: List[Dict[str, str]] = []
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/2/tweets/search/recent", self._search_recent)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    async def _search_recent(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        if len(self.requests) <= self.rate_limited_requests:
+            return web.json_response(
+                {"title": "Too Many Requests"}, status=429,
+                headers={"x-rate-limit-reset": str(int(time.time() + self.reset_after) + 1)}
+            )
+
+        if self.page_delay:
+            await asyncio.sleep(self.page_delay)
+
+        page_index = int(request.query.get("next_token", "0"))
+        tweets = self.pages[page_index] if page_index < len(self.pages) else []
+        meta = {"result_count": len(tweets)}
+        if page_index + 1 < len(self.pages):
+            meta["next_token"] = str(page_index + 1)
+        return web.json_response({"data": tweets, "meta": meta})
+
+
+class BirdeyeWebSocketStub:
+    """Speaks the Birdeye socket protocol on /socket/<chain>.
+
+    Every SUBSCRIBE_PRICE address gets a PRICE_DATA candle each `tick_interval`
+    seconds on that connection until it is unsubscribed or the connection drops.
+    `subscriptions` records (connection number, message type, address) in order.
+    """
+
+    def __init__(self, tick_interval: float = 0.05):
+        self.tick_interval = tick_interval
+        self.subscriptions: List[tuple] = []
+        self.connections = 0
+        self._open = set()
+        self._server = None
+        self.url = ""
+
+    async def start(self) -> str:
+        from websockets.asyncio.server import serve
+
+        self._server = await serve(self._handler, "127.0.0.1", 0, subprotocols=["echo-protocol"])
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/socket"
+        return self.url
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def drop_connections(self):
+        """Close every open connection abnormally, like a network blip"""
+        for connection in list(self._open):
+            connection.transport.abort()
+
+    async def _handler(self, connection):
+        self.connections += 1
+        number = self.connections
+        self._open.add(connection)
+        watched: Set[str] = set()
+        ticker = asyncio.create_task(self._tick(connection, watched))
+        try:
+            await connection.send(json.dumps({"type": "WELCOME"}))
+            async for message in connection:
+                request = json.loads(message)
+                address = request["data"]["address"]
+                self.subscriptions.append((number, request["type"], address))
+                if request["type"] == "SUBSCRIBE_PRICE":
+                    watched.add(address)
+                elif request["type"] == "UNSUBSCRIBE_PRICE":
+                    watched.discard(address)
+        except Exception:
+            pass
+        finally:
+            ticker.cancel()
+            self._open.discard(connection)
+
+    async def _tick(self, connection, watched: Set[str]):
+        price = 1.0
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            price += 0.01
+            for address in list(watched):
+                await connection.send(json.dumps({"type": "PRICE_DATA", "data": {
+                    "o": price, "h": price, "l": price, "c": price, "v": 100.0,
+                    "eventType": "ohlcv", "type": "1m", "unixTime": int(time.time()),
+                    "symbol": "TEST", "address": address,
+                }}))
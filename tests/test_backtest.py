@@ -0,0 +1,159 @@
+import importlib.util
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.database import DatabaseManager
+
+# The backtest is a standalone script outside the src package
+SCRIPT = Path(__file__).resolve().parents[1] / "V.0.9" / "Fx" / "backt3st.py"
+spec = importlib.util.spec_from_file_location("backt3st", SCRIPT)
+backtest = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(backtest)
+
+START = 1_700_006_400 # on a day boundary
+RESOLUTION = 60
+HOLD = 5
+
+
+def at(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+def signal(coin: str, epoch: int, kind: str = "NEW_GEM", score: float = 80.0) -> dict:
+    return {'coin_id': coin, 'potential_type': kind, 'confidence_score': 70,
+            'details': {'overall_score': score}, 'created_at': at(epoch)}
+
+
+def reference(signals, bars, hold, resolution, take_profit, stop_loss, fee, slippage):
+    """The trade rules written out one signal and one bar at a time"""
+    cost = (1 - slippage) / (1 + slippage) * (1 - fee) ** 2
+    trades = []
+    for coin, epoch in signals:
+        series = sorted((ts, price) for c, ts, price in bars if c == coin and ts >= epoch)
+        if not series or series[0][0] >= epoch + resolution:
+            trades.append((math.nan, epoch, 0))
+            continue
+        entry_time, entry_price = series[0]
+        path = [(ts, price) for ts, price in series[1:hold + 1] if ts <= entry_time + hold * resolution]
+        if not path:
+            trades.append((math.nan, epoch, 0))
+            continue
+        for ts, price in path:
+            ret = price / entry_price - 1
+            if ret >= take_profit:
+                trades.append(((1 + ret) * cost - 1, ts, 1))
+                break
+            if ret <= -stop_loss:
+                trades.append(((1 + ret) * cost - 1, ts, 2))
+                break
+        else:
+            ts, price = path[-1]
+            trades.append(((price / entry_price) * cost - 1, ts, 3))
+    return trades
+
+
+def run(db_path, take_profit, stop_loss, fee=0.003, slippage=0.01):
+    conn = backtest.connect(db_path)
+    coins, times, _, coin_names, _ = backtest.load_signals(conn, START - 3600, 0.0, 1)
+    windows = backtest.trade_windows(coins, times, (HOLD + 1) * RESOLUTION)
+    bars = backtest.load_prices(conn, coin_names, windows, RESOLUTION)
+    net, exit_time, reason = backtest.simulate(coins, times, *bars, HOLD, RESOLUTION, take_profit, stop_loss,
+                                               fee, slippage)
+    conn.close()
+    return [(coin_names[c], int(t)) for c, t in zip(coins, times)], list(zip(net, exit_time, reason))
+
+
+def assert_matches(simulated, expected):
+    for (net, exit_time, reason), (ref_net, ref_exit, ref_reason) in zip(simulated, expected):
+        assert (reason, int(exit_time)) == (ref_reason, ref_exit)
+        if math.isnan(ref_net):
+            assert math.isnan(net)
+        else:
+            assert net == pytest.approx(ref_net)
+
+
+@pytest.fixture
+def synthetic_db(tmp_path):
+    """Random walks for a few coins with dropped bars, a coin that stops trading and signals around them"""
+    rng = np.random.default_rng(11)
+    bars = []
+    for coin in ("dense", "sparse", "ends"):
+        price = 1.0
+        for step in range(120):
+            price *= math.exp(rng.normal(0, 0.05))
+            if coin == "sparse" and rng.random() < 0.4:
+                continue
+            if coin == "ends" and step > 60:
+                break
+            bars.append((coin, START + step * RESOLUTION + 5, price))
+
+    signals = [(coin, START + int(rng.integers(0, 118 * RESOLUTION))) for coin in ("dense", "sparse") for _ in range(15)]
+    signals += [
+        ("ends", START + 59 * RESOLUTION), # one bar left after the entry
+        ("ends", START + 60 * RESOLUTION), # enters on the last bar, nothing to exit on
+        ("ends", START + 80 * RESOLUTION), # no bar after the signal at all
+    ]
+
+    path = str(tmp_path / "backtest.db")
+    db = DatabaseManager(path, persistent=False)
+    assert db.write_batch(
+        potentials=[signal(coin, epoch) for coin, epoch in signals],
+        prices=[{'coin_id': coin, 'price': price, 'timestamp': at(ts)} for coin, ts, price in bars],
+    )
+    return path, bars
+
+
+@pytest.mark.parametrize("take_profit, stop_loss", [(0.08, 0.06), (0.5, 0.5), (0.0, 0.0)])
+def test_simulate_matches_reference(synthetic_db, take_profit, stop_loss):
+    path, bars = synthetic_db
+    signals, simulated = run(path, take_profit, stop_loss)
+
+    expected = reference(signals, bars, HOLD, RESOLUTION, take_profit, stop_loss, 0.003, 0.01)
+    assert_matches(simulated, expected)
+    reasons = {reason for _, _, reason in expected}
+    assert 0 in reasons and reasons & {1, 2, 3}
+
+
+def test_flat_bar_hits_take_profit_and_stop_loss(tmp_path):
+    # With both at 0 an unchanged price meets both on the same bar; take-profit wins
+    path = str(tmp_path / "flat.db")
+    db = DatabaseManager(path, persistent=False)
+    bars = [("flat", START + 5, 2.0), ("flat", START + 65, 2.0), ("flat", START + 125, 2.0)]
+    assert db.write_batch(
+        potentials=[signal("flat", START)],
+        prices=[{'coin_id': coin, 'price': price, 'timestamp': at(ts)} for coin, ts, price in bars],
+    )
+
+    _, simulated = run(path, 0.0, 0.0, fee=0.0, slippage=0.0)
+    assert [(float(net), int(exit_time), int(reason)) for net, exit_time, reason in simulated] == [(0.0, START + 65, 1)]
+
+
+def test_cooldown_counts_from_the_last_kept_signal(tmp_path):
+    path = str(tmp_path / "signals.db")
+    db = DatabaseManager(path, persistent=False)
+    day = 86400
+    assert db.write_batch(potentials=[
+        signal("a", START - 10),
+        signal("a", START + 10), # across a day boundary, still within the cooldown
+        signal("a", START + day - 5), # a day after the first signal
+        signal("a", START + day + 3600), # within the cooldown of the kept repeat
+        signal("a", START, kind="DIP_BUY"), # other types keep their own cooldown
+        signal("b", START),
+        signal("b", START + 2 * day, score=10.0), # below min_score
+    ])
+
+    conn = backtest.connect(path)
+    coins, times, kinds, coin_names, type_names = backtest.load_signals(conn, START - day, 40.0, day)
+    conn.close()
+
+    kept = sorted((coin_names[c], type_names[k], int(t)) for c, k, t in zip(coins, kinds, times))
+    assert kept == [
+        ("a", "DIP_BUY", START),
+        ("a", "NEW_GEM", START - 10),
+        ("a", "NEW_GEM", START + day - 5),
+        ("b", "NEW_GEM", START),
+    ]
@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core.config import settings
+from src.data_sources import birdeye_client
+from src.data_sources.birdeye_client import BirdeyeClient
+from src.data_sources.transport import Transport, TransportResponse
+from src.utils.cache import ResponseCache
+from src.utils.rate_limiter import RateLimiterRegistry
+
+
+class BatchTransport(Transport):
+    """Answers multi-address lookups with per-address data, recording every request's params"""
+
+    def __init__(self, missing=(), failing_chunks=(), delay: float = 0.0):
+        self.missing = set(missing)
+        self.failing_chunks = set(failing_chunks)
+        self.delay = delay
+        self.sent = []
+
+    async def request(self, method, url, session_factory, params=None, headers=None):
+        self.sent.append((url, dict(params or {})))
+        await asyncio.sleep(self.delay)
+        if "list_address" not in (params or {}):
+            return TransportResponse(200, {}, b'{"data": {"price": 1.0}}')
+        chunk = params["list_address"]
+        if chunk in self.failing_chunks:
+            return TransportResponse(500, {}, b"boom")
+        data = {
+            address: None if address in self.missing else {"price": float(len(address)), "liquidity": 1000.0}
+            for address in chunk.split(",")
+        }
+        return TransportResponse(200, {}, json.dumps({"data": data}).encode())
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"birdeye": 60_000})
+    monkeypatch.setattr(birdeye_client, "rate_limiters", RateLimiterRegistry())
+
+    def make(transport):
+        return BirdeyeClient("test-key", cache=ResponseCache(default_ttl=0, endpoint_ttls={}), transport=transport)
+    return make
+
+
+def test_multi_market_data_is_chunked_and_merged_by_address(client, monkeypatch):
+    monkeypatch.setattr(settings, "BIRDEYE_MULTI_MARKET_DATA_BATCH", 2)
+    transport = BatchTransport(missing={"ccc"})
+
+    merged = asyncio.run(client(transport).get_multi_market_data(["a", "bb", "ccc", "bb", "dddd", "eeeee"], "solana"))
+
+    # Duplicates collapse before chunking: five addresses, three requests of at most two
+    assert [params["list_address"] for _, params in transport.sent] == ["a,bb", "ccc,dddd", "eeeee"]
+    assert all("/defi/v3/token/market-data/multiple" in url for url, _ in transport.sent)
+    # Addresses the API has no data for are left out
+    assert merged == {
+        "a": {"price": 1.0, "liquidity": 1000.0},
+        "bb": {"price": 2.0, "liquidity": 1000.0},
+        "dddd": {"price": 4.0, "liquidity": 1000.0},
+        "eeeee": {"price": 5.0, "liquidity": 1000.0},
+    }
+
+
+def test_a_failed_chunk_only_loses_its_own_addresses(client, monkeypatch):
+    monkeypatch.setattr(settings, "BIRDEYE_MULTI_PRICE_BATCH", 2)
+    transport = BatchTransport(failing_chunks={"c,d"})
+
+    merged = asyncio.run(client(transport).get_multi_price(["a", "b", "c", "d", "e"], "base"))
+
+    assert len(transport.sent) == 3
+    assert all("/defi/multi_price?chain=base" in url for url, _ in transport.sent)
+    assert sorted(merged) == ["a", "b", "e"]
+    assert asyncio.run(client(transport).get_multi_price([], "base")) == {}
+
+
+def test_concurrent_identical_overviews_share_one_request(client):
+    transport = BatchTransport(delay=0.05)
+    birdeye = client(transport)
+
+    async def scenario():
+        return await asyncio.gather(*(birdeye.get_detailed_token_info("GEM", "solana") for _ in range(5)))
+
+    responses = asyncio.run(scenario())
+
+    assert responses == [{"data": {"price": 1.0}}] * 5
+    assert len(transport.sent) == 1
+    assert birdeye.inflight.stats() == {"calls": 1, "shared": 4, "in_flight": 0}
+
+
+def listed_token(i: int, qualifies: bool = True) -> dict:
+    return {'address': f"tok{i}", 'symbol': f"T{i}", 'liquidity': 60_000 if qualifies else 10,
+            'volume_24h': 200_000}
+
+
+class TokenList:
+    """Stands in for BirdeyeClient._fetch_token_page: `total` listed tokens, every third one too illiquid"""
+
+    def __init__(self, total: int, delay: float = 0.0):
+        self.tokens = [listed_token(i, qualifies=i % 3 != 2) for i in range(total)]
+        self.delay = delay
+        self.requested = []
+        self.cancelled = []
+
+    async def __call__(self, chain, offset, limit):
+        self.requested.append((offset, limit))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(offset)
+            raise
+        return self.tokens[offset:offset + limit]
+
+
+def stream(client, token_list, **kwargs):
+    birdeye = client(BatchTransport())
+    birdeye._fetch_token_page = token_list
+
+    async def scenario():
+        return [token['address'] async for token in birdeye.stream_new_tokens("solana", **kwargs)]
+    return asyncio.run(scenario())
+
+
+def test_stream_walks_pages_until_a_short_one(client):
+    token_list = TokenList(total=120)
+
+    streamed = stream(client, token_list, page_size=50, max_tokens=1000)
+
+    assert token_list.requested == [(0, 50), (50, 50), (100, 50)] # the third page is short: done
+    assert streamed == [f"tok{i}" for i in range(120) if i % 3 != 2] # in list order, filtered
+
+
+def test_stream_stops_on_an_empty_page(client):
+    token_list = TokenList(total=100)
+
+    streamed = stream(client, token_list, page_size=50, max_tokens=1000)
+
+    assert token_list.requested == [(0, 50), (50, 50), (100, 50)]
+    assert len(streamed) == 67
+
+
+def test_stream_stops_at_max_tokens(client):
+    token_list = TokenList(total=500)
+
+    streamed = stream(client, token_list, page_size=50, max_tokens=120)
+
+    assert token_list.requested == [(0, 50), (50, 50), (100, 20)] # the last page is trimmed to the cap
+    assert streamed == [f"tok{i}" for i in range(120) if i % 3 != 2]
+
+
+def test_stream_prefetches_the_next_page_and_cancels_it_on_early_exit(client):
+    token_list = TokenList(total=500, delay=0.05)
+    birdeye = client(BatchTransport())
+    birdeye._fetch_token_page = token_list
+
+    async def scenario():
+        tokens = birdeye.stream_new_tokens("solana", page_size=50, max_tokens=500)
+        first = await tokens.__anext__()
+        await asyncio.sleep(0) # let the prefetch start
+        requested_while_consuming = list(token_list.requested)
+        await tokens.aclose() # the consumer stops early
+        return first, requested_while_consuming
+
+    first, requested_while_consuming = asyncio.run(scenario())
+
+    assert first['address'] == "tok0"
+    # The second page was requested while the first one was still being consumed
+    assert requested_while_consuming == [(0, 50), (50, 50)]
+    assert token_list.cancelled == [50]
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from src.data_sources.birdeye_stream import BirdeyeStream
+from tests.stub_servers import BirdeyeWebSocketStub
+
+
+async def next_update(queue: asyncio.Queue, address: str, timeout: float = 1.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        update = await asyncio.wait_for(queue.get(), deadline - time.perf_counter())
+        if update.address == address:
+            return update
+
+
+def test_watchlist_gets_sub_second_price_updates():
+    async def scenario():
+        server = BirdeyeWebSocketStub(tick_interval=0.05)
+        stream = BirdeyeStream("test-key", url=await server.start(), include_txs=False)
+        updates = stream.subscribe()
+        try:
+            stream.start()
+            await asyncio.wait_for(stream.connected.wait(), 2)
+            await stream.watch(["TokenA", "TokenB"])
+
+            started = time.perf_counter()
+            first_a = await next_update(updates, "TokenA")
+            first_b = await next_update(updates, "TokenB")
+            assert time.perf_counter() - started < 1.0
+            assert first_a.kind == "price" and first_a.chain == "solana"
+            assert stream.latest["TokenB"].price >= first_b.price
+
+            await stream.unwatch(["TokenB"])
+            assert "TokenB" not in stream.latest
+        finally:
+            await stream.stop()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_resubscribes_the_watchlist():
+    async def scenario():
+        server = BirdeyeWebSocketStub(tick_interval=0.05)
+        stream = BirdeyeStream("test-key", url=await server.start(), include_txs=False,
+                               reconnect_min_delay=0.05, reconnect_interval=0.2)
+        updates = stream.subscribe()
+        try:
+            await stream.watch(["TokenA"]) # before connecting: sent on connect
+            stream.start()
+            await next_update(updates, "TokenA")
+
+            await server.drop_connections()
+            await asyncio.sleep(0.3)
+            while not updates.empty():
+                updates.get_nowait()
+            await next_update(updates, "TokenA")
+
+            assert stream.connects == 2
+            assert (2, "SUBSCRIBE_PRICE", "TokenA") in server.subscriptions
+        finally:
+            await stream.stop()
+            await server.stop()
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_drops_oldest_updates():
+    async def scenario():
+        server = BirdeyeWebSocketStub(tick_interval=0.01)
+        stream = BirdeyeStream("test-key", url=await server.start(), include_txs=False)
+        updates = stream.subscribe(maxsize=3)
+        try:
+            await stream.watch(["TokenA"])
+            stream.start()
+            await asyncio.sleep(0.3)
+
+            assert updates.qsize() == 3
+            assert stream.dropped > 0
+            newest = [updates.get_nowait().price for _ in range(3)]
+            assert newest == sorted(newest)
+            assert newest[-1] == stream.latest["TokenA"].price
+        finally:
+            await stream.stop()
+            await server.stop()
+
+    asyncio.run(scenario())
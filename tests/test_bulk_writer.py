@@ -0,0 +1,107 @@
+import time
+
+from src.core.bulk_writer import BulkWriter
+from src.core.database import DatabaseManager
+
+
+class FailingDatabase:
+    """write_batch fails the first `failures` calls, then succeeds"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = []
+
+    def write_batch(self, *tables):
+        self.calls.append(sum(len(rows) for rows in tables))
+        return len(self.calls) > self.failures
+
+
+def price(i: int) -> dict:
+    return {'coin_id': "gem", 'price': float(i)}
+
+
+def test_coin_upsert_keeps_first_detected(tmp_path):
+    db = DatabaseManager(str(tmp_path / "coins.db"), persistent=False)
+    assert db.upsert_coins([{'id': "gem", 'symbol': "GEM", 'name': "Gem", 'is_memecoin': True}])
+    with db.get_connection() as conn:
+        conn.execute("UPDATE coins SET first_detected = '2024-01-01 00:00:00', last_updated = '2024-01-01 00:00:00'")
+
+    assert db.upsert_coins([
+        {'id': "gem", 'symbol': "GEM2", 'name': "Gem v2"},
+        {'id': "new", 'symbol': "NEW", 'name': "New"},
+    ])
+
+    with db.get_connection() as conn:
+        rows = {row['id']: dict(row) for row in conn.execute("SELECT * FROM coins")}
+    assert rows["gem"]['first_detected'] == "2024-01-01 00:00:00"
+    assert rows["gem"]['last_updated'] > "2024-01-01 00:00:00"
+    assert (rows["gem"]['symbol'], rows["gem"]['name'], rows["gem"]['is_memecoin']) == ("GEM2", "Gem v2", 0)
+    assert rows["new"]['first_detected'] is not None
+
+
+def test_token_snapshots_keep_the_latest_analysis(tmp_path):
+    db = DatabaseManager(str(tmp_path / "snapshots.db"), persistent=False)
+    writer = BulkWriter(db, batch_size=100, flush_interval=60)
+    writer.add_snapshot({'address': "gem", 'chain': "solana", 'price': 1.0, 'analyzed_at': 1.0})
+    writer.flush()
+    writer.add_snapshot({'address': "gem", 'chain': "solana", 'price': 2.0, 'analyzed_at': 2.0})
+    writer.add_snapshot({'address': "gem", 'chain': "base", 'price': 3.0, 'analyzed_at': 2.0})
+    assert writer.pending == 2
+    writer.close()
+
+    assert sorted((row['chain'], row['price']) for row in db.load_token_snapshots(since=0)) == [
+        ("base", 3.0), ("solana", 2.0)
+    ]
+
+
+def test_failed_flush_backs_off_instead_of_retrying_every_add():
+    db = FailingDatabase(failures=2)
+    writer = BulkWriter(db, batch_size=2, flush_interval=0.05, retry_backoff_max=0.08)
+
+    for i in range(10):
+        writer.add_price(price(i))
+    assert db.calls == [2] # one attempt, the other adds wait for the backoff
+    assert writer.pending == 10 and writer.due_in() > 0
+
+    time.sleep(0.06)
+    writer.add_price(price(10))
+    assert db.calls == [2, 11]
+    assert 0.05 < writer.due_in() <= 0.08 # doubled, then capped
+
+    time.sleep(0.09)
+    assert writer.flush_if_due() == 11
+    assert writer.pending == 0
+    assert writer.stats()["failed_flushes"] == 2 and writer.stats()["rows_written"] == 11
+
+    # Success resets the backoff
+    writer.add_price(price(11))
+    writer.add_price(price(12))
+    assert db.calls[-1] == 2 and writer.pending == 0
+
+
+def test_rows_stuck_behind_failing_writes_are_capped():
+    db = FailingDatabase(failures=100)
+    writer = BulkWriter(db, batch_size=2, flush_interval=60, max_pending=5)
+
+    for i in range(5):
+        writer.add_price(price(i))
+    assert writer.pending == 5
+    writer.flush()
+    assert writer.pending == 5 # at the cap: kept
+
+    writer.add_price(price(5))
+    writer.flush()
+    assert writer.pending == 0
+    assert writer.stats()["dropped_rows"] == 6
+
+
+def test_flush_if_due_without_another_add():
+    db = FailingDatabase(failures=0)
+    writer = BulkWriter(db, batch_size=100, flush_interval=0.05)
+    writer.add_price(price(1))
+
+    assert writer.flush_if_due() == 0
+    time.sleep(0.06)
+    assert writer.flush_if_due() == 1
+    assert writer.flush_if_due() == 0 # nothing left
+    assert db.calls == [1]
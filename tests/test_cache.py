@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from src.core.config import settings
+from src.utils.cache import ResponseCache, SQLiteCacheStore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_entries_expire_after_their_endpoint_ttl():
+    cache = ResponseCache(default_ttl=60, endpoint_ttls={"/defi/price": 0.05, "/defi/tokenlist": 0})
+
+    run(cache.set("/defi/price?chain=solana", {"address": "X"}, {"price": 1}))
+    run(cache.set("/defi/token_overview?chain=solana", {"address": "X"}, {"name": "x"}))
+    run(cache.set("/defi/tokenlist?chain=solana", {"offset": 0}, {"tokens": []}))
+
+    assert run(cache.get("/defi/price?chain=solana", {"address": "X"})) == {"price": 1}
+    assert run(cache.get("/defi/price?chain=base", {"address": "X"})) is None # other params, other key
+    assert run(cache.get("/defi/tokenlist?chain=solana", {"offset": 0})) is None # TTL 0: never stored
+    time.sleep(0.06)
+    assert run(cache.get("/defi/price?chain=solana", {"address": "X"})) is None
+    assert run(cache.get("/defi/token_overview?chain=solana", {"address": "X"})) == {"name": "x"}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (2, 2, 1, 1)
+
+
+def test_discovery_is_never_cached_by_default():
+    assert ResponseCache().ttl_for("/defi/tokenlist?chain=solana") == 0
+    assert settings.CACHE_TTLS["/defi/tokenlist"] == 0
+
+
+def test_lru_eviction_by_count_and_bytes():
+    cache = ResponseCache(default_ttl=60, endpoint_ttls={}, max_entries=2, max_bytes=1000)
+    for name in ("a", "b"):
+        run(cache.set(f"/{name}", None, {"v": name}))
+    run(cache.get("/a")) # a is now the most recently used
+    run(cache.set("/c", None, {"v": "c"}))
+
+    assert run(cache.get("/b")) is None
+    assert run(cache.get("/a")) == {"v": "a"} and run(cache.get("/c")) == {"v": "c"}
+    assert cache.stats()["evictions"] == 1
+
+    big = {"v": "x" * 600}
+    run(cache.set("/big", None, big))
+    assert cache.stats()["bytes"] <= 1000
+    assert run(cache.get("/big")) == big and run(cache.get("/a")) is None
+
+    run(cache.set("/huge", None, {"v": "x" * 2000})) # larger than the whole cache: skipped
+    assert run(cache.get("/huge")) is None and run(cache.get("/big")) == big
+
+
+def test_sqlite_layer_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = ResponseCache(default_ttl=60, endpoint_ttls={"/short": 0.05}, store=SQLiteCacheStore(path))
+    run(first.set("/long", {"a": 1}, {"v": 1}))
+    run(first.set("/short", {"a": 1}, {"v": 2}))
+    first.close()
+
+    restarted = ResponseCache(default_ttl=60, endpoint_ttls={"/short": 0.05}, store=SQLiteCacheStore(path))
+    assert run(restarted.get("/long", {"a": 1})) == {"v": 1}
+    assert run(restarted.get("/long", {"a": 1})) == {"v": 1} # now from memory
+    time.sleep(0.06)
+    assert run(restarted.get("/short", {"a": 1})) is None # expired rows are not served
+    stats = restarted.stats()
+    assert (stats["persistent_hits"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+    assert restarted.store.purge_expired() == 1
+    restarted.close()
@@ -0,0 +1,63 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.core.config import settings
+from src.core.database import DatabaseManager
+
+
+def test_persistent_connection_is_tuned(tmp_path):
+    db = DatabaseManager(str(tmp_path / "tuned.db"), persistent=True)
+    with db.get_connection() as conn:
+        pragmas = {name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+                   for name in ("journal_mode", "synchronous", "cache_size", "temp_store")}
+    db.close()
+
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1, # NORMAL
+        "cache_size": -settings.DATABASE_CACHE_SIZE_KB,
+        "temp_store": 2, # MEMORY
+    }
+
+
+def test_one_connection_per_thread_and_close_closes_them_all(tmp_path):
+    db = DatabaseManager(str(tmp_path / "threads.db"), persistent=True)
+    with db.get_connection() as first, db.get_connection() as second:
+        assert first is second # reused on the same thread
+
+    other = []
+
+    def worker():
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO coins(id, symbol, name) VALUES('gem', 'GEM', 'Gem')")
+            other.append(conn)
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert other[0] is not first
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM coins").fetchone()[0] == 1 # committed across connections
+    assert len(db._connections) == 2
+
+    db.close()
+
+    for conn in (first, other[0]):
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert db._connections == []
+    with db.get_connection() as reopened:
+        assert reopened is not first and reopened.execute("SELECT COUNT(*) FROM coins").fetchone()[0] == 1
+    db.close()
+
+
+def test_non_persistent_mode_opens_and_closes_per_call(tmp_path):
+    db = DatabaseManager(str(tmp_path / "plain.db"), persistent=False)
+    with db.get_connection() as conn:
+        pass
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert db._connections == []
@@ -0,0 +1,302 @@
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+from rich.console import Console
+
+from src.core import database
+from src.core.config import settings
+from src.core.database import DatabaseManager
+from src.data_sources.birdeye_stream import MarketUpdate
+from src.main import MemecoinHunter
+from src.models.analysis_result import NarrativeIndicators
+from tests.helpers import make_opportunity
+
+
+class FakeBirdeye:
+    """Overview and security lookups that take `delay` seconds and count how many run at once, per chain"""
+
+    def __init__(self, tokens_per_chain: int = 20, delay: float = 0.01, failing=()):
+        self.tokens_per_chain = tokens_per_chain
+        self.delay = delay
+        self.failing = set(failing)
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+        self.finished_at = []
+
+    async def discover_new_tokens(self, chain):
+        return [
+            {'address': f"{chain}-{i}", 'symbol': f"T{i}", 'name': f"Token {i}"} for i in range(self.tokens_per_chain)
+        ]
+
+    async def _lookup(self, address, chain):
+        if address in self.failing:
+            raise RuntimeError(f"lookup failed for {address}")
+        self.in_flight[chain] += 1
+        self.in_flight["total"] += 1
+        self.max_in_flight[chain] = max(self.max_in_flight[chain], self.in_flight[chain])
+        self.max_in_flight["total"] = max(self.max_in_flight["total"], self.in_flight["total"])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight[chain] -= 1
+            self.in_flight["total"] -= 1
+            self.finished_at.append(time.perf_counter())
+        return {'data': {'address': address, 'symbol': address, 'price': 1.0, 'liquidity': 50_000}}
+
+    async def get_detailed_token_info(self, address, chain):
+        return await self._lookup(address, chain)
+
+    async def get_token_security(self, address, chain):
+        return await self._lookup(address, chain)
+
+    async def get_multi_market_data(self, addresses, chain):
+        return {}
+
+    async def get_multi_price(self, addresses, chain):
+        return {}
+
+
+class FakeSentiment:
+    """Stands in for SentimentAnalyzer; a slow one mimics waiting out a Twitter rate-limit window"""
+
+    def __init__(self, delay: float = 0.0, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.finished_at = []
+
+    async def analyze_token_sentiment(self, symbol, name=""):
+        await asyncio.sleep(self.delay)
+        self.finished_at.append(time.perf_counter())
+        if symbol in self.failing:
+            raise RuntimeError(f"sentiment failed for {symbol}")
+        return NarrativeIndicators()
+
+
+@pytest.fixture
+def make_hunter(tmp_path, monkeypatch):
+    """MemecoinHunter on a throwaway database, with MAX_CONCURRENT_REQUESTS 4 (a quota of 2 per chain)"""
+    monkeypatch.setattr(database, "_db", DatabaseManager(str(tmp_path / "hunter.db"), persistent=False))
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_REQUESTS", 4)
+    monkeypatch.setattr(settings, "CHAIN_CONCURRENCY_QUOTAS", {})
+    monkeypatch.setattr(settings, "INCREMENTAL_DISCOVERY", False)
+    hunters = []
+
+    def make(birdeye, sentiment=None):
+        hunter = MemecoinHunter()
+        hunter.console = Console(quiet=True)
+        hunter.birdeye = birdeye
+        hunter.sentiment_analyzer = sentiment or FakeSentiment()
+        hunters.append(hunter)
+        return hunter
+
+    yield make
+    for hunter in hunters:
+        asyncio.run(hunter.persistence.close(timeout=5))
+
+
+def scored(hunter):
+    return {opp.token_address for opp in hunter.leaderboard.top(1000)}
+
+
+def test_chain_hunts_stay_within_the_request_caps(make_hunter):
+    birdeye = FakeBirdeye(tokens_per_chain=20)
+    hunter = make_hunter(birdeye)
+
+    async def scenario():
+        await asyncio.gather(hunter._chain_hunt("solana"), hunter._chain_hunt("base"))
+
+    asyncio.run(scenario())
+
+    assert birdeye.max_in_flight["total"] == settings.MAX_CONCURRENT_REQUESTS # fanned out, never past the cap
+    assert birdeye.max_in_flight["solana"] == birdeye.max_in_flight["base"] == 2 # each chain's quota
+    assert len(scored(hunter)) == 40
+
+
+def test_slow_sentiment_does_not_hold_birdeye_slots(make_hunter):
+    birdeye = FakeBirdeye(tokens_per_chain=20, delay=0.002)
+    sentiment = FakeSentiment(delay=0.2)
+    hunter = make_hunter(birdeye, sentiment)
+
+    asyncio.run(hunter._chain_hunt("solana"))
+
+    # 40 lookups two at a time take ~0.04s; had sentiment held a slot they would queue behind it
+    assert max(birdeye.finished_at) < min(sentiment.finished_at)
+    assert len(scored(hunter)) == 20
+
+
+def test_one_failing_token_does_not_drop_the_batch(make_hunter):
+    birdeye = FakeBirdeye(tokens_per_chain=6, failing={"solana-2"})
+    hunter = make_hunter(birdeye, FakeSentiment(failing={"T4"}))
+
+    asyncio.run(hunter._chain_hunt("solana"))
+
+    assert scored(hunter) == {"solana-0", "solana-1", "solana-3", "solana-5"}
+
+
+class FakeStream:
+    def __init__(self, updates):
+        self.queue = asyncio.Queue()
+        for update in updates:
+            self.queue.put_nowait(update)
+
+    def subscribe(self):
+        return self.queue
+
+
+def test_live_prices_are_stored_once_per_closed_candle(make_hunter):
+    hunter = make_hunter(FakeBirdeye())
+    stored = []
+
+    async def submit_price(price):
+        stored.append((price['coin_id'], price['price'], price['timestamp'].timestamp()))
+    hunter.persistence.submit_price = submit_price
+
+    def candle(address, unix_time, price):
+        return MarketUpdate("price", "solana", address, price, 1.0, unix_time, raw={'h': price, 'l': price})
+    stream = FakeStream([
+        candle("gem", 60, 1.0), candle("gem", 60, 1.2), candle("gem", 60, 1.1), # ticks of one forming candle
+        candle("other", 60, 5.0),
+        candle("gem", 120, 2.0), # closes 60 at its last tick
+        candle("gem", 60, 9.9), # late, already committed
+        candle("gem", 120, 2.5),
+        candle("gem", 180, 3.0),
+        MarketUpdate("txs", "solana", "gem", 3.1, 1.0, 181),
+    ])
+
+    async def scenario():
+        consumer = asyncio.create_task(hunter._record_live_prices(stream))
+        while not stream.queue.empty():
+            await asyncio.sleep(0.01)
+        consumer.cancel()
+
+    asyncio.run(scenario())
+
+    assert stored == [("gem", 1.1, 60.0), ("gem", 2.5, 120.0)] # the candle at 180 is still forming
+    assert hunter.indicators.tokens["gem"].bars == 2
+
+
+def test_chain_quota_defaults_to_an_even_split(make_hunter, monkeypatch):
+    hunter = make_hunter(FakeBirdeye())
+    assert hunter._chain_quota("solana")._value == 2 # MAX_CONCURRENT_REQUESTS 4 over two chains
+
+    monkeypatch.setattr(settings, "CHAIN_CONCURRENCY_QUOTAS", {"base": 3})
+    hunter = make_hunter(FakeBirdeye())
+    assert hunter._chain_quota("base")._value == 3
+    assert hunter._chain_quota("base") is hunter._chain_quota("base")
+
+
+def test_hunt_merges_chains_as_they_finish(make_hunter, monkeypatch):
+    monkeypatch.setattr(settings, "CHAIN_CONCURRENCY_QUOTAS", {"solana": 1, "base": 2})
+    hunter = make_hunter(FakeBirdeye())
+    hunter.target_chains = ["solana", "base", "broken"]
+    hunter.dashboard.console = Console(quiet=True)
+    in_flight, peak = Counter(), Counter()
+    submitted = []
+    finished = {}
+
+    async def lookup(chain):
+        in_flight[chain] += 1
+        in_flight["total"] += 1
+        peak[chain] = max(peak[chain], in_flight[chain])
+        peak["total"] = max(peak["total"], in_flight["total"])
+        await asyncio.sleep(0.01)
+        in_flight[chain] -= 1
+        in_flight["total"] -= 1
+
+    async def chain_hunt(chain, progress=None):
+        if chain == "broken":
+            raise RuntimeError("chain is down")
+        # solana: 6 lookups one at a time (~0.06s); base: 6 under its quota of 2, then a slow tail
+        await asyncio.gather(*(hunter._limited(lookup(chain), chain) for _ in range(6)))
+        if chain == "base":
+            await asyncio.sleep(0.3)
+        finished[chain] = time.perf_counter()
+        return [make_opportunity(f"{chain}-gem", chain=chain)]
+    hunter._chain_hunt = chain_hunt
+
+    async def submit_opportunity(opportunity):
+        submitted.append((opportunity.chain, time.perf_counter()))
+    hunter.persistence.submit_opportunity = submit_opportunity
+
+    qualified = asyncio.run(hunter.golden_gem_hunt())
+
+    assert (peak["solana"], peak["base"]) == (1, 2) and peak["total"] <= settings.MAX_CONCURRENT_REQUESTS
+    # solana's result is merged while base is still running; the broken chain costs nobody anything
+    assert [chain for chain, _ in submitted] == ["solana", "base"]
+    assert submitted[0][1] < finished["base"]
+    assert sorted(opp.chain for opp in qualified) == ["base", "solana"]
+    assert set(hunter.chain_timings) == {"solana", "base", "broken"}
+    assert hunter.chain_timings["base"] > 0.3 > hunter.chain_timings["solana"] > hunter.chain_timings["broken"]
+
+
+class StreamingBirdeye(FakeBirdeye):
+    """Discovery yields `pages` pages of `page_size` tokens, one every 0.02s"""
+
+    def __init__(self, pages: int = 5, page_size: int = 10):
+        super().__init__()
+        self.pages = pages
+        self.page_size = page_size
+        self.exhausted_at = None
+        self.closed = False
+
+    async def stream_new_tokens(self, chain):
+        try:
+            for page in range(self.pages):
+                await asyncio.sleep(0.02)
+                for i in range(page * self.page_size, (page + 1) * self.page_size):
+                    yield {'address': f"{chain}-{i}", 'symbol': f"T{i}", 'name': f"Token {i}"}
+            self.exhausted_at = time.perf_counter()
+        finally:
+            self.closed = True
+
+
+def test_stream_hunt_enriches_while_discovery_runs_with_a_bounded_backlog(make_hunter, monkeypatch):
+    monkeypatch.setattr(settings, "STREAMING_DISCOVERY", True)
+    birdeye = StreamingBirdeye(pages=5, page_size=10)
+    hunter = make_hunter(birdeye)
+    started, running, peak = [], Counter(), Counter()
+
+    async def enrich(token, chain, progress=None, task=None, force=False):
+        started.append(time.perf_counter())
+        running["now"] += 1
+        peak["now"] = max(peak["now"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return make_opportunity(token['address'], chain=chain)
+    hunter._enrich_token = enrich
+
+    opportunities = asyncio.run(hunter._chain_hunt("solana"))
+
+    assert len(opportunities) == 50
+    assert min(started) < birdeye.exhausted_at # enrichment did not wait for the whole list
+    assert peak["now"] <= settings.MAX_CONCURRENT_REQUESTS * 2
+
+
+def test_stream_hunt_closes_discovery_when_it_stops_early(make_hunter, monkeypatch):
+    monkeypatch.setattr(settings, "STREAMING_DISCOVERY", True)
+    birdeye = StreamingBirdeye(pages=50, page_size=10)
+    hunter = make_hunter(birdeye)
+    cancelled = []
+
+    async def enrich(token, chain, progress=None, task=None, force=False):
+        if token['address'] == "solana-3":
+            raise RuntimeError("enrichment blew up")
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(token['address'])
+            raise
+    hunter._enrich_token = enrich
+
+    async def scenario():
+        opportunities = await hunter._chain_hunt("solana")
+        # Closed before _chain_hunt returned, not whenever the generator is garbage collected
+        return opportunities, birdeye.closed
+
+    opportunities, closed_on_return = asyncio.run(scenario())
+
+    assert opportunities == []
+    assert closed_on_return and birdeye.exhausted_at is None
+    assert cancelled # the rest of the backlog was cancelled, not left running
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.analyzers.indicators import IndicatorEngine, TokenIndicators
+
+pd = pytest.importorskip("pandas")
+ta = pytest.importorskip("ta")
+
+
+def random_bars(count: int = 3000, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = pd.Series(np.exp(np.cumsum(rng.normal(0, 0.02, count))))
+    high = close * (1 + rng.random(count) * 0.01)
+    low = close * (1 - rng.random(count) * 0.01)
+    volume = pd.Series(rng.random(count) * 10_000)
+    return close, high, low, volume
+
+
+def test_streaming_values_match_batch_ta():
+    close, high, low, volume = random_bars()
+    state = TokenIndicators()
+    streamed = pd.DataFrame([state.update(close[i], high[i], low[i], volume[i]) for i in range(len(close))])
+
+    bollinger = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+    expected = {
+        "ema_12": ta.trend.EMAIndicator(close, 12).ema_indicator(),
+        "ema_26": ta.trend.EMAIndicator(close, 26).ema_indicator(),
+        "rsi": ta.momentum.RSIIndicator(close, 14).rsi(),
+        "atr": ta.volatility.AverageTrueRange(high, low, close, 14).average_true_range(),
+        "bb_mavg": bollinger.bollinger_mavg(),
+        "bb_hband": bollinger.bollinger_hband(),
+        "bb_lband": bollinger.bollinger_lband(),
+        "vwap": ta.volume.VolumeWeightedAveragePrice(high, low, close, volume, 14).volume_weighted_average_price(),
+    }
+    for name, batch in expected.items():
+        np.testing.assert_allclose(streamed[name], batch, rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=name)
+
+
+def test_flat_prices_give_collapsed_bands_and_neutral_extremes():
+    state = TokenIndicators()
+    for _ in range(30):
+        values = state.update(2.0, volume=5.0)
+    assert values["bb_hband"] == values["bb_lband"] == values["bb_mavg"] == 2.0
+    assert values["rsi"] == 100.0 # no losses at all, as ta reports it
+    assert values["atr"] == 0.0
+    assert values["vwap"] == 2.0
+
+
+def test_candles_commit_once_the_next_one_starts():
+    engine = IndicatorEngine(ema_fast=2)
+    assert engine.update_candle("tok", 60, 1.0, volume=1.0) is None
+    assert engine.update_candle("tok", 60, 1.5, volume=2.0) is None # same candle still forming
+    assert np.isnan(engine.update_candle("tok", 120, 3.0)["ema_2"]) # first closed candle: EMA(2) still warming up
+    assert engine.tokens["tok"].bars == 1
+    values = engine.update_candle("tok", 180, 4.0)
+    assert engine.tokens["tok"].bars == 2
+    assert values["ema_2"] == pytest.approx(1.5 + (3.0 - 1.5) * 2 / 3)
+
+    engine.remove("tok")
+    assert len(engine) == 0 and engine.values("tok") is None
+
+
+def test_late_updates_for_committed_candles_are_ignored():
+    # EMA(1) is just the last committed close
+    engine = IndicatorEngine(ema_fast=1)
+    engine.update_candle("tok", 60, 1.0)
+    engine.update_candle("tok", 120, 1.1)
+    assert engine.update_candle("tok", 60, 9.9) is None # arrives after 60 was committed
+    assert engine.update_candle("tok", 180, 1.2)["ema_1"] == 1.1
+    assert engine.tokens["tok"].bars == 2
+
+
+def test_retain_drops_closed_and_forming_state():
+    engine = IndicatorEngine()
+    engine.update_candle("kept", 60, 1.0)
+    engine.update_candle("kept", 120, 1.0)
+    engine.update_candle("closed", 60, 1.0)
+    engine.update_candle("closed", 120, 1.0)
+    engine.update_candle("forming", 60, 1.0) # never closed a candle
+    engine.retain({"kept"})
+    assert set(engine.tokens) == {"kept"}
+    assert set(engine._forming) == {"kept"}
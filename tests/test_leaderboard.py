@@ -0,0 +1,94 @@
+import pytest
+
+from src.core.bulk_writer import opportunity_rows
+from src.core.database import DatabaseManager
+from src.core.leaderboard import OpportunityLeaderboard
+from tests.helpers import make_opportunity
+
+
+def test_ranking_follows_decayed_scores():
+    board = OpportunityLeaderboard(half_life=100.0, prune_below=5.0)
+    board.upsert(make_opportunity("old", 80), scored_at=0.0)
+    board.upsert(make_opportunity("new", 50), scored_at=100.0)
+    board.upsert(make_opportunity("base", 60, chain="base"), scored_at=100.0)
+
+    # At t=100 "old" has halved to 40
+    top = board.top(3, now=100.0)
+    assert [opp.token_address for opp in top] == ["base", "new", "old"]
+    assert top[2].overall_score == 40.0
+    assert [opp.token_address for opp in board.top(3, min_score=45, now=100.0)] == ["base", "new"]
+    assert [opp.token_address for opp in board.top(3, chain="solana", now=100.0)] == ["new", "old"]
+
+    # Rescoring replaces the entry instead of adding a second one
+    board.upsert(make_opportunity("old", 90), scored_at=100.0)
+    assert [opp.token_address for opp in board.top(2, now=100.0)] == ["old", "base"]
+    assert len(board) == 3
+
+    # Eight half-lives later everything is below the prune floor
+    assert board.prune(now=900.0) == 3
+    assert board.top(3, now=900.0) == []
+
+
+def test_rescoring_with_an_equal_rank_is_listed_once():
+    board = OpportunityLeaderboard(half_life=100.0)
+    board.upsert(make_opportunity("same", 50), scored_at=0.0)
+    board.upsert(make_opportunity("same", 50), scored_at=0.0)
+    board.upsert(make_opportunity("zero", 0), scored_at=0.0)
+    board.upsert(make_opportunity("dead", 0), scored_at=0.0)
+    board.upsert(make_opportunity("zero", 0), scored_at=50.0) # both rank -inf
+
+    assert [opp.token_address for opp in board.top(10, now=0.0)] == ["same", "dead", "zero"]
+    assert [opp.token_address for opp in board.top(10, now=0.0)] == ["same", "dead", "zero"] # heap restored
+
+
+def test_snapshot_ranks_stored_rows_in_place(tmp_path):
+    db = DatabaseManager(str(tmp_path / "leaderboard.db"), persistent=False)
+    board = OpportunityLeaderboard(half_life=100.0)
+    hunt = [make_opportunity(f"tok{i}", score) for i, score in enumerate((70, 60, 50))]
+    for opp in hunt:
+        board.upsert(opp, scored_at=0.0)
+    # The hunt stores every opportunity; tok2 is also stored for another chain
+    assert db.write_batch(potentials=[opportunity_rows(opp)['potential'] for opp in hunt] +
+                          [opportunity_rows(make_opportunity("tok2", 10, chain="base"))['potential']])
+    assert db.snapshot_leaderboard(board.snapshot_rows(2, now=0.0))
+
+    board.upsert(make_opportunity("tok2", 95), scored_at=0.0)
+    assert db.write_batch(potentials=[opportunity_rows(make_opportunity("tok2", 95))['potential']])
+    board.upsert(make_opportunity("tok9", 99, chain="base"), scored_at=0.0) # never stored by a hunt
+    for _ in range(2): # snapshotting again changes nothing
+        assert db.snapshot_leaderboard(board.snapshot_rows(3, now=50.0))
+
+    with db.get_connection() as conn:
+        active = conn.execute(
+            "SELECT id, coin_id, json_extract(details, '$.chain') AS chain, json_extract(details, '$.rank') AS rank, "
+            "json_extract(details, '$.overall_score') AS score, json_extract(details, '$.leaderboard_score') AS decayed "
+            "FROM trading_potential WHERE is_active ORDER BY rank"
+        ).fetchall()
+        total = conn.execute("SELECT COUNT(*) FROM trading_potential").fetchone()[0]
+        ranked = conn.execute("SELECT COUNT(*) FROM trading_potential WHERE json_extract(details, '$.rank')").fetchone()[0]
+    assert [(row["id"], row["coin_id"], row["chain"], row["rank"]) for row in active] == [
+        (6, "tok9", "base", 1), (5, "tok2", "solana", 2), (1, "tok0", "solana", 3),
+    ]
+    # The stored score stays the hunt's, the leaderboard's decayed one sits beside it
+    assert active[2]["score"] == 70
+    assert active[2]["decayed"] == pytest.approx(70 * 0.5 ** 0.5)
+    assert total == 6 # five hunt rows and the one for tok9
+    assert ranked == 3
+
+
+def test_market_data_refresh_keeps_scores_and_ranks():
+    board = OpportunityLeaderboard(half_life=100.0)
+    board.upsert(make_opportunity("a", 80), scored_at=0.0)
+    board.upsert(make_opportunity("b", 60), scored_at=0.0)
+
+    updated = board.refresh_market_data("solana", {
+        "b": {'price': 2.5, 'liquidity': 75_000, 'market_cap': None},
+        "a": {},
+        "gone": {'price': 9.0},
+    })
+
+    assert updated == 1
+    top = board.top(2, now=0.0)
+    assert [opp.token_address for opp in top] == ["a", "b"]
+    assert (top[1].price, top[1].liquidity, top[1].market_cap, top[1].overall_score) == (2.5, 75_000, 250_000, 60)
+    assert board.refresh_market_data("base", {"b": {'price': 1.0}}) == 0 # other chain
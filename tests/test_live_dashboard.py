@@ -0,0 +1,36 @@
+import asyncio
+import io
+
+from rich.console import Console
+
+from src.core.config import settings
+from src.output.live_dashboard import LiveDashboard
+from tests.helpers import make_opportunity
+
+
+def test_rows_are_sorted_cached_and_renders_throttled():
+    async def scenario():
+        console = Console(file=io.StringIO(), width=140, force_terminal=False)
+        with LiveDashboard(console, interval=0.2, max_rows=5) as board:
+            for i in range(300):
+                board.upsert(make_opportunity(f"addr{i}", float(i % 100), symbol=f"TOK{i}"))
+            # First change renders at once, the rest coalesce into one trailing render
+            assert board.renders == 1
+            await asyncio.sleep(0.3)
+            assert board.renders == 2
+
+            board.upsert(make_opportunity("addr7", 7.0, symbol="TOK7")) # unchanged: nothing re-rendered
+            assert board.rows_rendered == 300
+            board.upsert(make_opportunity("addr7", 99.5, symbol="TOK7")) # rescored: one row rebuilt and moved to the top
+            assert board.rows_rendered == 301
+            assert board._order[0] == (-99.5, ("solana", "addr7"))
+            assert board.stats()["rows"] == 300
+        return console.file.getvalue()
+
+    output = asyncio.run(scenario())
+    assert "$TOK7" in output
+    assert "300 scored" in output
+
+
+def test_renders_are_throttled_to_the_console_update_interval():
+    assert LiveDashboard(Console(file=io.StringIO())).interval == settings.CONSOLE_UPDATE_INTERVAL
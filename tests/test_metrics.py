@@ -0,0 +1,61 @@
+from src.utils.metrics import MetricsRegistry
+
+
+def test_enabled_registry_renders_prometheus_text():
+    registry = MetricsRegistry(enabled=True)
+    requests = registry.counter("api_requests_total", "Requests", ("provider", "endpoint", "status"))
+    stages = registry.histogram("hunt_stage_seconds", "Stage seconds", ("stage",), buckets=(0.1, 1.0))
+    registry.gauge("cache_hit_ratio", "Hit ratio", lambda: 0.75)
+
+    requests.inc(provider="birdeye", endpoint="/defi/tokenlist", status=200)
+    requests.inc(provider="birdeye", endpoint="/defi/tokenlist", status=200)
+    stages.observe(0.05, stage="scoring")
+    stages.observe(0.5, stage="scoring")
+
+    text = registry.render_prometheus()
+    assert 'api_requests_total{provider="birdeye",endpoint="/defi/tokenlist",status="200"} 2.0' in text
+    assert 'hunt_stage_seconds_bucket{stage="scoring",le="0.1"} 1' in text
+    assert 'hunt_stage_seconds_bucket{stage="scoring",le="+Inf"} 2' in text
+    assert 'hunt_stage_seconds_count{stage="scoring"} 2' in text
+    assert "cache_hit_ratio 0.75" in text
+
+    summary = registry.summary()
+    assert summary["stages"][0]["stage"] == "scoring"
+    assert summary["stages"][0]["p95_ms"] == 1000.0
+    assert summary["requests"] == [
+        {"provider": "birdeye", "endpoint": "/defi/tokenlist", "requests": 2, "errors": 0}
+    ]
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    histogram = registry.histogram("hunt_stage_seconds", "Stage seconds", ("stage",))
+    with histogram.time(stage="scoring"):
+        pass
+    registry.gauge("cache_hit_ratio", "Hit ratio", lambda: 1.0)
+    assert registry.get("hunt_stage_seconds") is None
+    assert registry.render_prometheus() == "\n"
+
+
+def test_instruments_created_while_disabled_record_once_enabled():
+    # Like the module-level instruments, built at import time before metrics are switched on
+    registry = MetricsRegistry(enabled=False)
+    requests = registry.counter("api_requests_total", "Requests", ("provider", "endpoint", "status"))
+    stages = registry.histogram("hunt_stage_seconds", "Stage seconds", ("stage",), buckets=(0.1, 1.0))
+    registry.gauge("cache_hit_ratio", "Hit ratio", lambda: 0.5)
+    requests.inc(provider="birdeye", endpoint="/defi/price", status=200)
+
+    registry.enabled = True
+    requests.inc(provider="birdeye", endpoint="/defi/price", status=200)
+    with stages.time(stage="scoring"):
+        pass
+
+    text = registry.render_prometheus()
+    assert 'api_requests_total{provider="birdeye",endpoint="/defi/price",status="200"} 1.0' in text
+    assert 'hunt_stage_seconds_count{stage="scoring"} 1' in text
+    assert "cache_hit_ratio 0.5" in text
+
+    # And switching back off stops recording without losing what was collected
+    registry.enabled = False
+    requests.inc(provider="birdeye", endpoint="/defi/price", status=200)
+    assert registry.get("api_requests_total").values == {("birdeye", "/defi/price", "200"): 1.0}
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from src.analyzers.narrative_matcher import NarrativeMatcher
+from src.analyzers.sentiment_analyzer import SentimentAnalyzer
+
+KEYWORDS = SentimentAnalyzer(twitter_client=None).narrative_keywords
+
+# Overlapping, nested, repeated and shared keywords, the cases a single regex can get wrong
+TRICKY = {
+    'nested': ['a', 'ab', 'abc', 'abcd', 'bc', 'c', 'cd'],
+    'shared': ['ab', 'dab', 'x y', 'y'],
+    'repeated': ['ab', 'ab', 'zz', ''],
+    'punctuation': ['a.b', '(c)', 'd+', '🚀🚀'],
+}
+
+
+def per_keyword_counts(narrative_keywords, text_lower):
+    """The scan NarrativeMatcher replaced: one `in` check per listed keyword"""
+    counts = {}
+    for aspect, keywords in narrative_keywords.items():
+        count = sum(1 for keyword in keywords if keyword and keyword in text_lower)
+        if count:
+            counts[aspect] = count
+    return counts
+
+
+def random_texts(narrative_keywords, count, seed):
+    rng = random.Random(seed)
+    keywords = [kw for kws in narrative_keywords.values() for kw in kws if kw]
+    fragments = keywords + [kw[:rng.randint(1, len(kw))] for kw in keywords] + list("abcdxyz .()+🚀$")
+    for _ in range(count):
+        pieces = [rng.choice(fragments) for _ in range(rng.randint(0, 12))]
+        yield rng.choice(["", " "]).join(pieces).lower()
+
+
+@pytest.mark.parametrize("narrative_keywords", [KEYWORDS, TRICKY], ids=["sentiment_analyzer", "tricky"])
+def test_counts_equal_the_per_keyword_scan(narrative_keywords):
+    matcher = NarrativeMatcher(narrative_keywords)
+    for text in random_texts(narrative_keywords, 5000, seed=7):
+        assert matcher.match(text) == per_keyword_counts(narrative_keywords, text), text
+
+
+def test_known_tweets():
+    matcher = NarrativeMatcher(KEYWORDS)
+    tweet = "$pepe to the moon 🚀🚀 diamond hands, dyor - sus dev? lol based team"
+    assert matcher.match(tweet) == per_keyword_counts(KEYWORDS, tweet) == {
+        'hype': 2, 'community': 1, 'utility': 1, 'meme': 2, 'risk': 2,
+    }
+    assert matcher.match("nothing to see here") == {}
+    assert NarrativeMatcher({}).match("moon") == {}
@@ -0,0 +1,128 @@
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.analyzers import param_sweep
+from src.analyzers.memecoin_hunter import MemecoinPotentialScorer, ScoringParams
+from src.analyzers.param_sweep import (COLUMNS, SharedHistory, evaluate, grid, history_fingerprint, load_history,
+                                       random_samples, resume_window, sweep)
+from src.core.database import DatabaseManager
+from src.core.token_state import TokenStateIndex
+from tests.helpers import make_opportunity
+
+
+def random_history(count: int = 400, seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    history = np.column_stack([
+        rng.uniform(0, 2e7, count), # mc
+        rng.uniform(0, 1e6, count), # liquidity
+        rng.uniform(0, 1e6, count), # volume24h
+        rng.uniform(-90, 90, count), # price24hchangepercent
+        *(rng.uniform(0, 100, count) for _ in range(6)), # sentiment fields
+        rng.uniform(0, 100, count), # security_score
+        rng.normal(0, 0.3, count), # forward return
+    ])
+    assert history.shape[1] == len(COLUMNS) + 1
+    return history
+
+
+@pytest.fixture
+def attached():
+    """The module's worker state, mapped in-process the way the pool initializer maps it"""
+    history = random_history()
+    shared = SharedHistory(history)
+    param_sweep._attach(shared.spec)
+    yield history
+    param_sweep._worker_shm.close()
+    shared.close()
+
+
+def test_evaluate_matches_direct_scoring(attached):
+    history = attached
+    params = {"hype_weight": 0.5, "qualify_score": 35.0}
+
+    result = evaluate(params)
+
+    scored = MemecoinPotentialScorer(ScoringParams(**params)).score_batch(
+        {name: history[:, i] for i, name in enumerate(COLUMNS)}
+    )
+    returns = history[scored['overall_score'] >= 35.0, -1]
+    assert result["observations"] == len(history)
+    assert result["qualified"] == len(returns) > 0
+    assert result["mean_return"] == pytest.approx(returns.mean())
+    assert result["hit_rate"] == pytest.approx((returns > 0).mean())
+
+
+def test_shared_history_is_mapped_read_only(attached):
+    history = attached
+    np.testing.assert_array_equal(param_sweep._worker_batch['mc'], history[:, 0])
+    np.testing.assert_array_equal(param_sweep._worker_returns, history[:, -1])
+    with pytest.raises(ValueError):
+        param_sweep._worker_batch['mc'][0] = 1.0
+
+
+def test_grid_and_seeded_random_samples():
+    assert list(grid({"b": [1.0, 2.0], "a": [3.0]})) == [{"a": 3.0, "b": 1.0}, {"a": 3.0, "b": 2.0}]
+
+    space = {"hype_weight": (0.1, 0.5), "qualify_score": [30.0, 40.0]}
+    samples = list(random_samples(space, 50, seed=3))
+    assert samples == list(random_samples(space, 50, seed=3))
+    assert samples != list(random_samples(space, 50, seed=4))
+    assert all(0.1 <= sample["hype_weight"] <= 0.5 for sample in samples)
+    assert {sample["qualify_score"] for sample in samples} == {30.0, 40.0}
+
+
+def test_sweep_resumes_from_checkpoint(tmp_path):
+    history = random_history(200)
+    checkpoint = str(tmp_path / "sweep.jsonl")
+    evaluation = {"days": 30, "start": 0, "end": 100, "horizon": 3600, "resolution": 60,
+                  "history": history_fingerprint(history)}
+
+    first = sweep(grid({"qualify_score": [30.0, 40.0]}), history, checkpoint, evaluation, workers=1)
+    resumed = sweep(grid({"qualify_score": [30.0, 40.0, 50.0]}), history, checkpoint, evaluation, workers=1)
+
+    assert len(first) == 2 and len(resumed) == 3
+    with open(checkpoint, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["params"]["qualify_score"] for line in lines[2:]] == [50.0] # only the new candidate ran
+
+    # Different data under the same settings is evaluated again, not mixed in
+    changed = dict(evaluation, history=history_fingerprint(history[:100]))
+    assert len(sweep(grid({"qualify_score": [30.0]}), history[:100], checkpoint, changed, workers=1)) == 4
+
+    records = {line["key"]: line for line in lines}
+    assert resume_window(records, 30, 3600, 60) == (0, 100)
+    assert resume_window(records, 7, 3600, 60) is None
+
+
+def at(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+def test_load_history_includes_sub_threshold_observations(tmp_path):
+    path = str(tmp_path / "sweep.db")
+    db = DatabaseManager(path, persistent=False)
+    state = TokenStateIndex()
+    analyzed_at = 1_700_000_000
+    horizon = 3600
+    snapshots = [
+        state.record({'address': "winner", 'price': 1.0}, "solana", make_opportunity("winner", 80.0), now=analyzed_at),
+        state.record({'address': "faded", 'price': 2.0}, "solana", make_opportunity("faded", 12.0, price=2.0), now=analyzed_at),
+        state.record({'address': "late", 'price': 1.0}, "solana", make_opportunity("late", 50.0), now=analyzed_at + 7200),
+    ]
+    assert db.write_batch(history=snapshots, prices=[
+        {'coin_id': "winner", 'price': 1.5, 'timestamp': at(analyzed_at + horizon + 30)},
+        {'coin_id': "faded", 'price': 1.0, 'timestamp': at(analyzed_at + horizon + 30)},
+        # Only known after the window's end
+        {'coin_id': "late", 'price': 3.0, 'timestamp': at(analyzed_at + 7200 + horizon + 30)},
+    ])
+
+    end = analyzed_at + 7200 + horizon
+    history = load_history(path, analyzed_at - 60, end, horizon=horizon, resolution=60)
+
+    assert history.shape == (2, len(COLUMNS) + 1)
+    np.testing.assert_allclose(history[:, -1], [0.5, -0.5])
+    assert history[1, COLUMNS.index('hype_level')] == 60.0
+    np.testing.assert_array_equal(load_history(path, analyzed_at - 60, end, horizon=horizon, resolution=60), history)
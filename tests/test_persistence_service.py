@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+from src.core.persistence_service import AsyncPersistenceService
+
+
+class SlowDatabase:
+    """Takes `delay` seconds per write and records which thread wrote what"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.prices = []
+        self.threads = set()
+
+    def write_batch(self, coins, prices, sentiments, potentials, snapshots, history):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.prices.extend(price['price'] for price in prices)
+        return True
+
+    def snapshot_leaderboard(self, potentials):
+        self.threads.add(threading.current_thread().name)
+        return True
+
+
+def test_full_queue_parks_the_submitter_not_the_loop():
+    db = SlowDatabase(delay=0.02)
+    service = AsyncPersistenceService(db, max_queue_size=2, batch_size=5, flush_interval=60)
+
+    async def scenario():
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def heartbeat():
+            nonlocal ticks
+            while not stop.is_set():
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker = asyncio.create_task(heartbeat())
+        started = time.perf_counter()
+        for i in range(50):
+            await service.submit_price({'coin_id': "gem", 'price': float(i)})
+        submitted = time.perf_counter() - started
+        assert await service.drain(timeout=5)
+        stop.set()
+        await ticker
+        return ticks, submitted
+
+    ticks, submitted = asyncio.run(scenario())
+
+    metrics = service.metrics()
+    assert metrics["backpressure_waits"] > 0
+    assert metrics["max_queue_depth"] <= 2
+    # Ten slow batches: the submitter waited for them while the loop kept ticking
+    assert submitted >= 0.15
+    assert ticks >= submitted / 0.005 / 3
+    assert db.prices == [float(i) for i in range(50)] # in order, none lost
+    assert metrics["rows_written"] == 50 and metrics["enqueued"] == 50
+
+
+def test_drain_flushes_a_partial_batch_and_close_stops_the_writer():
+    db = SlowDatabase(delay=0.01)
+    service = AsyncPersistenceService(db, max_queue_size=4, batch_size=100, flush_interval=60)
+
+    async def scenario():
+        assert await service.drain() # nothing started yet
+        for i in range(3):
+            await service.submit_price({'coin_id': "gem", 'price': float(i)})
+        assert await service.drain(timeout=5)
+        drained = list(db.prices)
+
+        await service.submit_price({'coin_id': "gem", 'price': 3.0})
+        await service.submit_leaderboard([])
+        await service.close(timeout=5)
+        return drained
+
+    drained = asyncio.run(scenario())
+
+    assert drained == [0.0, 1.0, 2.0] # below batch_size, still written by drain()
+    assert db.prices == [0.0, 1.0, 2.0, 3.0] # close() flushed the rest
+    assert not service._thread.is_alive()
+    # Every write ran on the writer thread, never on the event loop's
+    assert db.threads == {"db-writer"}
+
+
+def test_bad_row_does_not_kill_the_writer():
+    db = SlowDatabase(delay=0.0)
+    service = AsyncPersistenceService(db, max_queue_size=4, batch_size=100, flush_interval=60)
+
+    async def scenario():
+        await service.submit("unknown", {})
+        await service.submit_price({'coin_id': "gem", 'price': 1.0})
+        assert await service.drain(timeout=5)
+        await service.close(timeout=5)
+
+    asyncio.run(scenario())
+
+    assert db.prices == [1.0]
+    assert service.metrics()["write_errors"] == 1
+
+
+class FlakyDatabase(SlowDatabase):
+    """write_batch fails until `healthy` is set"""
+
+    def __init__(self):
+        super().__init__(delay=0.0)
+        self.healthy = False
+        self.snapshots = []
+
+    def write_batch(self, coins, prices, sentiments, potentials, snapshots, history):
+        if not self.healthy:
+            return False
+        return super().write_batch(coins, prices, sentiments, potentials, snapshots, history)
+
+    def snapshot_leaderboard(self, potentials):
+        self.snapshots.append(potentials)
+        return True
+
+
+def test_failed_flush_fails_drain_and_skips_the_leaderboard_snapshot():
+    db = FlakyDatabase()
+    service = AsyncPersistenceService(db, max_queue_size=4, batch_size=100, flush_interval=60)
+
+    async def scenario():
+        await service.submit_price({'coin_id': "gem", 'price': 1.0})
+        await service.submit_leaderboard([{'coin_id': "gem"}])
+        failed = await service.drain(timeout=5)
+        snapshots_while_failing = len(db.snapshots)
+
+        db.healthy = True
+        await service.submit_leaderboard([{'coin_id': "gem"}])
+        recovered = await service.drain(timeout=5)
+        await service.close(timeout=5)
+        return failed, snapshots_while_failing, recovered
+
+    failed, snapshots_while_failing, recovered = asyncio.run(scenario())
+
+    assert failed is False
+    assert snapshots_while_failing == 0 # the price row never landed, so nothing was ranked
+    assert recovered is True
+    assert db.prices == [1.0] and db.snapshots == [[{'coin_id': "gem"}]]
+    assert service.metrics()["write_errors"] >= 2 # the failed flushes, counted
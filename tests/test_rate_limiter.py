@@ -0,0 +1,119 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.core.config import settings
+from src.data_sources import birdeye_client
+from src.data_sources.birdeye_client import BirdeyeClient
+from src.data_sources.transport import Transport, TransportResponse
+from src.utils.cache import ResponseCache
+from src.utils.rate_limiter import RateLimiterRegistry, TokenBucket, endpoint_path, retry_after_delay
+
+
+class ScriptedTransport(Transport):
+    """Answers with the given (status, headers) in turn, recording when each request arrived"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    async def request(self, method, url, session_factory, params=None, headers=None):
+        self.sent.append(time.perf_counter())
+        status, response_headers = self.responses.pop(0)
+        return TransportResponse(status, response_headers, b'{"data": {"price": 1.0}}')
+
+
+def test_bucket_spends_its_burst_then_refills_at_the_rate():
+    async def scenario():
+        bucket = TokenBucket(rate_per_minute=600, burst=3) # 10 tokens a second
+        started = time.perf_counter()
+        stamps = []
+        for _ in range(5):
+            await bucket.acquire()
+            stamps.append(time.perf_counter() - started)
+        return stamps
+
+    stamps = asyncio.run(scenario())
+
+    assert stamps[2] < 0.05 # the burst goes out at once
+    assert stamps[3] == pytest.approx(0.1, abs=0.05)
+    assert stamps[4] == pytest.approx(0.2, abs=0.05)
+
+
+def test_penalize_blocks_and_drains_the_bucket():
+    async def scenario():
+        # The pause is longer than the 0.5s a full burst takes to refill
+        bucket = TokenBucket(rate_per_minute=600, burst=5)
+        bucket.penalize(0.8)
+        started = time.perf_counter()
+        stamps = []
+        for _ in range(4):
+            await bucket.acquire()
+            stamps.append(time.perf_counter() - started)
+        return stamps
+
+    stamps = asyncio.run(scenario())
+
+    assert stamps[0] == pytest.approx(0.9, abs=0.05) # the pause, then one refill interval
+    # Resumed callers trickle back in at the refill rate, not as a burst
+    gaps = [later - earlier for earlier, later in zip(stamps, stamps[1:])]
+    assert all(gap == pytest.approx(0.1, abs=0.04) for gap in gaps), gaps
+
+
+def test_retry_after_delay(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKOFF_BASE", 1.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKOFF_MAX", 5.0)
+
+    assert retry_after_delay("3", 0) == 3.0
+    assert retry_after_delay("-1", 0) == 0.0
+    in_ten = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+    assert retry_after_delay(in_ten, 0) == pytest.approx(10, abs=1.5)
+    # Missing or unreadable: exponential backoff, capped
+    assert [retry_after_delay(None, attempt) for attempt in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    assert retry_after_delay("soon", 1) == 2.0
+
+
+def test_registry_adds_endpoint_buckets_only_where_configured(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"birdeye": 120, "birdeye:/defi/token_security": 30})
+    registry = RateLimiterRegistry()
+
+    assert registry.get("birdeye").rate == 2.0
+    assert registry.get("birdeye", "/defi/token_security").rate == 0.5
+    assert registry.get("birdeye", "/defi/token_overview") is None
+    assert registry.get("twitter").rate == settings.RATE_LIMIT_PER_MINUTE / 60
+    assert registry.get("birdeye") is registry.get("birdeye") # shared
+    assert endpoint_path("defi/token_overview?chain=solana") == "/defi/token_overview"
+
+    registry.penalize("birdeye", "/defi/token_security", 5.0)
+    blocked = [registry.get("birdeye").blocked_until, registry.get("birdeye", "/defi/token_security").blocked_until]
+    assert blocked == pytest.approx([time.monotonic() + 5.0] * 2, abs=0.1)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"birdeye": 60_000})
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_RETRIES", 2)
+    monkeypatch.setattr(birdeye_client, "rate_limiters", RateLimiterRegistry())
+
+    def make(transport):
+        return BirdeyeClient("test-key", cache=ResponseCache(default_ttl=0), transport=transport)
+    return make
+
+
+def test_429_waits_for_retry_after_then_retries(client):
+    transport = ScriptedTransport((429, {"Retry-After": "0.2"}), (200, {}))
+
+    response = asyncio.run(client(transport).make_request("/defi/price", {"address": "X"}))
+
+    assert response == {"data": {"price": 1.0}}
+    assert transport.sent[1] - transport.sent[0] == pytest.approx(0.2, abs=0.08)
+
+
+def test_429_gives_up_after_max_retries(client):
+    transport = ScriptedTransport(*[(429, {"Retry-After": "0"})] * 3)
+
+    assert asyncio.run(client(transport).make_request("/defi/price", {"address": "X"})) is None
+    assert len(transport.sent) == 3 # the first try and RATE_LIMIT_MAX_RETRIES retries
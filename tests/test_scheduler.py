@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from src.core.scheduler import RefreshScheduler
+from tests.helpers import make_opportunity
+
+
+def run_scheduler(seconds: float, request_budget: float):
+    refreshed = {"HOT": 0, "COLD": 0}
+
+    async def discover(chain):
+        return [{"address": "HOT"}, {"address": "COLD"}]
+
+    async def refresh(token, chain):
+        address = token["address"]
+        refreshed[address] += 1
+        if address == "HOT":
+            # Swings 30% every refresh with a high score
+            return make_opportunity(address, 90.0, price=1.0 + 0.3 * (refreshed[address] % 2))
+        return make_opportunity(address, 5.0)
+
+    async def scenario():
+        scheduler = RefreshScheduler(
+            discover, refresh, ["solana"], min_interval=0.02, max_interval=1.0,
+            discovery_interval=60.0, request_budget=request_budget, requests_per_refresh=1,
+        )
+        stop = asyncio.Event()
+        runner = asyncio.create_task(scheduler.run(stop))
+        await asyncio.sleep(seconds)
+        stop.set()
+        await runner
+        return scheduler
+
+    return asyncio.run(scenario()), refreshed
+
+
+def test_hot_tokens_refresh_more_often_than_dead_ones():
+    scheduler, refreshed = run_scheduler(0.6, request_budget=60_000)
+    assert refreshed["COLD"] == 1 # first pass only, next one is max_interval away
+    assert refreshed["HOT"] >= 5
+    assert scheduler.refresh_interval(scheduler.tokens[("solana", "HOT")]) < 0.1
+
+
+def test_refreshes_stay_within_the_request_budget():
+    # 600/min = 10/s with a burst of RATE_LIMIT_BURST
+    scheduler, refreshed = run_scheduler(0.5, request_budget=600)
+    assert sum(refreshed.values()) <= 10 + 5 + 1
+
+
+def test_failing_token_backs_off_and_success_resets_it():
+    outcomes = [None] * 6 + [make_opportunity("DEAD", 5.0), None]
+
+    async def refresh(token, chain):
+        return outcomes.pop(0)
+
+    async def scenario():
+        scheduler = RefreshScheduler(None, refresh, ["solana"], min_interval=1.0, max_interval=8.0)
+        scheduler.add_tokens([{"address": "DEAD"}], "solana")
+        state = scheduler.tokens[("solana", "DEAD")]
+        intervals = []
+        for _ in range(8):
+            await scheduler._refresh(("solana", "DEAD"))
+            intervals.append(state.interval)
+        return intervals
+
+    intervals = asyncio.run(scenario())
+
+    # Doubles up to max_interval instead of retrying at min_interval forever
+    assert intervals[:6] == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+    assert 1.0 < intervals[6] <= 8.0 # scored: back on its urgency-based interval
+    assert intervals[7] == 1.0 # the failure streak starts over
+
+
+def test_failing_callback_keeps_the_token_scheduled():
+    async def refresh(token, chain):
+        return make_opportunity(token["address"], 50.0)
+
+    async def on_result(opportunity):
+        raise RuntimeError("dashboard went away")
+
+    async def scenario():
+        scheduler = RefreshScheduler(None, refresh, ["solana"], on_result=on_result,
+                                     min_interval=1.0, max_interval=8.0)
+        scheduler.add_tokens([{"address": "GEM"}], "solana")
+        assert scheduler._pop_due(time.monotonic()) == ("solana", "GEM")
+        await scheduler._refresh(("solana", "GEM"))
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+
+    state = scheduler.tokens[("solana", "GEM")]
+    assert scheduler.next_due() == state.due_at > time.monotonic()
+    assert state.refreshes == 1 and scheduler.stats()["errors"] == 1
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from src.analyzers.memecoin_hunter import MemecoinPotentialScorer, ScoringParams, SENTIMENT_FIELDS
+from src.models.analysis_result import NarrativeIndicators
+
+
+def random_inputs(count: int, seed: int = 11):
+    """Token, sentiment and security inputs that sit on and around every scoring threshold"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        token = {
+            'mc': rng.choice([0, 99999, 100000, 10000000, 10000001, rng.uniform(0, 2e7)]),
+            'liquidity': rng.choice([0, 1000, rng.uniform(0, 1e6)]),
+            'volume24h': rng.choice([0, 500, rng.uniform(0, 1e6)]),
+            'price24hchangepercent': rng.choice([-20, -20.5, rng.uniform(-90, 90)]),
+        }
+        sentiment = {field: rng.choice([0, 10, 10.01, 50, 70.5, rng.uniform(0, 100)]) for field in SENTIMENT_FIELDS}
+        security = {}
+        if rng.random() < 0.8:
+            security = {
+                'rug_pull': rng.random() < 0.2,
+                'is_blacklisted': rng.random() < 0.1,
+                'top_10_holder_percent': rng.choice([60, 61, 80, 81, rng.uniform(0, 100)]),
+                'is_liquidity_locked': rng.random() < 0.5,
+            }
+        yield token, sentiment, security
+
+
+@pytest.mark.parametrize("params", [
+    ScoringParams(),
+    ScoringParams(hype_weight=0.45, risk_weight=0.3, sentiment_share=0.55, high_activity_ratio=0.8,
+                  moderate_activity_points=5.0, min_market_cap=50000.0, max_market_cap=2e6, security_share=0.15),
+])
+def test_score_batch_matches_scalar_path_exactly(params):
+    scorer = MemecoinPotentialScorer(params)
+    rows, expected = [], []
+    for token, sentiment, security in random_inputs(5000):
+        opportunity = scorer.score_potential(token, NarrativeIndicators(**sentiment), security, "solana")
+        expected.append((opportunity.overall_score, opportunity.potential_type,
+                         opportunity.confidence, opportunity.security_score))
+        rows.append({**token, **sentiment, **security, 'has_security': bool(security)})
+
+    batch = pd.DataFrame(rows)
+    scored = scorer.score_batch(batch)
+    actual = list(zip(scored.overall_score, scored.potential_type, scored.confidence, scored.security_score))
+
+    assert actual == expected
+
+    columns = scorer.score_batch({name: batch[name].to_numpy() for name in batch})
+    assert list(columns['overall_score']) == list(scored.overall_score)
+
+
+def test_score_batch_accepts_precomputed_security_score():
+    scorer = MemecoinPotentialScorer()
+    batch = pd.DataFrame({'mc': [500000.0], 'liquidity': [100000.0], 'volume24h': [60000.0],
+                          'hype_level': [80.0], 'security_score': [35.0]})
+
+    scored = scorer.score_batch(batch)
+
+    assert scored.security_score.iat[0] == 35.0
+    assert scored.confidence.iat[0] == 70 - 30 - 15
@@ -0,0 +1,81 @@
+from src.analyzers.sentiment_analyzer import SentimentAnalyzer
+from src.analyzers.sentiment_cache import TweetSentimentCache
+from src.core.database import DatabaseManager
+
+
+class FlakyStore:
+    """save_tweet_sentiments fails until `healthy` is set"""
+
+    def __init__(self):
+        self.healthy = False
+        self.saved = []
+
+    def save_tweet_sentiments(self, rows):
+        if not self.healthy:
+            return False
+        self.saved.extend(rows)
+        return True
+
+
+def test_lru_keeps_the_most_recently_used_entries():
+    cache = TweetSentimentCache(max_entries=3)
+    for i in range(3):
+        cache.put(f"tweet {i}", "ns", float(i), {"hype": i})
+    assert cache.get("tweet 0", "ns") == (0.0, {"hype": 0}) # now the most recently used
+
+    cache.put("tweet 3", "ns", 3.0, {})
+
+    assert cache.stats()["entries"] == 3
+    assert cache.get("tweet 1", "ns") is None # least recently used, evicted
+    assert [cache.get(f"tweet {i}", "ns")[0] for i in (0, 2, 3)] == [0.0, 2.0, 3.0]
+    assert cache.stats()["hits"] == 4 and cache.stats()["misses"] == 1
+
+
+def test_entries_are_only_valid_in_their_namespace():
+    cache = TweetSentimentCache()
+    cache.put("to the moon", "v1", 0.5, {"hype": 1})
+
+    assert cache.get("to the moon", "v2") is None
+    assert cache.get("to the moon", "v1") == (0.5, {"hype": 1})
+
+
+def test_analyzers_with_the_same_keywords_share_entries():
+    cache = TweetSentimentCache()
+    first = SentimentAnalyzer(twitter_client=None, cache=cache)
+    scored = first._score_tweet("gem going parabolic 🚀")
+
+    second = SentimentAnalyzer(twitter_client=None, cache=cache)
+    assert second.cache_namespace == first.cache_namespace
+    assert second._score_tweet("gem going parabolic 🚀") == scored
+    assert cache.stats()["hits"] == 1
+
+
+def test_flush_and_load_round_trip_through_sqlite(tmp_path):
+    db = DatabaseManager(str(tmp_path / "sentiment.db"), persistent=False)
+    cache = TweetSentimentCache(store=db)
+    cache.put("lfg", "ns", 0.4, {"hype": 1})
+    cache.put("rug incoming", "ns", -0.6, {"risk": 1})
+
+    assert cache.flush() == 2
+    assert cache.flush() == 0 # nothing new since
+
+    warmed = TweetSentimentCache(store=db)
+    assert warmed.load() == 2
+    assert warmed.get("lfg", "ns") == (0.4, {"hype": 1})
+    assert warmed.get("rug incoming", "ns") == (-0.6, {"risk": 1})
+    assert TweetSentimentCache(max_entries=1, store=db).load() == 1
+    assert TweetSentimentCache().load() == 0 # no store
+
+
+def test_failed_save_keeps_the_rows_for_the_next_flush():
+    store = FlakyStore()
+    cache = TweetSentimentCache(store=store)
+    cache.put("lfg", "ns", 0.4, {"hype": 1})
+
+    assert cache.flush() == 0
+    cache.put("based", "ns", 0.2, {"meme": 1})
+    store.healthy = True
+
+    assert cache.flush() == 2
+    assert sorted(compound for _, compound, _ in store.saved) == [0.2, 0.4]
+    assert cache.flush() == 0
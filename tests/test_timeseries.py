@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from src.core.database import DatabaseManager
+from src.core.timeseries import RAW, PriceTimeSeries
+
+START = 1_700_006_400 # on a day boundary
+NOW = START + 3 * 3600 + 1234
+LAG = 60
+RESOLUTIONS = [60, 300, 3600, 86400]
+
+
+def at(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+def ohlc(ticks, res, start, end):
+    """Plain-Python buckets: first/last tick by (time, insertion order), last volume, tick count"""
+    buckets = {}
+    for ts, price, volume in sorted(ticks, key=lambda tick: tick[0]): # stable: insertion order breaks ties
+        if not start <= ts < end:
+            continue
+        bucket = ts // res * res
+        if bucket not in buckets:
+            buckets[bucket] = {'bucket': bucket, 'open': price, 'high': price, 'low': price,
+                               'close': price, 'volume': volume, 'samples': 0}
+        row = buckets[bucket]
+        row['high'] = max(row['high'], price)
+        row['low'] = min(row['low'], price)
+        row['close'] = price
+        row['volume'] = volume
+        row['samples'] += 1
+    return [buckets[bucket] for bucket in sorted(buckets)]
+
+
+@pytest.fixture
+def series(tmp_path):
+    """Irregular ticks for two coins over three hours, rolled up with raw retention at zero days"""
+    rng = np.random.default_rng(3)
+    ticks = {}
+    for coin in ("gem", "dud"):
+        times = np.sort(rng.integers(START, NOW, 600))
+        times[10] = times[11] # same second: the insertion order decides open/close
+        ticks[coin] = [(int(ts), float(price), float(volume)) for ts, price, volume in
+                       zip(times, rng.uniform(0.5, 2.0, len(times)), rng.uniform(1e3, 1e6, len(times)))]
+
+    db = DatabaseManager(str(tmp_path / "prices.db"), persistent=False)
+    assert db.insert_prices([
+        {'coin_id': coin, 'price': price, 'volume_24h': volume, 'timestamp': at(ts)}
+        for coin, rows in ticks.items() for ts, price, volume in rows
+    ])
+    timeseries = PriceTimeSeries(db, resolutions=RESOLUTIONS, raw_retention_days=0,
+                                 rollup_retention_days={}, rollup_lag=LAG)
+    stats = timeseries.maintain(now=NOW)
+    return timeseries, ticks, stats
+
+
+def rollups(timeseries, coin, res):
+    with timeseries.db.get_connection() as conn:
+        return [dict(row) for row in conn.execute("""
+            SELECT bucket, open, high, low, close, volume, samples FROM price_rollups
+            WHERE coin_id = ? AND resolution = ? ORDER BY bucket
+        """, (coin, res))]
+
+
+def test_watermarks_stop_at_closed_buckets(series):
+    timeseries, _, stats = series
+    closed = NOW - LAG
+
+    watermarks = timeseries._watermarks()
+    assert watermarks[60] == closed // 60 * 60
+    assert watermarks[300] == closed // 300 * 300
+    assert watermarks[3600] == closed // 3600 * 3600
+    assert 86400 not in watermarks # today's daily bucket is still open
+    assert "rolled_86400" not in stats
+
+
+def test_rollups_match_the_raw_ticks(series):
+    timeseries, ticks, _ = series
+    watermarks = timeseries._watermarks()
+
+    for coin, rows in ticks.items():
+        for res in (60, 300, 3600):
+            assert rollups(timeseries, coin, res) == ohlc(rows, res, START, watermarks[res])
+
+
+def test_retention_keeps_raw_rows_until_every_resolution_rolled_them_up(series):
+    timeseries, ticks, stats = series
+
+    # The daily resolution has no watermark yet, so none of its raw rows may go
+    assert stats["raw"] == 0
+
+    # Without the daily resolution, raw rows before the coarsest watermark go, and only those
+    hourly = PriceTimeSeries(timeseries.db, resolutions=[60, 300, 3600], raw_retention_days=0,
+                             rollup_retention_days={}, rollup_lag=LAG)
+    deleted = hourly.maintain(now=NOW)["raw"]
+    cutoff = min(hourly._watermarks()[res] for res in (60, 300, 3600))
+    assert deleted == sum(ts < cutoff for rows in ticks.values() for ts, _, _ in rows) > 0
+    with timeseries.db.get_connection() as conn:
+        oldest = conn.execute("SELECT MIN(CAST(strftime('%s', timestamp) AS INTEGER)) FROM price_data").fetchone()[0]
+    assert oldest >= cutoff
+
+
+@pytest.mark.parametrize("res", [60, 300, 3600])
+def test_query_range_joins_rollups_and_raw_tail_at_the_watermark(series, res):
+    timeseries, ticks, _ = series
+    PriceTimeSeries(timeseries.db, resolutions=[60, 300, 3600], raw_retention_days=0,
+                    rollup_retention_days={}, rollup_lag=LAG).maintain(now=NOW)
+    watermark = timeseries._watermarks()[res]
+    assert START < watermark < NOW
+
+    resolution, rows = timeseries.query_range("gem", at(START), at(NOW + 60), resolution=res)
+
+    buckets = [row['bucket'] for row in rows]
+    assert resolution == res
+    assert buckets == sorted(set(buckets)) # no bucket twice across the watermark
+    assert rows == ohlc(ticks["gem"], res, START, NOW + 60) # and none missing
+
+
+def test_query_range_raw(series):
+    timeseries, ticks, _ = series
+    start, end = NOW - 1800, NOW
+
+    resolution, rows = timeseries.query_range("dud", at(start), at(end), resolution=RAW)
+
+    expected = [(ts, price) for ts, price, _ in sorted(ticks["dud"], key=lambda tick: tick[0]) if start <= ts < end]
+    assert resolution == RAW
+    assert [(row['bucket'], row['close']) for row in rows] == expected
+
+
+def test_choose_resolution(tmp_path):
+    timeseries = PriceTimeSeries(DatabaseManager(str(tmp_path / "prices.db"), persistent=False),
+                                 resolutions=[60, 300, 3600], raw_retention_days=7,
+                                 rollup_retention_days={60: 30, 300: 180})
+    day = 86400
+
+    assert timeseries.choose_resolution(NOW - 3600, NOW, 500, now=NOW) == RAW
+    assert timeseries.choose_resolution(NOW - day, NOW, 500, now=NOW) == 300
+    assert timeseries.choose_resolution(NOW - day, NOW, 2000, now=NOW) == RAW
+    # Raw rows and minute rollups no longer reach back that far
+    assert timeseries.choose_resolution(NOW - 10 * day, NOW - 10 * day + 3600, 500, now=NOW) == 60
+    assert timeseries.choose_resolution(NOW - 40 * day, NOW - 40 * day + 3600, 500, now=NOW) == 300
+    assert timeseries.choose_resolution(NOW - 10 * day, NOW, 500, now=NOW) == 3600
+    # Too many points everywhere: the coarsest resolution
+    assert timeseries.choose_resolution(NOW - 400 * day, NOW, 500, now=NOW) == 3600
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from src.core.database import DatabaseManager
+from src.core.token_state import TokenStateIndex
+from tests.helpers import make_opportunity
+
+NOW = 1_700_000_000.0
+
+
+def token(price: float = 1.0, liquidity: float = 50_000, volume: float = 100_000) -> dict:
+    return {'address': "gem", 'price': price, 'liquidity': liquidity, 'v24hUSD': volume}
+
+
+@pytest.fixture
+def index():
+    index = TokenStateIndex(price_delta=0.10, volume_delta=0.25, liquidity_delta=0.15,
+                            score_half_life=3600.0, reanalyze_after=4 * 3600.0)
+    index.record(token(), "solana", make_opportunity("gem", 80.0), now=NOW)
+    return index
+
+
+def test_needs_analysis_only_past_the_deltas(index):
+    assert TokenStateIndex().needs_analysis(token(), "solana", now=NOW) # never seen
+    assert not index.needs_analysis(token(), "solana", now=NOW + 60)
+    assert index.needs_analysis(token(), "base", now=NOW + 60) # same address, other chain
+
+    assert not index.needs_analysis(token(price=1.09), "solana", now=NOW + 60)
+    assert index.needs_analysis(token(price=1.11), "solana", now=NOW + 60)
+    assert index.needs_analysis(token(price=0.89), "solana", now=NOW + 60)
+    assert not index.needs_analysis(token(liquidity=57_000), "solana", now=NOW + 60)
+    assert index.needs_analysis(token(liquidity=58_000), "solana", now=NOW + 60)
+    assert not index.needs_analysis(token(volume=124_000), "solana", now=NOW + 60)
+    assert index.needs_analysis(token(volume=126_000), "solana", now=NOW + 60)
+
+    # Unchanged, but the snapshot is too old to trust
+    assert index.needs_analysis(token(), "solana", now=NOW + 4 * 3600)
+
+
+def test_reuse_decays_the_score_and_takes_fresh_market_numbers(index):
+    reused = index.reuse(token(price=1.05, volume=110_000), "solana", now=NOW + 3600)
+
+    assert reused.overall_score == pytest.approx(40.0) # one half-life later
+    assert (reused.price, reused.volume_24h, reused.liquidity) == (1.05, 110_000, 50_000)
+    assert index.reuse(token(), "solana", now=NOW + 7200).overall_score == pytest.approx(20.0)
+
+    index.record({'address': "dud", 'price': 1.0}, "solana", None, now=NOW)
+    assert index.reuse({'address': "dud", 'price': 1.0}, "solana", now=NOW + 60) is None
+
+
+def test_stats_count_and_reset(index):
+    index.reuse(token(), "solana", now=NOW + 60)
+    assert index.stats() == {"tracked": 1, "analyzed": 1, "reused": 1, "reuse_ratio": 0.5}
+
+    index.reset_stats()
+    assert index.stats() == {"tracked": 1, "analyzed": 0, "reused": 0, "reuse_ratio": 0.0}
+
+
+def test_record_and_load_round_trip(tmp_path):
+    db = DatabaseManager(str(tmp_path / "state.db"), persistent=False)
+    now = time.time()
+    first = TokenStateIndex(db)
+    assert db.upsert_token_snapshots([
+        first.record(token(), "solana", make_opportunity("gem", 80.0), now=now),
+        first.record({'address': "dud", 'price': 2.0}, "solana", None, now=now),
+        first.record({'address': "old", 'price': 2.0}, "solana", None, now=now - 5 * 3600), # past reanalyze_after
+    ])
+
+    restored = TokenStateIndex(db, reanalyze_after=4 * 3600.0)
+    assert restored.load() == 2
+    assert not restored.needs_analysis(token(), "solana", now=now)
+    assert restored.needs_analysis({'address': "old", 'price': 2.0}, "solana", now=now)
+    assert [(opp, analyzed_at) for opp, analyzed_at in restored.opportunities()] == [
+        (make_opportunity("gem", 80.0), now)
+    ]
@@ -0,0 +1,132 @@
+import asyncio
+import gzip
+import json
+import random
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import aiohttp
+
+from src.data_sources.transport import (Cassette, LiveTransport, RecordingTransport, ReplayTransport,
+                                        TransportResponse, latency_sampler, request_key)
+from src.data_sources.twitter_client import TwitterClient
+from tests.stub_servers import TwitterStubServer
+from tests.test_twitter_client import make_pages
+
+
+def test_request_key_is_host_independent_and_sorted():
+    assert request_key("get", "http://a.test/defi/token_overview?chain=solana", {"address": "X"}) == \
+        request_key("GET", "https://b.test/defi/token_overview", {"chain": "solana", "address": "X"}) == \
+        "GET /defi/token_overview?address=X&chain=solana"
+    assert request_key("GET", "/defi/tokenlist", {"offset": 0}) != request_key("GET", "/defi/tokenlist", {"offset": 50})
+
+
+def test_latency_samplers():
+    rng = random.Random(1)
+    assert latency_sampler("0")(rng, 80.0) == 0.0
+    assert latency_sampler("recorded")(rng, 80.0) == pytest.approx(0.08)
+    assert latency_sampler("recorded:0.5")(rng, 80.0) == pytest.approx(0.04)
+    assert latency_sampler("fixed:25")(rng, 80.0) == pytest.approx(0.025)
+    assert all(0.01 <= latency_sampler("uniform:10,20")(rng, 0.0) <= 0.02 for _ in range(100))
+
+    lognormal = latency_sampler("lognormal:50,0.5")
+    draws = [lognormal(random.Random(7), 0.0) for _ in range(2)]
+    assert draws[0] == draws[1] > 0 # same seed, same draw
+    with pytest.raises(ValueError):
+        latency_sampler("gamma:1")
+
+
+def test_live_transport_keeps_every_header():
+    async def scenario():
+        server = TwitterStubServer(make_pages(1, 10), rate_limited_requests=1, reset_after=5.0)
+        session = aiohttp.ClientSession()
+
+        async def session_factory():
+            return session
+
+        try:
+            url = f"{await server.start()}/2/tweets/search/recent"
+            return await LiveTransport().request("GET", url, session_factory)
+        finally:
+            await session.close()
+            await server.stop()
+
+    response = asyncio.run(scenario())
+
+    assert response.status == 429
+    assert "Date" in response.headers and "Server" in response.headers
+    assert response.headers.get("X-RATE-LIMIT-RESET") == response.headers["x-rate-limit-reset"]
+
+
+def test_record_then_replay_offline(tmp_path):
+    path = str(tmp_path / "cassettes" / "twitter.jsonl.gz")
+
+    async def record():
+        server = TwitterStubServer(make_pages(3, 100), page_delay=0.02)
+        client = TwitterClient("test-token", base_url=await server.start(), transport=RecordingTransport(Cassette(path)))
+        try:
+            return await client.search_recent("$TEST", max_results=250)
+        finally:
+            await client.cleanup() # writes the cassette
+            await server.stop()
+
+    async def replay(transport, query="$TEST"):
+        # Nothing listens there: every response has to come from the cassette
+        client = TwitterClient("test-token", base_url="http://127.0.0.1:9", transport=transport)
+        try:
+            return await client.search_recent(query, max_results=250)
+        finally:
+            await client.cleanup()
+
+    recorded = asyncio.run(record())
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 3
+    assert all(set(entry["headers"]) == {"Content-Type"} for entry in entries) # Date, Server... left out
+    assert entries[1]["key"].startswith("GET /2/tweets/search/recent?max_results=100&next_token=1&query=")
+    assert entries[1]["json"]["data"][0]["id"] == "1-0" # bodies stored parsed
+    assert all(entry["elapsed_ms"] >= 20 for entry in entries)
+
+    transport = ReplayTransport(Cassette.load(path), latency="0", seed=1)
+    assert asyncio.run(replay(transport)) == recorded
+    assert transport.stats() == {"served": 3, "misses": 0, "injected_429s": 0, "injected_timeouts": 0}
+
+    # Recorded latency is replayed
+    started = time.perf_counter()
+    asyncio.run(replay(ReplayTransport(Cassette.load(path), latency="recorded", seed=1)))
+    assert time.perf_counter() - started >= 0.06
+
+    # A request the cassette never saw is a 404, not a network call
+    missing = ReplayTransport(Cassette.load(path), latency="0", seed=1)
+    with pytest.raises(Exception, match="HTTP 404"):
+        asyncio.run(replay(missing, query="$OTHER"))
+    assert missing.stats()["misses"] == 1
+
+
+def test_replay_injects_seeded_faults(tmp_path):
+    cassette = Cassette(str(tmp_path / "birdeye.jsonl.gz"))
+    key = request_key("GET", "/defi/price", {"address": "X"})
+    for price in (1.0, 2.0):
+        cassette.add(key, TransportResponse(200, {"Content-Type": "application/json"},
+                                            json.dumps({"price": price}).encode(), 5.0))
+
+    async def prices(transport, count):
+        statuses = []
+        for _ in range(count):
+            response = await transport.request("GET", "https://x.test/defi/price", None, params={"address": "X"})
+            statuses.append((response.status, response.headers.get("retry-after"),
+                             (await response.json()).get("price")))
+        return statuses
+
+    replayed = asyncio.run(prices(ReplayTransport(cassette, latency="0", seed=1), 3))
+    assert replayed == [(200, None, 1.0), (200, None, 2.0), (200, None, 1.0)] # in order, then cycling
+
+    throttled = [ReplayTransport(cassette, latency="0", rate_limit_rate=0.5, retry_after=2.0, seed=4) for _ in range(2)]
+    first, second = (asyncio.run(prices(transport, 20)) for transport in throttled)
+    assert first == second # same seed, same faults
+    assert {status for status, _, _ in first} == {200, 429}
+    assert all(retry == "2.0" for status, retry, _ in first if status == 429)
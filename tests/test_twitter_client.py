@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from src.data_sources.twitter_client import TwitterClient
+from tests.stub_servers import TwitterStubServer
+
+
+def make_pages(page_count: int, page_size: int):
+    return [
+        [{"id": f"{page}-{i}", "text": f"$TEST to the moon {page}-{i}",
+          "public_metrics": {"like_count": i, "retweet_count": 0, "reply_count": 0}}
+         for i in range(page_size)]
+        for page in range(page_count)
+    ]
+
+
+async def heartbeat(stop: asyncio.Event, gaps: list, interval: float = 0.02):
+    """Records how late each tick fires; a blocked loop shows up as a large gap"""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        gaps.append(now - last - interval)
+        last = now
+
+
+def test_rate_limit_wait_keeps_event_loop_responsive():
+    async def scenario():
+        server = TwitterStubServer(make_pages(1, 10), rate_limited_requests=1, reset_after=1.0)
+        client = TwitterClient("test-token", base_url=await server.start())
+        stop, gaps = asyncio.Event(), []
+        ticker = asyncio.create_task(heartbeat(stop, gaps))
+        try:
+            started = time.perf_counter()
+            tweets = await client.fetch_recent_tweets("$TEST", max_results=10)
+            elapsed = time.perf_counter() - started
+        finally:
+            stop.set()
+            await ticker
+            await client.cleanup()
+            await server.stop()
+        return tweets, elapsed, gaps, server.requests
+
+    tweets, elapsed, gaps, requests = asyncio.run(scenario())
+
+    assert len(tweets) == 10
+    assert len(requests) == 2
+    # The search really did wait for the rate-limit window...
+    assert elapsed >= 1.0
+    # ...while other coroutines kept running on schedule
+    assert len(gaps) > 20
+    assert max(gaps) < 0.25
+
+
+def test_search_recent_follows_pagination():
+    async def scenario():
+        server = TwitterStubServer(make_pages(3, 100))
+        client = TwitterClient("test-token", base_url=await server.start())
+        try:
+            tweets = await client.search_recent("$TEST", max_results=250)
+            metrics = await client.get_tweet_metrics("$TEST")
+        finally:
+            await client.cleanup()
+            await server.stop()
+        return tweets, metrics, server.requests
+
+    tweets, metrics, requests = asyncio.run(scenario())
+
+    assert len(tweets) == 250
+    assert [r.get("next_token") for r in requests[:3]] == [None, "1", "2"]
+    assert requests[2]["max_results"] == "50"
+    assert requests[0]["query"] == "$TEST -is:retweet lang:en"
+    assert metrics["0-5"]["likes"] == 5